@@ -1,14 +1,25 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
 from openpyxl import load_workbook
-from fpdf import FPDF
-from docx import Document
 import os
+import re
+import time
+from functools import partial
 import win32com.client as win32
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import seaborn as sns
+from jobs import get_executor
+from excel_ops import dataframe_to_word, pivot_to_excel  # Headless Excel operations
+from workbook import LazyWorkbook, format_bytes
+from frame_optimizer import ARROW_STRING, describe_optimization, optimize_frame
+from views import ViewStack
+from word_table import describe_table
+from csv_export import (COMPRESSIONS, DEFAULT_BUFFER_ROWS, HAVE_ZSTD, describe_export, export_sheet, export_sheets,
+                        write_frame_csv)
+from chart_data import CHART_TYPES, describe_chart, draw_chart, prepare_chart
+from pivot_engine import AGG_FUNCS, describe_pivot, pivot_file, read_header, write_pivot
+from filter_engine import (OPERATORS, QUERY_ENGINE, FilterIndex, describe_conditions, describe_filter,
+                           parse_filter_value, query_mask)
 
 class EnhancedExcelUtilityApp(tk.Tk):
     def __init__(self):
@@ -35,7 +46,9 @@ class EnhancedExcelUtilityApp(tk.Tk):
         
         # Initialize variables
         self.selected_file = ""
-        self.df = None
+        self.workbook = None
+        self.filter_index = None
+        self.view = None  # Filter/sort steps over the loaded sheet, which itself is never modified
         
         # Create tabs
         self.create_tabs()
@@ -79,6 +92,12 @@ class EnhancedExcelUtilityApp(tk.Tk):
         self.file_label.pack(side='left', padx=5)
         
         ttk.Button(file_frame, text="Browse", command=self.browse_file).pack(side='right', padx=5)
+        # Loaded sheets are shrunk (narrower numbers, categoricals, parsed dates) before indexing
+        self.optimize_memory_var = tk.BooleanVar(value=True)
+        self.arrow_strings_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(file_frame, text="Arrow strings", variable=self.arrow_strings_var,
+                        state='normal' if ARROW_STRING is not None else 'disabled').pack(side='right', padx=5)
+        ttk.Checkbutton(file_frame, text="Optimize memory", variable=self.optimize_memory_var).pack(side='right', padx=5)
 
     def create_tabs(self):
         # Create and add all tabs
@@ -101,12 +120,26 @@ class EnhancedExcelUtilityApp(tk.Tk):
         options_frame = ttk.Frame(frame)
         options_frame.pack(fill='x', padx=20, pady=10)
         
-        ttk.Label(options_frame, text="Sheet Name:").pack(side='left', padx=5)
-        self.csv_sheet_var = tk.StringVar()
-        self.csv_sheet_combo = ttk.Combobox(options_frame, textvariable=self.csv_sheet_var)
-        self.csv_sheet_combo.pack(side='left', padx=5)
-        
-        ttk.Button(frame, text="Convert to CSV", command=self.convert_to_csv).pack(pady=10)
+        # Sheets are streamed from the file, so even sheets too large to load can be exported
+        ttk.Label(options_frame, text="Sheets:").grid(row=0, column=0, padx=5, pady=5, sticky='n')
+        self.csv_sheet_listbox = tk.Listbox(options_frame, selectmode=tk.MULTIPLE, exportselection=False, height=5)
+        self.csv_sheet_listbox.grid(row=0, column=1, rowspan=2, padx=5, pady=5)
+
+        ttk.Label(options_frame, text="Compression:").grid(row=0, column=2, padx=5, pady=5)
+        self.csv_compression_var = tk.StringVar(value='none')
+        compressions = [name for name in COMPRESSIONS if name != 'zstd' or HAVE_ZSTD]
+        ttk.Combobox(options_frame, textvariable=self.csv_compression_var, values=compressions,
+                     state='readonly', width=8).grid(row=0, column=3, padx=5, pady=5)
+
+        ttk.Label(options_frame, text="Rows per write:").grid(row=1, column=2, padx=5, pady=5)
+        self.csv_buffer_rows = tk.IntVar(value=DEFAULT_BUFFER_ROWS)
+        ttk.Entry(options_frame, textvariable=self.csv_buffer_rows, width=10).grid(row=1, column=3, padx=5, pady=5)
+
+        button_frame = ttk.Frame(frame)
+        button_frame.pack(pady=10)
+        ttk.Button(button_frame, text="Export Selected Sheets", command=self.export_selected_sheets).pack(side='left', padx=5)
+        ttk.Button(button_frame, text="Export All Sheets", command=self.export_all_sheets).pack(side='left', padx=5)
+        ttk.Button(button_frame, text="Export Current View", command=self.convert_to_csv).pack(side='left', padx=5)
 
     def create_filter_sort_tab(self, frame):
         ttk.Label(frame, text="Filter and Sort Data", style='Header.TLabel').pack(pady=10)
@@ -124,9 +157,35 @@ class EnhancedExcelUtilityApp(tk.Tk):
         filter_frame = ttk.Frame(frame)
         filter_frame.pack(fill='x', padx=20, pady=10)
         
+        ttk.Label(filter_frame, text="Match:").pack(side='left', padx=5)
+        self.filter_operator_var = tk.StringVar(value=OPERATORS[0])
+        ttk.Combobox(filter_frame, textvariable=self.filter_operator_var, values=OPERATORS,
+                     state='readonly', width=10).pack(side='left', padx=5)
         ttk.Label(filter_frame, text="Filter Value:").pack(side='left', padx=5)
         self.filter_value = tk.StringVar()
         ttk.Entry(filter_frame, textvariable=self.filter_value).pack(side='left', padx=5)
+        ttk.Button(filter_frame, text="Add Condition", command=self.add_filter_condition).pack(side='left', padx=5)
+
+        # Compound filter: the conditions added above, combined with AND or OR
+        conditions_frame = ttk.Frame(frame)
+        conditions_frame.pack(fill='x', padx=20, pady=5)
+
+        self.filter_conditions = []
+        self.conditions_listbox = tk.Listbox(conditions_frame, height=3)
+        self.conditions_listbox.pack(side='left', fill='x', expand=True, padx=5)
+        self.match_all_var = tk.BooleanVar(value=True)
+        ttk.Radiobutton(conditions_frame, text="Match all (AND)", variable=self.match_all_var, value=True).pack(side='left', padx=5)
+        ttk.Radiobutton(conditions_frame, text="Match any (OR)", variable=self.match_all_var, value=False).pack(side='left', padx=5)
+        ttk.Button(conditions_frame, text="Clear", command=self.clear_filter_conditions).pack(side='left', padx=5)
+
+        # Query expression, e.g. Amount > 100 and (Region == 'EU' or Qty < 5)
+        query_frame = ttk.Frame(frame)
+        query_frame.pack(fill='x', padx=20, pady=5)
+
+        ttk.Label(query_frame, text="Query:").pack(side='left', padx=5)
+        self.query_var = tk.StringVar()
+        ttk.Entry(query_frame, textvariable=self.query_var, width=50).pack(side='left', padx=5)
+        ttk.Button(query_frame, text="Apply Query", command=self.apply_query).pack(side='left', padx=5)
         
         # Sort options
         sort_frame = ttk.Frame(frame)
@@ -135,6 +194,10 @@ class EnhancedExcelUtilityApp(tk.Tk):
         self.sort_ascending = tk.BooleanVar(value=True)
         ttk.Radiobutton(sort_frame, text="Ascending", variable=self.sort_ascending, value=True).pack(side='left', padx=5)
         ttk.Radiobutton(sort_frame, text="Descending", variable=self.sort_ascending, value=False).pack(side='left', padx=5)
+        ttk.Button(sort_frame, text="Add Sort Key", command=self.add_sort_key).pack(side='left', padx=5)
+        self.sort_keys = []
+        self.sort_keys_label = ttk.Label(sort_frame, text="")
+        self.sort_keys_label.pack(side='left', padx=5)
         
         # Action buttons
         button_frame = ttk.Frame(frame)
@@ -142,6 +205,7 @@ class EnhancedExcelUtilityApp(tk.Tk):
         
         ttk.Button(button_frame, text="Apply Filter", command=self.apply_filter).pack(side='left', padx=5)
         ttk.Button(button_frame, text="Sort Data", command=self.sort_data).pack(side='left', padx=5)
+        ttk.Button(button_frame, text="Undo", command=self.undo_filter_sort).pack(side='left', padx=5)
         ttk.Button(button_frame, text="Reset", command=self.reset_filter_sort).pack(side='left', padx=5)
 
     def create_pivot_tab(self, frame):
@@ -151,23 +215,31 @@ class EnhancedExcelUtilityApp(tk.Tk):
         options_frame = ttk.Frame(frame)
         options_frame.pack(fill='x', padx=20, pady=10)
         
-        # Index selection
-        ttk.Label(options_frame, text="Index Column:").grid(row=0, column=0, padx=5, pady=5)
-        self.pivot_index_var = tk.StringVar()
-        self.pivot_index_combo = ttk.Combobox(options_frame, textvariable=self.pivot_index_var)
-        self.pivot_index_combo.grid(row=0, column=1, padx=5, pady=5)
-        
-        # Values selection
-        ttk.Label(options_frame, text="Values Column:").grid(row=1, column=0, padx=5, pady=5)
-        self.pivot_values_var = tk.StringVar()
-        self.pivot_values_combo = ttk.Combobox(options_frame, textvariable=self.pivot_values_var)
-        self.pivot_values_combo.grid(row=1, column=1, padx=5, pady=5)
-        
-        # Aggregation function
-        ttk.Label(options_frame, text="Aggregation:").grid(row=2, column=0, padx=5, pady=5)
-        self.agg_func_var = tk.StringVar(value='sum')
-        agg_funcs = ['sum', 'mean', 'count', 'min', 'max']
-        ttk.Combobox(options_frame, textvariable=self.agg_func_var, values=agg_funcs).grid(row=2, column=1, padx=5, pady=5)
+        # Several index and value columns and aggregations can be selected at once
+        ttk.Label(options_frame, text="Index Columns:").grid(row=0, column=0, padx=5, pady=5)
+        self.pivot_index_listbox = tk.Listbox(options_frame, selectmode=tk.MULTIPLE, exportselection=False, height=5)
+        self.pivot_index_listbox.grid(row=1, column=0, padx=5, pady=5)
+
+        ttk.Label(options_frame, text="Values Columns:").grid(row=0, column=1, padx=5, pady=5)
+        self.pivot_values_listbox = tk.Listbox(options_frame, selectmode=tk.MULTIPLE, exportselection=False, height=5)
+        self.pivot_values_listbox.grid(row=1, column=1, padx=5, pady=5)
+
+        ttk.Label(options_frame, text="Aggregation:").grid(row=0, column=2, padx=5, pady=5)
+        agg_frame = ttk.Frame(options_frame)
+        agg_frame.grid(row=1, column=2, padx=5, pady=5, sticky='n')
+        self.agg_func_vars = {}
+        for func in AGG_FUNCS:
+            self.agg_func_vars[func] = tk.BooleanVar(value=(func == 'sum'))
+            ttk.Checkbutton(agg_frame, text=func, variable=self.agg_func_vars[func]).pack(anchor='w')
+
+        # A source file is pivoted in row chunks straight from disk, so it never has to fit in memory
+        source_frame = ttk.Frame(frame)
+        source_frame.pack(fill='x', padx=20, pady=5)
+        ttk.Button(source_frame, text="Stream Source File...", command=self.choose_pivot_source).pack(side='left', padx=5)
+        ttk.Button(source_frame, text="Use Loaded Data", command=self.clear_pivot_source).pack(side='left', padx=5)
+        self.pivot_source = None
+        self.pivot_source_label = ttk.Label(source_frame, text="Source: loaded data")
+        self.pivot_source_label.pack(side='left', padx=5)
         
         ttk.Button(frame, text="Create Pivot Table", command=self.create_pivot_table).pack(pady=10)
 
@@ -181,8 +253,8 @@ class EnhancedExcelUtilityApp(tk.Tk):
         # Chart type selection
         ttk.Label(control_frame, text="Chart Type:").grid(row=0, column=0, padx=5, pady=5)
         self.chart_type_var = tk.StringVar(value='line')
-        chart_types = ['line', 'bar', 'scatter', 'histogram', 'box']
-        ttk.Combobox(control_frame, textvariable=self.chart_type_var, values=chart_types).grid(row=0, column=1, padx=5, pady=5)
+        chart_type_combo = ttk.Combobox(control_frame, textvariable=self.chart_type_var, values=list(CHART_TYPES))
+        chart_type_combo.grid(row=0, column=1, padx=5, pady=5)
         
         # X-axis selection
         ttk.Label(control_frame, text="X-Axis:").grid(row=1, column=0, padx=5, pady=5)
@@ -198,8 +270,28 @@ class EnhancedExcelUtilityApp(tk.Tk):
         
         ttk.Button(frame, text="Generate Chart", command=self.generate_chart).pack(pady=10)
 
+        # One figure embedded in the tab and redrawn in place; once a chart is shown, changing the
+        # chart type or an axis redraws it
+        self.chart_figure = Figure(figsize=(8, 5))
+        self.chart_axes = self.chart_figure.add_subplot(111)
+        self.chart_canvas = FigureCanvasTkAgg(self.chart_figure, master=frame)
+        self.chart_canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=10)
+        self.chart_shown = False
+        self.chart_generation = 0  # Bumped for every chart request; only the latest one is drawn
+        self.chart_job = None
+        for combo in (chart_type_combo, self.x_axis_combo, self.y_axis_combo):
+            combo.bind('<<ComboboxSelected>>', self.redraw_chart)
+
     def create_word_tab(self, frame):
         ttk.Label(frame, text="Convert Excel to Word", style='Header.TLabel').pack(pady=10)
+
+        options_frame = ttk.Frame(frame)
+        options_frame.pack(fill='x', padx=20, pady=10)
+        # Very large tables make Word sluggish; splitting them puts each part in its own section
+        ttk.Label(options_frame, text="Rows per table (0 = one table):").pack(side='left', padx=5)
+        self.word_rows_per_table = tk.IntVar(value=0)
+        ttk.Entry(options_frame, textvariable=self.word_rows_per_table, width=10).pack(side='left', padx=5)
+
         ttk.Button(frame, text="Convert to Word", command=self.convert_to_word).pack(pady=10)
 
     def browse_file(self):
@@ -207,90 +299,304 @@ class EnhancedExcelUtilityApp(tk.Tk):
         if file_path:
             self.selected_file = file_path
             self.file_label.config(text=os.path.basename(file_path))
-            self.df = pd.read_excel(self.selected_file)
-            self.update_combo_boxes()
-            self.status_var.set("Loaded file: " + self.selected_file)
+
+            optimize = None
+            if self.optimize_memory_var.get():
+                optimize = partial(optimize_frame, arrow_strings=self.arrow_strings_var.get())
+
+            def load(job):
+                workbook = LazyWorkbook(file_path, optimize=optimize)
+                df = workbook.sheet()
+                # Column indexes are built once here so every later filter is a lookup
+                return workbook, df, FilterIndex(df).build(job.progress_var)
+
+            get_executor(self).submit("Load Excel File", load, status_var=self.status_var, on_done=self.on_file_loaded)
+
+    def on_file_loaded(self, result):
+        self.workbook, df, self.filter_index = result
+        self.view = ViewStack(df)
+        self.csv_sheet_listbox.delete(0, tk.END)
+        for name in self.workbook.sheet_names:
+            self.csv_sheet_listbox.insert(tk.END, name)
+        self.update_combo_boxes()
+        status = "Loaded file: " + self.selected_file
+        summary = self.workbook.optimizations.get(self.workbook.first_sheet)
+        if summary is not None:
+            status += f" ({describe_optimization(summary)})"
+        self.status_var.set(status)
+
+    # Rows currently visible after the filter/sort steps
+    @property
+    def df(self):
+        return self.view.frame() if self.view is not None else None
+
+    def has_data(self):
+        return self.view is not None and len(self.view) > 0
 
     def update_combo_boxes(self):
-        if self.df is not None and not self.df.empty:
-            columns = list(self.df.columns)
-            self.csv_sheet_combo['values'] = columns
+        if self.view is not None and not self.view.base.empty:
+            columns = list(self.view.base.columns)
             self.filter_column_combo['values'] = columns
-            self.pivot_index_combo['values'] = columns
-            self.pivot_values_combo['values'] = columns
+            if self.pivot_source is None:
+                self.set_pivot_columns(columns)
             self.x_axis_combo['values'] = columns
             self.y_axis_combo['values'] = columns
 
+    def csv_options(self):
+        try:
+            buffer_rows = self.csv_buffer_rows.get()
+        except tk.TclError:
+            buffer_rows = 0
+        if buffer_rows < 1:
+            messagebox.showwarning("Warning", "Rows per write must be a positive whole number.")
+            return None
+        return self.csv_compression_var.get(), buffer_rows
+
+    # Rows of the current filter/sort view
     def convert_to_csv(self):
-        if self.df is None or self.df.empty:
+        if not self.has_data():
             messagebox.showwarning("Warning", "No data loaded. Please load an Excel file first.")
             return
-            
-        output_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        options = self.csv_options()
+        if options is None:
+            return
+        compression, buffer_rows = options
+
+        extension = COMPRESSIONS[compression]
+        output_path = filedialog.asksaveasfilename(defaultextension=extension, filetypes=[("CSV files", "*" + extension)])
         if output_path:
-            self.df.to_csv(output_path, index=False)
-            messagebox.showinfo("Success", f"Converted to CSV and saved at: {output_path}")
+            df = self.df
+            get_executor(self).submit("Convert to CSV", lambda job: write_frame_csv(df, output_path, compression, buffer_rows),
+                                      status_var=self.status_var,
+                                      on_done=lambda rows: messagebox.showinfo("Success", f"Converted {rows:,} rows to CSV and saved at: {output_path}"))
+
+    def export_selected_sheets(self):
+        names = [self.csv_sheet_listbox.get(i) for i in self.csv_sheet_listbox.curselection()]
+        if self.workbook is not None and not names:
+            messagebox.showwarning("Warning", "Please select one or more sheets.")
+            return
+        self.export_sheets_to_csv(names)
+
+    def export_all_sheets(self):
+        self.export_sheets_to_csv(self.workbook.sheet_names if self.workbook is not None else [])
+
+    def export_sheets_to_csv(self, sheet_names):
+        if self.workbook is None:
+            messagebox.showwarning("Warning", "No data loaded. Please load an Excel file first.")
+            return
+        options = self.csv_options()
+        if options is None:
+            return
+        compression, buffer_rows = options
+        path = self.workbook.path
+
+        if len(sheet_names) == 1:
+            extension = COMPRESSIONS[compression]
+            output_path = filedialog.asksaveasfilename(defaultextension=extension,
+                                                       filetypes=[("CSV files", "*" + extension)])
+            if not output_path:
+                return
+
+            def export(job):
+                start = time.perf_counter()
+                rows = export_sheet(path, sheet_names[0], output_path, compression, buffer_rows,
+                                    on_rows=lambda written, total: job.progress_var.set(min(written / total, 1) * 100 if total else 0))
+                return f"Exported {rows:,} rows in {time.perf_counter() - start:.1f}s to {output_path}"
+        else:
+            output_dir = filedialog.askdirectory(title="Select a folder for the CSV files")
+            if not output_dir:
+                return
+
+            def export(job):
+                summary = export_sheets(path, output_dir, sheet_names, compression, buffer_rows,
+                                        progress_var=job.progress_var)
+                return f"{describe_export(summary)} to {output_dir}"
+
+        get_executor(self).submit("Export Sheets to CSV", export, status_var=self.status_var,
+                                  on_done=lambda message: messagebox.showinfo("Success", message))
 
     def apply_filter(self):
-        if self.df is None or self.df.empty:
+        if not self.has_data():
             messagebox.showwarning("Warning", "No data loaded. Please load an Excel file first.")
             return
             
+        # With conditions added, apply all of them at once; otherwise the single condition in the fields
+        conditions = list(self.filter_conditions)
+        if not conditions:
+            condition = self.current_filter_condition()
+            if condition is None:
+                return
+            conditions = [condition]
+
+        match_all = self.match_all_var.get()
+        try:
+            start = time.perf_counter()
+            mask = self.filter_index.combined_mask(conditions, match_all)
+        except (ValueError, TypeError, re.error) as e:
+            messagebox.showerror("Error", f"Invalid filter value: {e}")
+            return
+        # The index covers every row of the sheet; keep the entries for the rows still visible
+        self.view.filter(mask[self.view.positions], describe_conditions(conditions, match_all))
+        self.show_view_status(f"Applied filter in {(time.perf_counter() - start) * 1000:.0f} ms.")
+
+    # (column, operator, value) from the filter fields, or None after warning the user
+    def current_filter_condition(self):
         column = self.filter_column_var.get()
         value = self.filter_value.get()
-        
+
         if not column or not value:
             messagebox.showwarning("Warning", "Please select a column and enter a filter value.")
+            return None
+
+        operator = self.filter_operator_var.get()
+        try:
+            return column, operator, parse_filter_value(operator, value)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid filter value: {e}")
+            return None
+
+    def add_filter_condition(self):
+        condition = self.current_filter_condition()
+        if condition is not None:
+            self.filter_conditions.append(condition)
+            self.conditions_listbox.insert(tk.END, describe_filter(*condition))
+            self.filter_value.set("")
+
+    def clear_filter_conditions(self):
+        self.filter_conditions.clear()
+        self.conditions_listbox.delete(0, tk.END)
+
+    def apply_query(self):
+        if not self.has_data():
+            messagebox.showwarning("Warning", "No data loaded. Please load an Excel file first.")
             return
-            
-        self.df = self.df[self.df[column].astype(str).str.contains(value, na=False)]
-        self.update_combo_boxes()
-        self.status_var.set("Applied filter. Rows: {}".format(len(self.df)))
+
+        expression = self.query_var.get().strip()
+        if not expression:
+            messagebox.showwarning("Warning", "Please enter a query, e.g. Amount > 100 and Region == 'EU'.")
+            return
+
+        try:
+            start = time.perf_counter()
+            mask = query_mask(self.view.base, expression)
+        except Exception as e:  # Syntax errors, unknown columns and type mismatches all come from eval
+            messagebox.showerror("Error", f"Invalid query: {e}")
+            return
+        self.view.filter(mask[self.view.positions], expression)
+        self.show_view_status(f"Applied query in {(time.perf_counter() - start) * 1000:.0f} ms ({QUERY_ENGINE}).")
 
     def sort_data(self):
-        if self.df is None or self.df.empty:
+        if not self.has_data():
             messagebox.showwarning("Warning", "No data loaded. Please load an Excel file first.")
             return
             
+        # Added sort keys are applied together, the first key taking precedence
+        if self.sort_keys:
+            columns = [column for column, _ in self.sort_keys]
+            ascending = [asc for _, asc in self.sort_keys]
+        else:
+            column = self.filter_column_var.get()
+            if not column:
+                messagebox.showwarning("Warning", "Please select a column to sort by.")
+                return
+            columns, ascending = [column], [self.sort_ascending.get()]
+
+        self.view.sort(columns, ascending=ascending)
+        self.show_view_status("Sorted data by column(s): {}.".format(", ".join(map(str, columns))))
+
+    def add_sort_key(self):
         column = self.filter_column_var.get()
         if not column:
             messagebox.showwarning("Warning", "Please select a column to sort by.")
             return
-            
-        ascending = self.sort_ascending.get()
-        self.df = self.df.sort_values(by=column, ascending=ascending)
-        self.update_combo_boxes()
-        self.status_var.set("Sorted data by column: {}".format(column))
+        self.sort_keys = [key for key in self.sort_keys if key[0] != column]
+        self.sort_keys.append((column, self.sort_ascending.get()))
+        self.sort_keys_label.config(text="Keys: " + ", ".join(
+            f"{column} {'asc' if asc else 'desc'}" for column, asc in self.sort_keys))
+
+    def undo_filter_sort(self):
+        if self.view is not None and self.view.depth:
+            self.view.undo()
+            self.show_view_status("Undid last step.")
 
     def reset_filter_sort(self):
-        if self.selected_file:
-            self.df = pd.read_excel(self.selected_file)
-            self.update_combo_boxes()
-            self.status_var.set("Reset filter and sort.")
+        self.clear_filter_conditions()
+        self.sort_keys = []
+        self.sort_keys_label.config(text="")
+        if self.view is not None:
+            self.view.reset()
+            self.show_view_status("Reset filter and sort.")
+
+    # Status line with the visible row count and the memory the filter/sort views hold
+    def show_view_status(self, message):
+        view = self.view
+        self.status_var.set(f"{message} Rows: {len(view):,} of {len(view.base):,} | "
+                            f"current view {format_bytes(view.view_memory())}, "
+                            f"{view.depth} step(s) {format_bytes(view.stack_memory())}")
+
+    def choose_pivot_source(self):
+        file_path = filedialog.askopenfilename(title="Select a CSV or Excel file to pivot",
+                                               filetypes=[("Data files", "*.csv *.xlsx *.xlsm"), ("All files", "*.*")])
+        if file_path:
+            try:
+                columns = read_header(file_path)
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not read the header of {os.path.basename(file_path)}: {e}")
+                return
+            self.pivot_source = file_path
+            self.pivot_source_label.config(text=f"Source: {os.path.basename(file_path)} (streamed)")
+            self.set_pivot_columns(columns)
+
+    def clear_pivot_source(self):
+        self.pivot_source = None
+        self.pivot_source_label.config(text="Source: loaded data")
+        if self.view is not None:
+            self.set_pivot_columns(list(self.view.base.columns))
+
+    def set_pivot_columns(self, columns):
+        for listbox in (self.pivot_index_listbox, self.pivot_values_listbox):
+            listbox.delete(0, tk.END)
+            for column in columns:
+                listbox.insert(tk.END, column)
 
     def create_pivot_table(self):
-        if self.df is None or self.df.empty:
-            messagebox.showwarning("Warning", "No data loaded. Please load an Excel file first.")
+        source = self.pivot_source
+        if source is None and not self.has_data():
+            messagebox.showwarning("Warning", "No data loaded. Please load an Excel file or choose a source file first.")
             return
 
-        index_col = self.pivot_index_var.get()
-        values_col = self.pivot_values_var.get()
-        agg_func = self.agg_func_var.get()
+        index_cols = [self.pivot_index_listbox.get(i) for i in self.pivot_index_listbox.curselection()]
+        values_cols = [self.pivot_values_listbox.get(i) for i in self.pivot_values_listbox.curselection()]
+        agg_funcs = [func for func, var in self.agg_func_vars.items() if var.get()]
 
-        if not index_col or not values_col:
+        if not index_cols or not values_cols:
             messagebox.showwarning("Warning", "Please select both Index and Values columns.")
             return
+        if not agg_funcs:
+            messagebox.showwarning("Warning", "Please select at least one aggregation.")
+            return
 
-        pivot_table = self.df.pivot_table(index=index_col, values=values_col, aggfunc=agg_func)
-        output_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files", "*.xlsx")])
+        output_path = filedialog.asksaveasfilename(defaultextension=".xlsx",
+                                                   filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv")])
 
         if output_path:
-            with pd.ExcelWriter(output_path) as writer:
-                pivot_table.to_excel(writer)
-            messagebox.showinfo("Success", f"Pivot table saved to {output_path}")
+            if source is not None:
+                def pivot(job):
+                    table, summary = pivot_file(source, index_cols, values_cols, agg_funcs, progress_var=job.progress_var)
+                    write_pivot(table, output_path)
+                    return describe_pivot(summary)
+            else:
+                df = self.df
+
+                def pivot(job):
+                    pivot_to_excel(df, index_cols, values_cols, agg_funcs, output_path)
+                    return f"Pivoted {len(df):,} rows"
+
+            get_executor(self).submit("Create Pivot Table", pivot, status_var=self.status_var,
+                                      on_done=lambda message: messagebox.showinfo("Success", f"{message}\nPivot table saved to {output_path}"))
 
     def generate_chart(self):
-        if self.df is None or self.df.empty:
+        if not self.has_data():
             messagebox.showwarning("Warning", "No data loaded. Please load an Excel file first.")
             return
             
@@ -302,46 +608,52 @@ class EnhancedExcelUtilityApp(tk.Tk):
             messagebox.showwarning("Warning", "Please select both X and Y axis columns.")
             return
             
-        plt.figure(figsize=(10, 6))
-        if chart_type == 'line':
-            plt.plot(self.df[x_column], self.df[y_column])
-        elif chart_type == 'bar':
-            plt.bar(self.df[x_column], self.df[y_column])
-        elif chart_type == 'scatter':
-            plt.scatter(self.df[x_column], self.df[y_column])
-        elif chart_type == 'histogram':
-            plt.hist(self.df[y_column], bins=10)
-        elif chart_type == 'box':
-            sns.boxplot(x=self.df[x_column], y=self.df[y_column])
-        
-        plt.title(f"{chart_type.capitalize()} Chart")
-        plt.xlabel(x_column)
-        plt.ylabel(y_column)
-        plt.grid(True)
-        plt.show()
+        # Only what can be seen is handed to matplotlib: downsampled points or precomputed statistics
+        df = self.df
+        # Quick axis changes can finish out of order, so each result is tagged with its generation and
+        # anything but the latest is discarded
+        self.chart_generation += 1
+        if self.chart_job is not None:
+            self.chart_job.cancel()  # Skipped entirely if it has not started yet
+        self.chart_job = get_executor(self).submit(
+            "Prepare Chart", lambda job: prepare_chart(df, chart_type, x_column, y_column),
+            status_var=self.status_var, on_done=partial(self.show_chart, generation=self.chart_generation),
+            on_error=partial(self.chart_failed, generation=self.chart_generation))
+
+    def show_chart(self, data, generation):
+        if generation != self.chart_generation:
+            return
+        draw_chart(self.chart_axes, data)
+        self.chart_canvas.draw_idle()
+        self.chart_shown = True
+        self.status_var.set(describe_chart(data))
+
+    def chart_failed(self, error, generation):
+        if generation == self.chart_generation:
+            messagebox.showerror("Error", f"Prepare Chart failed: {error}")
+
+    def redraw_chart(self, event=None):
+        if self.chart_shown and self.has_data() and self.x_axis_var.get() and self.y_axis_var.get():
+            self.generate_chart()
 
     def convert_to_word(self):
-        if self.df is None or self.df.empty:
+        if not self.has_data():
             messagebox.showwarning("Warning", "No data loaded. Please load an Excel file first.")
             return
             
         output_path = filedialog.asksaveasfilename(defaultextension=".docx", filetypes=[("Word files", "*.docx")])
         if output_path:
-            doc = Document()
-            doc.add_heading('Excel Data', level=1)
-
-            table = doc.add_table(rows=1, cols=len(self.df.columns))
-            hdr_cells = table.rows[0].cells
-            for i, col in enumerate(self.df.columns):
-                hdr_cells[i].text = str(col)
-
-            for index, row in self.df.iterrows():
-                row_cells = table.add_row().cells
-                for i, value in enumerate(row):
-                    row_cells[i].text = str(value)
+            df = self.df
+            try:
+                rows_per_table = max(0, self.word_rows_per_table.get()) or None
+            except tk.TclError:
+                messagebox.showerror("Error", "Rows per table must be a whole number.")
+                return
 
-            doc.save(output_path)
-            messagebox.showinfo("Success", f"Converted to Word and saved at: {output_path}")
+            get_executor(self).submit("Convert to Word", lambda job: dataframe_to_word(df, output_path, rows_per_table, job.progress_var),
+                                      status_var=self.status_var,
+                                      on_done=lambda summary: messagebox.showinfo(
+                                          "Success", f"{describe_table(summary)}\nConverted to Word and saved at: {output_path}"))
 
 if __name__ == "__main__":
     app = EnhancedExcelUtilityApp()
@@ -0,0 +1,87 @@
+# Benchmark for chart_data: time to prepare and draw each chart type on a synthetic sheet against
+# handing every value to matplotlib as generate_chart used to (rendered off-screen with Agg). The
+# redraw time is what every resize, pan or zoom of the embedded canvas costs afterwards.
+#
+#   python benchmarks/bench_chart.py --rows 1000000
+#   python benchmarks/bench_chart.py --rows 5000000 --types line scatter --no-legacy
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from chart_data import CHART_TYPES, prepare_chart, draw_chart
+
+# (x column, y column) per chart type
+COLUMNS = {"line": ("Time", "Level"), "scatter": ("Level", "Noise"), "bar": ("Region", "Noise"),
+           "histogram": ("Region", "Noise"), "box": ("Region", "Noise")}
+
+
+def make_sheet(rows):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"Time": pd.date_range("2024-01-01", periods=rows, freq="s"),
+                         "Level": np.cumsum(rng.normal(size=rows)),
+                         "Noise": rng.standard_t(3, rows),
+                         "Region": rng.choice(["North", "South", "East", "West", "Central"], rows)})
+
+
+def new_axes():
+    figure = Figure(figsize=(10, 6))
+    FigureCanvasAgg(figure)
+    return figure, figure.add_subplot(111)
+
+
+def redraw_time(figure):
+    start = time.perf_counter()
+    figure.canvas.draw()
+    return time.perf_counter() - start
+
+
+# Previous path: every row goes to matplotlib (box plots through Axes.boxplot rather than seaborn)
+def legacy_chart(ax, df, chart_type, x_column, y_column):
+    if chart_type == "line":
+        ax.plot(df[x_column], df[y_column])
+    elif chart_type == "bar":
+        ax.bar(df[x_column], df[y_column])
+    elif chart_type == "scatter":
+        ax.scatter(df[x_column], df[y_column])
+    elif chart_type == "histogram":
+        ax.hist(df[y_column], bins=10)
+    elif chart_type == "box":
+        ax.boxplot([group.to_numpy() for _, group in df.groupby(x_column)[y_column]])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark downsampled chart rendering")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--types", nargs="+", default=list(CHART_TYPES), choices=CHART_TYPES)
+    parser.add_argument("--no-legacy", action="store_true", help="skip the full-data path (very slow for bar charts)")
+    args = parser.parse_args()
+
+    df = make_sheet(args.rows)
+    for chart_type in args.types:
+        x_column, y_column = COLUMNS[chart_type]
+        if not args.no_legacy:
+            figure, ax = new_axes()
+            start = time.perf_counter()
+            legacy_chart(ax, df, chart_type, x_column, y_column)
+            figure.canvas.draw()
+            print(f"{chart_type:9} legacy:      {time.perf_counter() - start:.2f}s, redraw {redraw_time(figure):.2f}s")
+
+        figure, ax = new_axes()
+        start = time.perf_counter()
+        data = prepare_chart(df, chart_type, x_column, y_column)
+        draw_chart(ax, data)
+        figure.canvas.draw()
+        shown = f", {data['points']:,} points" if data["points"] is not None else ""
+        elapsed = time.perf_counter() - start
+        print(f"{chart_type:9} downsampled: {elapsed:.2f}s, redraw {redraw_time(figure):.2f}s{shown}")
+
+
+if __name__ == "__main__":
+    main()
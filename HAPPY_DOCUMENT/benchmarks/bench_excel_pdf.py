@@ -0,0 +1,70 @@
+# Benchmark for table_pdf.sheets_to_pdf: rows/sec of the table renderer against the previous
+# iterrows() + one pdf.cell per row path, on a synthetic sheet (parsing the workbook is not timed).
+#
+#   python benchmarks/bench_excel_pdf.py --rows 100000
+#   python benchmarks/bench_excel_pdf.py --rows 100000 --columns 30 --landscape --legacy-rows 20000
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+from table_pdf import sheets_to_pdf, describe_pdf
+
+
+def make_sheet(rows, columns):
+    rng = np.random.default_rng(0)
+    data = {}
+    for i in range(columns):
+        kind = i % 4
+        if kind == 0:
+            data[f"Amount {i}"] = rng.normal(1000, 250, rows).round(2)
+        elif kind == 1:
+            data[f"Quantity {i}"] = rng.integers(0, 500, rows)
+        elif kind == 2:
+            data[f"Region {i}"] = rng.choice(["North", "South", "East", "West", "Central"], rows)
+        else:
+            data[f"Date {i}"] = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D")
+    return pd.DataFrame(data)
+
+
+# Previous renderer: one comma-joined cell per row on portrait pages
+def legacy_to_pdf(df, output_path):
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    for index, row in df.iterrows():
+        pdf.cell(0, 10, ', '.join(map(str, row.values)), ln=True)
+    pdf.output(output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Excel-to-PDF table rendering")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--columns", type=int, default=8)
+    parser.add_argument("--landscape", action="store_true")
+    parser.add_argument("--legacy-rows", type=int, default=10000,
+                        help="rows rendered with the old path (0 to skip; it is far slower)")
+    args = parser.parse_args()
+
+    df = make_sheet(args.rows, args.columns)
+    with tempfile.TemporaryDirectory() as folder:
+        if args.legacy_rows:
+            subset = df.head(args.legacy_rows)
+            start = time.perf_counter()
+            legacy_to_pdf(subset, os.path.join(folder, "legacy.pdf"))
+            elapsed = time.perf_counter() - start
+            print(f"legacy: {len(subset):,} rows in {elapsed:.1f}s ({len(subset) / elapsed:,.0f} rows/sec)")
+
+        output_path = os.path.join(folder, "table.pdf")
+        summary = sheets_to_pdf([("Benchmark", df)], output_path, landscape=args.landscape)
+        print(f"table:  {describe_pdf(summary)}, {os.path.getsize(output_path) / (1024 * 1024):.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
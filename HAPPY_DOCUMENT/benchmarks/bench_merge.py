@@ -0,0 +1,88 @@
+# Benchmark for pdf_ops.merge_pdfs: wall time and peak memory against the number of input files.
+# Every measurement runs in a fresh process so the peak RSS of one run does not leak into the next.
+#
+#   python benchmarks/bench_merge.py --files 10 100 500 --pages 3
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from pdf_ops import merge_pdfs
+
+
+def peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes on Linux
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+
+
+def make_inputs(folder, num_files, pages):
+    paths = []
+    for i in range(num_files):
+        doc = fitz.open()
+        for page_num in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Invoice {i} - page {page_num + 1}\n" + "Line item\n" * 40)
+        path = os.path.join(folder, f"invoice_{i:05d}.pdf")
+        doc.save(path)
+        doc.close()
+        paths.append(path)
+    return paths
+
+
+# Previous implementation without the simulated sleep: every source stays open until the final save
+def legacy_merge(file_paths, output_path):
+    merger = fitz.open()
+    for pdf in file_paths:
+        merger.insert_pdf(fitz.open(pdf))
+    merger.save(output_path)
+    merger.close()
+
+
+def run(mode, file_paths, output_path, queue):
+    start = time.perf_counter()
+    if mode == "legacy":
+        legacy_merge(file_paths, output_path)
+    else:
+        merge_pdfs(file_paths, output_path)
+    queue.put((time.perf_counter() - start, peak_rss_mb()))
+
+
+def measure(mode, file_paths, output_path):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=run, args=(mode, file_paths, output_path, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF merging")
+    parser.add_argument("--files", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--pages", type=int, default=3, help="pages per input file")
+    args = parser.parse_args()
+
+    print(f"{'files':>6} {'mode':>8} {'wall (s)':>10} {'peak RSS (MB)':>14} {'output (MB)':>12}")
+    with tempfile.TemporaryDirectory() as folder:
+        all_inputs = make_inputs(folder, max(args.files), args.pages)
+        for num_files in args.files:
+            for mode in ("legacy", "stream"):
+                output_path = os.path.join(folder, f"merged_{mode}_{num_files}.pdf")
+                wall, peak = measure(mode, all_inputs[:num_files], output_path)
+                size = os.path.getsize(output_path) / (1024 * 1024)
+                print(f"{num_files:>6} {mode:>8} {wall:>10.2f} {peak:>14.1f} {size:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
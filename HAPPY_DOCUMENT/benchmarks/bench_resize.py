@@ -0,0 +1,82 @@
+# Benchmark for the reduced-size decode path in image_ops: decode time and decoded bitmap size
+# of the old full decode + resize against draft-mode decoding + reduce()-assisted resize.
+#
+#   python benchmarks/bench_resize.py photos/*.jpg --size 800x600
+#   python benchmarks/bench_resize.py --synthetic 7000x5000     (about a 35 MP test JPEG)
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+from image_ops import draft_for_size, fast_resize
+
+
+def bitmap_mb(image):
+    return image.width * image.height * len(image.getbands()) / (1024 * 1024)
+
+
+# Previous path: decode every pixel, then resize
+def full_path(file, size):
+    start = time.perf_counter()
+    with Image.open(file) as image:
+        image.load()
+        decoded = time.perf_counter() - start
+        memory = bitmap_mb(image)
+        image.resize(size)
+    return decoded, time.perf_counter() - start, memory
+
+
+def fast_path(file, size):
+    start = time.perf_counter()
+    with Image.open(file) as image:
+        draft_for_size(image, size)
+        image.load()
+        decoded = time.perf_counter() - start
+        memory = bitmap_mb(image)
+        fast_resize(image, size)
+    return decoded, time.perf_counter() - start, memory
+
+
+def make_synthetic(folder, size):
+    path = os.path.join(folder, "synthetic.jpg")
+    gradient = Image.linear_gradient("L").resize(size)
+    Image.merge("RGB", (gradient, gradient.rotate(90), gradient.transpose(Image.FLIP_LEFT_RIGHT))).save(path, quality=90)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reduced-size image loading")
+    parser.add_argument("inputs", nargs="*", help="images or glob patterns")
+    parser.add_argument("--size", default="800x600", help="target WIDTHxHEIGHT")
+    parser.add_argument("--synthetic", metavar="WIDTHxHEIGHT", help="generate a test JPEG of this size")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    size = tuple(int(value) for value in args.size.lower().split("x"))
+
+    with tempfile.TemporaryDirectory() as folder:
+        files = [file for pattern in args.inputs for file in sorted(glob.glob(pattern))]
+        if args.synthetic:
+            files.append(make_synthetic(folder, tuple(int(value) for value in args.synthetic.lower().split("x"))))
+        if not files:
+            parser.error("give input images or --synthetic")
+
+        print(f"{'file':<30} {'path':>5} {'decode (ms)':>12} {'total (ms)':>11} {'bitmap (MB)':>12}")
+        for file in files:
+            results = {}
+            for name, func in (("full", full_path), ("fast", fast_path)):
+                runs = [func(file, size) for _ in range(args.repeat)]
+                results[name] = [min(run[i] for run in runs) for i in range(3)]
+                decoded, total, memory = results[name]
+                print(f"{os.path.basename(file)[:30]:<30} {name:>5} {decoded * 1000:>12.1f} {total * 1000:>11.1f} {memory:>12.1f}")
+            full, fast = results["full"], results["fast"]
+            print(f"{'':<30} saved {(full[0] - fast[0]) * 1000:>11.1f} {(full[1] - fast[1]) * 1000:>11.1f} {full[2] - fast[2]:>12.1f}"
+                  f"   ({full[1] / fast[1]:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
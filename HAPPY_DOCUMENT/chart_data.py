@@ -0,0 +1,153 @@
+import time
+import numpy as np
+import pandas as pd
+
+CHART_TYPES = ("line", "bar", "scatter", "histogram", "box")
+MAX_LINE_POINTS = 4000  # A few points per horizontal pixel is all a line can show
+SCATTER_GRID = (250, 180)  # Cells of roughly one marker each; at most one point is kept per occupied cell
+HISTOGRAM_BINS = 10
+MAX_FLIERS = 200  # Outliers drawn per box
+
+
+# Numbers the downsampling can measure distances with: numeric values as floats, dates as seconds,
+# anything else (text, categories) as row positions
+def _axis_values(values):
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return ((values - values.min()) / pd.Timedelta(1, "s")).to_numpy(dtype=float)
+    if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+        return values.to_numpy(dtype=float)
+    return np.arange(len(values), dtype=float)
+
+
+# Largest-Triangle-Three-Buckets: positions of `threshold` points that keep the visual shape of the
+# line through (x, y). The first and last points are always kept; from every bucket in between the
+# point forming the largest triangle with the previous pick and the next bucket's average is kept.
+def lttb_indices(x, y, threshold):
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket == threshold - 3:
+            next_x, next_y = x[n - 1], y[n - 1]
+        else:
+            next_end = edges[bucket + 2]
+            next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        px, py = x[previous], y[previous]
+        area = np.abs((px - next_x) * (y[start:end] - py) - (px - x[start:end]) * (next_y - py))
+        previous = start + int(area.argmax())
+        selected[bucket + 1] = previous
+    return selected
+
+
+# Positions of one point per occupied cell of a width x height grid over the data: a scatter plot of
+# the result covers exactly the same cells, so clusters, gaps and outliers all stay visible
+def grid_indices(x, y, width=SCATTER_GRID[0], height=SCATTER_GRID[1]):
+    def cells(values, size):
+        low = values.min()
+        span = (values.max() - low) or 1.0
+        return np.minimum(((values - low) / span * size).astype(np.int64), size - 1)
+
+    _, first = np.unique(cells(x, width) * height + cells(y, height), return_index=True)
+    return np.sort(first)
+
+
+# Quartiles, whiskers (furthest value within 1.5 IQR, as matplotlib and seaborn draw them) and a sample of
+# the outliers for every x group, ready for Axes.bxp. Computed with grouped quantiles instead of
+# handing every value to the plotting library.
+def box_stats(x, y, max_fliers=MAX_FLIERS):
+    codes, labels = pd.factorize(x, sort=pd.api.types.is_numeric_dtype(x.dtype))
+    values = pd.to_numeric(y, errors="coerce").to_numpy(dtype=float)
+    present = (codes >= 0) & np.isfinite(values)
+    codes, values = codes[present], values[present]  # Integer group codes keep every step a fast numeric groupby
+    if not len(values):
+        raise ValueError(f"No numeric values to draw a box plot of {y.name!r}")
+
+    quartiles = pd.Series(values).groupby(codes).quantile([0.25, 0.5, 0.75]).unstack()
+    q1, q3 = quartiles[0.25].to_numpy(), quartiles[0.75].to_numpy()
+    low, high = (q1 - 1.5 * (q3 - q1))[codes], (q3 + 1.5 * (q3 - q1))[codes]
+    inside = (values >= low) & (values <= high)
+    whiskers = pd.Series(values[inside]).groupby(codes[inside]).agg(["min", "max"])
+    outside = pd.Series(values[~inside])
+    fliers = {code: np.sort(group.to_numpy()) for code, group in outside.groupby(codes[~inside])}
+
+    stats = []
+    for code, row in quartiles.iterrows():
+        points = fliers.get(code, np.empty(0))
+        if len(points) > max_fliers:
+            points = points[np.linspace(0, len(points) - 1, max_fliers).astype(np.int64)]  # Keeps the extremes
+        whisker = whiskers.loc[code] if code in whiskers.index else {"min": row[0.25], "max": row[0.75]}
+        stats.append({"label": str(labels[code]), "q1": row[0.25], "med": row[0.5], "q3": row[0.75],
+                      "whislo": whisker["min"], "whishi": whisker["max"], "fliers": points})
+    return stats
+
+
+# Everything needed to draw a chart of y against x, reduced to what can be seen: lines are downsampled
+# with LTTB, scatter plots by grid occupancy, bars to one bar per x value (the extent the overlapping
+# bars would cover), histograms to bin counts and box plots to their statistics.
+# Returns a dict for draw_chart.
+def prepare_chart(df, chart_type, x_column, y_column, max_points=MAX_LINE_POINTS):
+    start = time.perf_counter()
+    x, y = df[x_column], df[y_column]
+    rows = len(df)
+    data = {"type": chart_type, "x_label": str(x_column), "y_label": str(y_column), "rows": rows}
+
+    if chart_type in ("line", "scatter"):
+        present = (x.notna() & y.notna()).to_numpy()
+        x, y = x[present], y[present]
+        xs, ys = _axis_values(x), _axis_values(y)
+        if chart_type == "line":
+            keep = lttb_indices(xs, ys, max_points)
+        else:
+            keep = grid_indices(xs, ys) if len(xs) > max_points else np.arange(len(xs))
+        data.update(x=x.iloc[keep].to_numpy(), y=y.iloc[keep].to_numpy(), points=len(keep))
+    elif chart_type == "bar":
+        values = pd.to_numeric(y, errors="coerce")
+        groups = values.groupby(x.to_numpy(), sort=False, observed=True)
+        high, low = groups.max().clip(lower=0), groups.min().clip(upper=0)
+        data.update(labels=high.index.to_numpy(), high=high.to_numpy(), low=low.to_numpy(), points=len(high))
+    elif chart_type == "histogram":
+        values = pd.to_numeric(y, errors="coerce").to_numpy(dtype=float)
+        counts, edges = np.histogram(values[np.isfinite(values)], bins=HISTOGRAM_BINS)
+        data.update(counts=counts, edges=edges, points=len(counts))
+    elif chart_type == "box":
+        data.update(stats=box_stats(x, y), points=None)
+    else:
+        raise ValueError(f"Unsupported chart type: {chart_type} (use {', '.join(CHART_TYPES)})")
+    data["elapsed"] = time.perf_counter() - start
+    return data
+
+
+# Draw prepared chart data on a matplotlib Axes (cleared first, so one figure can be redrawn in place)
+def draw_chart(ax, data):
+    ax.clear()
+    chart_type = data["type"]
+    if chart_type == "line":
+        ax.plot(data["x"], data["y"])
+    elif chart_type == "scatter":
+        ax.scatter(data["x"], data["y"])
+    elif chart_type == "bar":
+        ax.bar(data["labels"], data["high"])
+        if (data["low"] < 0).any():
+            ax.bar(data["labels"], data["low"], color=ax.patches[0].get_facecolor() if ax.patches else None)
+    elif chart_type == "histogram":
+        edges = data["edges"]
+        ax.hist(edges[:-1], bins=edges, weights=data["counts"])
+    elif chart_type == "box":
+        ax.bxp(data["stats"])
+
+    title = f"{chart_type.capitalize()} Chart"
+    if data["points"] is not None and chart_type in ("line", "scatter") and data["points"] < data["rows"]:
+        title += f" ({data['points']:,} of {data['rows']:,} points shown)"
+    ax.set_title(title)
+    ax.set_xlabel(data["x_label"])
+    ax.set_ylabel(data["y_label"])
+    ax.grid(True)
+
+
+def describe_chart(data):
+    return f"Prepared a {data['type']} chart of {data['rows']:,} rows in {data['elapsed']:.2f}s"
@@ -0,0 +1,358 @@
+# Headless command-line entry point for the document utilities (no tkinter / ttkbootstrap).
+#
+#   python cli.py ocr "scans/*.pdf" -o text/ --jobs 8
+#   python cli.py merge-pdf "invoices/**/*.pdf" -o all_invoices.pdf
+#   python cli.py image-resize "photos/*.jpg" --width 800 --height 600 -o small/ --jobs 4
+#
+# Heavy libraries are imported inside each command so startup stays fast.
+import argparse
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+# Expand glob patterns (shells on Windows do not), keeping the given order and dropping duplicates
+def expand_inputs(patterns):
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if os.path.isfile(path) and path not in files:
+                files.append(path)
+    if not files:
+        raise SystemExit("No input files matched.")
+    return files
+
+
+def output_path_for(file, output_dir, ext, suffix=""):
+    folder = output_dir or os.path.dirname(file)
+    os.makedirs(folder or ".", exist_ok=True)
+    return os.path.join(folder, os.path.splitext(os.path.basename(file))[0] + suffix + ext)
+
+
+# Print progress for functions that take a progress_var
+class ConsoleProgress:
+    def __init__(self, label):
+        self.label = label
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+        print(f"\r{self.label}: {value:5.1f}%", end="", file=sys.stderr, flush=True)
+        if value >= 100:
+            print(file=sys.stderr)
+
+    def get(self):
+        return self.value
+
+
+# Run func(*args) for every task, across `jobs` processes when jobs > 1. Returns the number of failures.
+def run_tasks(func, tasks, jobs):
+    failures = 0
+    if jobs <= 1 or len(tasks) <= 1:
+        for args in tasks:
+            try:
+                func(*args)
+                print(f"Wrote {args[1]}")
+            except Exception as e:
+                failures += 1
+                print(f"Failed {args[0]}: {e}", file=sys.stderr)
+        return failures
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(func, *args): args for args in tasks}
+        for future in as_completed(futures):
+            args = futures[future]
+            try:
+                future.result()
+                print(f"Wrote {args[1]}")
+            except Exception as e:
+                failures += 1
+                print(f"Failed {args[0]}: {e}", file=sys.stderr)
+    return failures
+
+
+def cmd_ocr(args):
+    from ocr import extract_text_ocr, extract_text_hybrid, describe_methods
+    failures = 0
+    for file in expand_inputs(args.inputs):
+        output_file = output_path_for(file, args.output, ".txt")
+        try:
+            if args.hybrid:
+                text, methods = extract_text_hybrid(file, workers=args.jobs, dpi=args.dpi, lang=args.lang,
+                                                    progress_var=ConsoleProgress(file))
+                print(f"{file}: {describe_methods(methods)}")
+            else:
+                text = extract_text_ocr(file, workers=args.jobs, dpi=args.dpi, lang=args.lang,
+                                        progress_var=ConsoleProgress(file))
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(text)
+            print(f"Wrote {output_file}")
+        except Exception as e:
+            failures += 1
+            print(f"Failed {file}: {e}", file=sys.stderr)
+    return failures
+
+
+def cmd_merge_pdf(args):
+    from pdf_ops import merge_pdfs
+    merge_pdfs(expand_inputs(args.inputs), args.output, ConsoleProgress("Merging"))
+    print(f"Wrote {args.output}")
+    return 0
+
+
+def cmd_pdf_to_word(args):
+    from pdf_ops import pdf_to_word
+    tasks = [(file, output_path_for(file, args.output, ".docx")) for file in expand_inputs(args.inputs)]
+    return run_tasks(pdf_to_word, tasks, args.jobs)
+
+
+def cmd_pdf_to_excel(args):
+    from pdf_ops import pdf_to_excel
+    # Files run one after another with --jobs workers on their pages; the workers (and their JVMs)
+    # stay up from one file to the next
+    failures = 0
+    for file in expand_inputs(args.inputs):
+        output_file = output_path_for(file, args.output, ".xlsx")
+        try:
+            summary = pdf_to_excel(file, output_file, ConsoleProgress(os.path.basename(file)), args.jobs, args.batch_pages)
+            print(f"Wrote {output_file} ({summary['tables']} tables from {summary['pages']} pages)")
+        except Exception as e:
+            failures += 1
+            print(f"Failed {file}: {e}", file=sys.stderr)
+    return failures
+
+
+def _write_word_text(file, output_file):
+    from word_ops import extract_text_word
+    text = extract_text_word(file)
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def cmd_word_text(args):
+    tasks = [(file, output_path_for(file, args.output, ".txt")) for file in expand_inputs(args.inputs)]
+    return run_tasks(_write_word_text, tasks, args.jobs)
+
+
+def cmd_merge_word(args):
+    from word_ops import merge_word_files
+    merge_word_files(expand_inputs(args.inputs), args.output, ConsoleProgress("Merging"))
+    print(f"Wrote {args.output}")
+    return 0
+
+
+def cmd_image_convert(args):
+    from image_ops import convert_image
+    tasks = [(file, output_path_for(file, args.output, "." + args.format.lstrip("."))) for file in expand_inputs(args.inputs)]
+    return run_tasks(convert_image, tasks, args.jobs)
+
+
+def cmd_image_resize(args):
+    from image_ops import resize_image
+    tasks = [(file, output_path_for(file, args.output, ".jpg", "_resized"), args.width, args.height)
+             for file in expand_inputs(args.inputs)]
+    return run_tasks(resize_image, tasks, args.jobs)
+
+
+def cmd_image_rotate(args):
+    from image_ops import rotate_image
+    tasks = [(file, output_path_for(file, args.output, ".jpg", "_rotated"), args.angle) for file in expand_inputs(args.inputs)]
+    return run_tasks(rotate_image, tasks, args.jobs)
+
+
+def cmd_image_compress(args):
+    from image_ops import compress_image
+    tasks = [(file, output_path_for(file, args.output, ".jpg", "_compressed"), args.quality)
+             for file in expand_inputs(args.inputs)]
+    return run_tasks(compress_image, tasks, args.jobs)
+
+
+def cmd_image_batch(args):
+    from image_ops import batch_process, describe_batch
+    steps = []
+    if args.resize:
+        width, height = (int(value) for value in args.resize.lower().split("x"))
+        steps.append(("resize", {"width": width, "height": height}))
+    if args.rotate is not None:
+        steps.append(("rotate", {"angle": args.rotate}))
+    if args.quality is not None:
+        steps.append(("compress", {"quality": args.quality}))
+    if args.format:
+        steps.append(("convert", {"format": args.format}))
+    if not steps:
+        raise SystemExit("Give at least one of --resize, --rotate, --quality or --format.")
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+
+    summary = batch_process(expand_inputs(args.inputs), steps, args.output, args.jobs, ConsoleProgress("Processing"))
+    print(describe_batch(summary))
+    return len(summary["failures"])
+
+
+def _write_image_text(file, output_file, lang):
+    from ocr import ocr_image_file
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(ocr_image_file(file, lang=lang))
+
+
+def cmd_image_ocr(args):
+    tasks = [(file, output_path_for(file, args.output, ".txt"), args.lang) for file in expand_inputs(args.inputs)]
+    return run_tasks(_write_image_text, tasks, args.jobs)
+
+
+def cmd_excel_to_pdf(args):
+    from excel_ops import excel_to_pdf
+    tasks = [(file, output_path_for(file, args.output, ".pdf"), args.landscape, not args.no_fit)
+             for file in expand_inputs(args.inputs)]
+    return run_tasks(excel_to_pdf, tasks, args.jobs)
+
+
+def cmd_excel_to_csv(args):
+    from csv_export import COMPRESSIONS, export_sheets, describe_export
+    files = expand_inputs(args.inputs)
+    if not args.all_sheets and not args.sheets:
+        from excel_ops import excel_to_csv
+        tasks = [(file, output_path_for(file, args.output, COMPRESSIONS[args.compression]), args.compression, args.buffer_rows)
+                 for file in files]
+        return run_tasks(excel_to_csv, tasks, args.jobs)
+
+    # Sheets of one workbook are exported in parallel
+    failures = 0
+    for file in files:
+        try:
+            summary = export_sheets(file, args.output or os.path.dirname(file), None if args.all_sheets else args.sheets,
+                                    args.compression, args.buffer_rows, args.jobs, ConsoleProgress(os.path.basename(file)))
+            print(describe_export(summary))
+            for output_file in summary["files"]:
+                print(f"Wrote {output_file}")
+        except Exception as e:
+            failures += 1
+            print(f"Failed {file}: {e}", file=sys.stderr)
+    return failures
+
+
+def cmd_excel_to_word(args):
+    from excel_ops import excel_to_word
+    tasks = [(file, output_path_for(file, args.output, ".docx"), args.rows_per_table) for file in expand_inputs(args.inputs)]
+    return run_tasks(excel_to_word, tasks, args.jobs)
+
+
+def cmd_excel_report(args):
+    from workbook import LazyWorkbook
+    from report_engine import build_report, write_report
+    failures = 0
+    for file in expand_inputs(args.inputs):
+        try:
+            report = build_report(LazyWorkbook(file), columns=args.columns, group_by=args.group_by)
+            for fmt in args.format:
+                output_file = output_path_for(file, args.output, "." + fmt, "_report")
+                write_report(report, output_file)  # Aggregates are computed once for all formats
+                print(f"Wrote {output_file}")
+        except Exception as e:
+            failures += 1
+            print(f"Failed {file}: {e}", file=sys.stderr)
+    return failures
+
+
+def cmd_merge_excel(args):
+    from excel_merge import stream_merge_excel, describe_merge
+    summary = stream_merge_excel(expand_inputs(args.inputs), args.output, ConsoleProgress("Merging"), workers=args.jobs,
+                                 align_schema=args.align_schema)
+    print(describe_merge(summary))
+    print(f"Wrote {args.output}")
+    return 0
+
+
+def _pivot_file(file, output_file, index_cols, values_cols, agg_funcs, sheet_name, chunk_rows):
+    from pivot_engine import pivot_file, write_pivot, describe_pivot
+    pivot, summary = pivot_file(file, index_cols, values_cols, agg_funcs, sheet_name, chunk_rows)
+    write_pivot(pivot, output_file)
+    print(f"{os.path.basename(file)}: {describe_pivot(summary)}")
+
+
+def cmd_pivot(args):
+    ext = "." + args.format
+    tasks = [(file, output_path_for(file, args.output, ext, "_pivot"), args.index, args.values, args.agg, args.sheet,
+              args.chunk_rows) for file in expand_inputs(args.inputs)]
+    return run_tasks(_pivot_file, tasks, args.jobs)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Headless HAPPY DOCUMENT utilities")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add(name, func, help_text, output_help="output directory (default: next to each input)", output_required=False):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("inputs", nargs="+", help="input files or glob patterns (quote them to keep the shell from expanding)")
+        sub.add_argument("-o", "--output", required=output_required, help=output_help)
+        sub.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="parallel worker processes")
+        sub.set_defaults(func=func)
+        return sub
+
+    sub = add("ocr", cmd_ocr, "extract text from PDFs with OCR (--jobs = pages in parallel)")
+    sub.add_argument("--dpi", type=int, default=72, help="render resolution for OCR")
+    sub.add_argument("--lang", default="eng", help="Tesseract language")
+    sub.add_argument("--hybrid", action="store_true", help="use the embedded text layer where available")
+
+    add("merge-pdf", cmd_merge_pdf, "merge PDFs in the given order", "output PDF file", True)
+    add("pdf-to-word", cmd_pdf_to_word, "convert PDFs to .docx")
+    sub = add("pdf-to-excel", cmd_pdf_to_excel, "extract PDF tables to .xlsx (--jobs = page batches in parallel)")
+    sub.add_argument("--batch-pages", type=int, help="pages per extraction batch (default depends on whether jpype is installed)")
+    add("word-text", cmd_word_text, "extract text from Word documents")
+    add("merge-word", cmd_merge_word, "merge Word documents in the given order", "output .docx file", True)
+
+    sub = add("image-convert", cmd_image_convert, "convert images to another format")
+    sub.add_argument("--format", required=True, help="output format, e.g. png, jpg, bmp")
+    sub = add("image-resize", cmd_image_resize, "resize images")
+    sub.add_argument("--width", type=int, required=True)
+    sub.add_argument("--height", type=int, required=True)
+    sub = add("image-rotate", cmd_image_rotate, "rotate images")
+    sub.add_argument("--angle", type=int, required=True, help="degrees, counter-clockwise")
+    sub = add("image-compress", cmd_image_compress, "re-encode images as JPEG")
+    sub.add_argument("--quality", type=int, default=75, choices=range(1, 101), metavar="1-100")
+    sub = add("image-batch", cmd_image_batch, "resize -> rotate -> compress -> convert in one pass per image")
+    sub.add_argument("--resize", metavar="WIDTHxHEIGHT")
+    sub.add_argument("--rotate", type=int, metavar="DEGREES")
+    sub.add_argument("--quality", type=int, choices=range(1, 101), metavar="1-100")
+    sub.add_argument("--format", help="output format, e.g. png, jpg, webp")
+    sub = add("image-ocr", cmd_image_ocr, "extract text from images with OCR")
+    sub.add_argument("--lang", default="eng", help="Tesseract language")
+
+    sub = add("excel-to-pdf", cmd_excel_to_pdf, "convert every sheet of workbooks to paginated PDF tables")
+    sub.add_argument("--landscape", action="store_true", help="landscape pages")
+    sub.add_argument("--no-fit", action="store_true", help="keep the font size instead of shrinking wide tables")
+    sub = add("excel-to-csv", cmd_excel_to_csv, "stream sheets of workbooks to CSV (the first sheet by default)")
+    sub.add_argument("--sheets", nargs="+", help="sheets to export, one file each")
+    sub.add_argument("--all-sheets", action="store_true", help="export every sheet, one file each")
+    sub.add_argument("--compression", default="none", choices=["none", "gzip", "zstd"])
+    sub.add_argument("--buffer-rows", type=int, default=10000, help="rows collected before each write")
+    sub = add("excel-to-word", cmd_excel_to_word, "convert the first sheet of workbooks to a Word table")
+    sub.add_argument("--rows-per-table", type=int, help="split large tables into sections of this many rows")
+    sub = add("excel-report", cmd_excel_report, "statistics for many columns and groups across all sheets")
+    sub.add_argument("--columns", nargs="+", help="metric columns (default: every numeric column)")
+    sub.add_argument("--group-by", nargs="+", help="columns to group the statistics by")
+    sub.add_argument("--format", nargs="+", default=["pdf"], choices=["pdf", "xlsx", "json"])
+    sub = add("merge-excel", cmd_merge_excel, "merge workbooks into one sheet (streamed, constant memory)",
+              "output .xlsx, .csv or .parquet file", True)
+    sub.add_argument("--align-schema", action="store_true",
+                     help="scan all inputs first and reconcile column types (downcast numbers, categorical text)")
+    sub = add("pivot", cmd_pivot, "pivot CSV files or workbook sheets in row chunks (sources larger than memory)")
+    sub.add_argument("--index", nargs="+", required=True, help="columns to group by")
+    sub.add_argument("--values", nargs="+", required=True, help="columns to aggregate")
+    sub.add_argument("--agg", nargs="+", default=["sum"], choices=["sum", "mean", "count", "min", "max"])
+    sub.add_argument("--sheet", help="workbook sheet (default: the first)")
+    sub.add_argument("--chunk-rows", type=int, default=200000, help="rows read and aggregated at a time")
+    sub.add_argument("--format", default="xlsx", choices=["xlsx", "csv"])
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.jobs = max(1, args.jobs)
+    return 1 if args.func(args) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+import csv
+import datetime
+import gzip
+import io
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from openpyxl import load_workbook
+from workbook import sheet_headers
+from progress import set_progress
+
+try:
+    import zstandard
+    HAVE_ZSTD = True
+except ImportError:
+    HAVE_ZSTD = False
+
+COMPRESSIONS = {"none": ".csv", "gzip": ".csv.gz", "zstd": ".csv.zst"}  # Compression -> file extension
+DEFAULT_BUFFER_ROWS = 10000  # Rows collected before each write
+FILE_BUFFER_BYTES = 1024 * 1024  # Bytes handed to the compressor / disk at a time
+GZIP_LEVEL = 6  # zlib's default; level 9 is several times slower for a few percent
+ZSTD_LEVEL = 3
+
+
+def _is_xlsx(path):
+    return os.path.splitext(path)[1].lower() in (".xlsx", ".xlsm")
+
+
+# Text stream for a CSV file, optionally gzip or zstd compressed, written in FILE_BUFFER_BYTES blocks
+def open_csv_output(output_path, compression="none"):
+    if compression == "gzip":
+        binary = io.BufferedWriter(gzip.GzipFile(output_path, "wb", compresslevel=GZIP_LEVEL), FILE_BUFFER_BYTES)
+    elif compression == "zstd":
+        if not HAVE_ZSTD:
+            raise RuntimeError("zstd compression needs the zstandard package (pip install zstandard)")
+        raw = open(output_path, "wb")
+        binary = io.BufferedWriter(zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=True),
+                                   FILE_BUFFER_BYTES)
+    elif compression == "none":
+        return open(output_path, "w", newline="", encoding="utf-8", buffering=FILE_BUFFER_BYTES)
+    else:
+        raise ValueError(f"Unknown compression: {compression} (use {', '.join(COMPRESSIONS)})")
+    return io.TextIOWrapper(binary, encoding="utf-8", newline="")
+
+
+# Cell values as pandas writes them: blank for empty cells, dates without a midnight time part
+def _cell_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime.datetime) and value.time() == datetime.time(0):
+        return value.date().isoformat()
+    return value
+
+
+# Stream one sheet to CSV with openpyxl's read-only reader: rows are converted and written buffer_rows
+# at a time, so a sheet of any size is never held in memory. The columns are the ones read_excel gives
+# (data under a blank header cell becomes "Unnamed: N"), and the output matches read_excel + to_csv
+# except that numbers are written as stored in the cell (a whole number in a decimal column stays "99",
+# not "99.0"). Trailing empty rows are dropped, as pandas does. on_rows(rows written, total rows or None)
+# reports progress. Returns the rows written.
+def export_sheet(path, sheet_name, output_path, compression="none", buffer_rows=DEFAULT_BUFFER_ROWS, on_rows=None):
+    if not _is_xlsx(path):
+        # Legacy .xls has no streaming reader
+        df = pd.read_excel(path, sheet_name=sheet_name if sheet_name is not None else 0)
+        return write_frame_csv(df, output_path, compression, buffer_rows)
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name is not None else wb.worksheets[0]
+        total = (ws.max_row - 1) if ws.max_row else None  # From the sheet's dimension record, when present
+        header = sheet_headers(ws, sample_rows=None)  # As pandas names them, including data under blank header cells
+        width = len(header)
+        rows = ws.iter_rows(min_row=2, values_only=True)
+        written = 0
+        blank = []  # Empty rows held back until a later row shows they are not trailing
+        with open_csv_output(output_path, compression) as f:
+            writer = csv.writer(f, lineterminator=os.linesep)  # The line ending to_csv uses
+            writer.writerow(header)
+            buffer = []
+            for row in rows:
+                cells = [_cell_text(value) for value in row[:width]]
+                cells.extend([""] * (width - len(cells)))
+                if all(cell == "" for cell in cells):
+                    blank.append(cells)
+                    continue
+                if blank:
+                    buffer.extend(blank)
+                    blank = []
+                buffer.append(cells)
+                if len(buffer) >= buffer_rows:
+                    writer.writerows(buffer)
+                    written += len(buffer)
+                    buffer = []
+                    if on_rows is not None:
+                        on_rows(written, total)
+            writer.writerows(buffer)
+            written += len(buffer)
+        if on_rows is not None:
+            on_rows(written, written)
+        return written
+    finally:
+        wb.close()
+
+
+# Write a DataFrame (e.g. a filtered view) the same way, buffer_rows at a time
+def write_frame_csv(df, output_path, compression="none", buffer_rows=DEFAULT_BUFFER_ROWS):
+    with open_csv_output(output_path, compression) as f:
+        df.to_csv(f, index=False, chunksize=buffer_rows)
+    return len(df)
+
+
+# "Sales Q1/2024" -> "Sales_Q1_2024", safe as part of a file name on every platform
+def _safe_name(name):
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", str(name)).strip("._") or "sheet"
+
+
+# Output file for every sheet: <workbook>_<sheet>.csv[.gz|.zst] in output_dir, kept unique
+def sheet_output_paths(path, sheet_names, output_dir, compression="none"):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    paths = {}
+    used = set()
+    for name in sheet_names:
+        base = f"{stem}_{_safe_name(name)}"
+        candidate, suffix = base, 1
+        while candidate.lower() in used:
+            suffix += 1
+            candidate = f"{base}_{suffix}"
+        used.add(candidate.lower())
+        paths[name] = os.path.join(output_dir, candidate + COMPRESSIONS[compression])
+    return paths
+
+
+def _sheet_sizes(path, sheet_names):
+    if not _is_xlsx(path):
+        return {name: 1 for name in sheet_names}
+    wb = load_workbook(path, read_only=True)
+    try:
+        return {name: max(wb[name].max_row or 1, 1) for name in sheet_names}
+    finally:
+        wb.close()
+
+
+# Function to export every sheet of a workbook (or the named ones) to CSV files in output_dir.
+# Sheets are streamed in parallel worker processes, each with its own read-only reader; a single sheet
+# is exported in this process with row-level progress. Returns {"sheets", "rows", "files", "elapsed",
+# "rows_per_sec"}.
+def export_sheets(path, output_dir, sheet_names=None, compression="none", buffer_rows=DEFAULT_BUFFER_ROWS,
+                  workers=None, progress_var=None):
+    start = time.perf_counter()
+    if _is_xlsx(path):
+        wb = load_workbook(path, read_only=True)
+        available = wb.sheetnames
+        wb.close()
+    else:
+        with pd.ExcelFile(path) as excel_file:
+            available = list(excel_file.sheet_names)
+    sheet_names = available if sheet_names is None else list(sheet_names)
+    missing = [name for name in sheet_names if name not in available]
+    if missing:
+        raise KeyError(f"No sheet named {', '.join(map(repr, missing))} in {os.path.basename(path)}")
+    os.makedirs(output_dir or ".", exist_ok=True)
+    outputs = sheet_output_paths(path, sheet_names, output_dir, compression)
+    workers = min(workers or os.cpu_count() or 1, len(sheet_names)) if sheet_names else 1
+
+    rows = 0
+    if workers <= 1:
+        for index, name in enumerate(sheet_names):
+            def on_rows(written, total, index=index):
+                done = min(written / total, 1) if total else 0
+                set_progress(progress_var, (index + done) / len(sheet_names) * 100)
+            rows += export_sheet(path, name, outputs[name], compression, buffer_rows, on_rows)
+    else:
+        sizes = _sheet_sizes(path, sheet_names)
+        total = sum(sizes.values())
+        done = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(export_sheet, path, name, outputs[name], compression, buffer_rows): name
+                       for name in sheet_names}
+            try:
+                for future in as_completed(futures):
+                    rows += future.result()
+                    done += sizes[futures[future]]
+                    set_progress(progress_var, done / total * 100)
+            except BaseException:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    elapsed = time.perf_counter() - start
+    return {"sheets": len(sheet_names), "rows": rows, "files": [outputs[name] for name in sheet_names],
+            "elapsed": elapsed, "rows_per_sec": rows / elapsed if elapsed else 0.0}
+
+
+def describe_export(summary):
+    return (f"Exported {summary['rows']:,} rows from {summary['sheets']} sheet(s) in {summary['elapsed']:.1f}s "
+            f"({summary['rows_per_sec']:,.0f} rows/sec)")
@@ -0,0 +1,99 @@
+import os
+import threading
+
+
+# Base for the on-disk caches (OCR text, thumbnails, parsed sheets): a directory of entry files named
+# after their key, capped at max_bytes with least recently used eviction. The file mtime is the LRU
+# clock, bumped on every hit, so several processes can share one directory. Subclasses set suffixes
+# (the extensions their entries use) and do their own serialization through _path and _store_file.
+class DiskCache:
+    suffixes = ()
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+
+    def _path(self, key, suffix=None):
+        return os.path.join(self.cache_dir, key + (self.suffixes[0] if suffix is None else suffix))
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(self.suffixes):
+                    stat = entry.stat()
+                    entries.append((entry.path, stat.st_mtime, stat.st_size))
+        return entries
+
+    # Mark an entry as recently used
+    def _touch(self, path):
+        os.utime(path)
+
+    # Save an entry with write(tmp_path) and move it into place; the rename is atomic, so concurrent
+    # readers never see half an entry
+    def _store_file(self, path, write):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            write(tmp_path)
+            # An existing entry under the same key is overwritten, so only the difference counts
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = 0
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self._lock:
+            self._size += os.path.getsize(path) - old_size
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    # Remove least recently used entries until the cache is back under 90% of its cap
+    def evict(self):
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda entry: entry[1])
+            size = sum(entry[2] for entry in entries)
+            target = self.max_bytes * 0.9
+            for path, _, entry_size in entries:
+                if size <= target:
+                    break
+                try:
+                    os.remove(path)
+                    size -= entry_size
+                except OSError:
+                    pass
+            self._size = size
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self):
+        with self._lock:
+            for path, _, _ in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+        }
@@ -1,8 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import pandas as pd
-from fpdf import FPDF
 import os
+from jobs import get_executor
+from excel_ops import merge_excel_files  # Headless Excel operations
+from report_engine import build_report, write_report
+from excel_merge import describe_merge
+from table_pdf import sheets_to_pdf, describe_pdf
+from workbook import LazyWorkbook
+from frame_optimizer import optimize_frame
 
 class ExcelUtilityApp(tk.Tk):
     def __init__(self , window):
@@ -30,7 +36,7 @@ class ExcelUtilityApp(tk.Tk):
 
         # Initialize variables
         self.selected_file = ""
-        self.df = None
+        self.workbook = None
 
         # Create tabs
         self.create_tabs()
@@ -62,10 +68,14 @@ class ExcelUtilityApp(tk.Tk):
         ttk.Button(frame, text="Load Excel File", command=self.browse_file).pack(pady=10)
         self.file_label = ttk.Label(frame, text="No file selected")
         self.file_label.pack(pady=5)
+        self.optimize_memory_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(frame, text="Optimize memory of loaded sheets", variable=self.optimize_memory_var).pack(pady=5)
 
     def create_merge_tab(self, frame):
         ttk.Label(frame, text="Merge Excel Files", font=('Helvetica', 16)).pack(pady=10)
         ttk.Button(frame, text="Add Files", command=self.add_files).pack(pady=5)
+        self.align_schema_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(frame, text="Align columns and reconcile types", variable=self.align_schema_var).pack(pady=5)
         ttk.Button(frame, text="Merge Files", command=self.merge_files).pack(pady=5)
         self.files_to_merge = []
 
@@ -75,10 +85,18 @@ class ExcelUtilityApp(tk.Tk):
         self.report_file_label = ttk.Label(frame, text="No file selected")
         self.report_file_label.pack(pady=5)
         
-        ttk.Label(frame, text="Column for Report Metric:").pack(pady=5)
-        self.report_column_var = tk.StringVar()
-        self.report_column_combo = ttk.Combobox(frame, textvariable=self.report_column_var)
-        self.report_column_combo.pack(pady=5)
+        # Several metric and group-by columns can be selected; no metric selection means every numeric column
+        lists_frame = ttk.Frame(frame)
+        lists_frame.pack(pady=5)
+        ttk.Label(lists_frame, text="Columns for Report Metrics:").grid(row=0, column=0, padx=5)
+        ttk.Label(lists_frame, text="Group By:").grid(row=0, column=1, padx=5)
+        self.report_columns_listbox = tk.Listbox(lists_frame, selectmode=tk.MULTIPLE, exportselection=False, height=6)
+        self.report_columns_listbox.grid(row=1, column=0, padx=5)
+        self.report_group_listbox = tk.Listbox(lists_frame, selectmode=tk.MULTIPLE, exportselection=False, height=6)
+        self.report_group_listbox.grid(row=1, column=1, padx=5)
+
+        self.report_all_sheets_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(frame, text="All sheets", variable=self.report_all_sheets_var).pack(pady=5)
         ttk.Button(frame, text="Generate Report", command=self.generate_report).pack(pady=10)
 
     def create_validation_tab(self, frame):
@@ -102,7 +120,11 @@ class ExcelUtilityApp(tk.Tk):
         control_panel_frame = ttk.Frame(frame, padding=(10, 10), relief="groove")
         control_panel_frame.pack(pady=10, fill='x')
         control_panel_frame.configure(style='Dark.TFrame')
-        ttk.Button(control_panel_frame, text="Convert First Sheet to PDF", command=self.convert_to_pdf).pack(pady=10)
+        self.pdf_landscape_var = tk.BooleanVar(value=False)
+        self.pdf_fit_width_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(control_panel_frame, text="Landscape", variable=self.pdf_landscape_var).pack(pady=2)
+        ttk.Checkbutton(control_panel_frame, text="Fit to page width", variable=self.pdf_fit_width_var).pack(pady=2)
+        ttk.Button(control_panel_frame, text="Convert All Sheets to PDF", command=self.convert_to_pdf).pack(pady=10)
 
     def browse_file(self):
         file_path = filedialog.askopenfilename(title="Select an Excel file", filetypes=[("Excel files", "*.xlsx *.xls")])
@@ -112,21 +134,40 @@ class ExcelUtilityApp(tk.Tk):
             self.report_file_label.config(text=os.path.basename(file_path))
             self.validation_file_label.config(text=os.path.basename(file_path))
             self.convert_file_label.config(text=os.path.basename(file_path))
-            self.df = pd.read_excel(self.selected_file, sheet_name=None)
-            self.update_combo_boxes()
-            self.status_var.set("Loaded file: " + self.selected_file)
+            optimize = optimize_frame if self.optimize_memory_var.get() else None
+            get_executor(self).submit("Load Excel File", lambda job: LazyWorkbook(file_path, optimize=optimize),
+                                      status_var=self.status_var, on_done=self.on_file_loaded)
+
+    def on_file_loaded(self, workbook):
+        # Only sheet names and headers have been read; sheets are parsed when an operation needs them
+        self.workbook = workbook
+        self.update_combo_boxes()
+        self.status_var.set(f"Loaded file: {self.selected_file} ({len(workbook.sheet_names)} sheets)")
 
     def update_combo_boxes(self):
-        if self.df is not None and len(self.df) > 0:
-            columns = list(self.df.values())[0].columns.tolist()
-            self.report_column_combo['values'] = columns
+        if self.workbook is not None and self.workbook.sheet_names:
+            columns = self.workbook.columns()
+            for listbox in (self.report_columns_listbox, self.report_group_listbox):
+                listbox.delete(0, tk.END)
+                for column in columns:
+                    listbox.insert(tk.END, column)
             self.validation_column_combo['values'] = columns
 
-    def extract_data(self):
-        if self.df is None or len(self.df) == 0:
+    def has_data(self):
+        if self.workbook is None or not self.workbook.sheet_names:
             messagebox.showwarning("Warning", "No data loaded. Please load an Excel file first.")
+            return False
+        return True
+
+    def extract_data(self):
+        if not self.has_data():
             return
-        extracted_data = pd.concat(self.df.values())
+        workbook = self.workbook
+        get_executor(self).submit("Extract Data", lambda job: pd.concat(workbook.all_sheets().values()),
+                                  status_var=self.status_var, on_done=self.show_extracted_data)
+
+    def show_extracted_data(self, extracted_data):
+        self.status_var.set(self.workbook.describe_memory())
         messagebox.showinfo("Extracted Data", extracted_data.to_string())
 
     def add_files(self):
@@ -139,57 +180,70 @@ class ExcelUtilityApp(tk.Tk):
         if not self.files_to_merge:
             messagebox.showwarning("Warning", "No files added for merging.")
             return
-        merged_df = pd.concat([pd.read_excel(file) for file in self.files_to_merge], ignore_index=True)
-        output_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files", "*.xlsx")])
+        # CSV and Parquet are much faster to write than .xlsx for large merges
+        output_path = filedialog.asksaveasfilename(defaultextension=".xlsx",
+                                                   filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"),
+                                                              ("Parquet files", "*.parquet")])
         if output_path:
-            merged_df.to_excel(output_path, index=False)
-            messagebox.showinfo("Success", f"Merged files saved to: {output_path}")
+            files_to_merge = list(self.files_to_merge)
+            align_schema = self.align_schema_var.get()
+            get_executor(self).submit("Merge Excel Files",
+                                      lambda job: merge_excel_files(files_to_merge, output_path, job.progress_var,
+                                                                    align_schema=align_schema),
+                                      status_var=self.status_var,
+                                      on_done=lambda summary: messagebox.showinfo(
+                                          "Success", f"{describe_merge(summary)}\nMerged files saved to: {output_path}"))
 
     def convert_to_pdf(self):
-        if self.df is None or len(self.df) == 0:
-            messagebox.showwarning("Warning", "No data loaded. Please load an Excel file first.")
+        if not self.has_data():
             return
-        first_sheet_name = list(self.df.keys())[0]
-        sheet_df = self.df[first_sheet_name]
+        workbook = self.workbook
         output_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF files", "*.pdf")])
         if output_path:
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_font("Arial", size=12)
-            for index, row in sheet_df.iterrows():
-                pdf.cell(0, 10, ', '.join(map(str, row.values)), ln=True)
-            pdf.output(output_path)
-            messagebox.showinfo("Success", f"PDF saved to: {output_path}")
+            landscape, fit_width = self.pdf_landscape_var.get(), self.pdf_fit_width_var.get()
+
+            def convert(job):
+                # Sheets are parsed one at a time as the renderer reaches them
+                sheets = ((name, workbook.sheet(name)) for name in workbook.sheet_names)
+                return sheets_to_pdf(sheets, output_path, landscape, fit_width, progress_var=job.progress_var,
+                                     sheet_count=len(workbook.sheet_names))
+
+            get_executor(self).submit("Convert Excel to PDF", convert, status_var=self.status_var,
+                                      on_done=lambda summary: messagebox.showinfo(
+                                          "Success", f"{describe_pdf(summary)}\nPDF saved to: {output_path}"))
 
     def generate_report(self):
-        if self.df is None or len(self.df) == 0:
-            messagebox.showwarning("Warning", "No data loaded. Please load an Excel file first.")
-            return
-        column = self.report_column_var.get()
-        if not column:
-            messagebox.showwarning("Warning", "Please select a column for the report.")
+        if not self.has_data():
             return
-        report_data = self.df[list(self.df.keys())[0]][column].describe()
-        output_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF files", "*.pdf")])
+        workbook = self.workbook
+        columns = [self.report_columns_listbox.get(i) for i in self.report_columns_listbox.curselection()]
+        group_by = [self.report_group_listbox.get(i) for i in self.report_group_listbox.curselection()]
+        sheet_names = workbook.sheet_names if self.report_all_sheets_var.get() else [workbook.first_sheet]
+        output_path = filedialog.asksaveasfilename(defaultextension=".pdf",
+                                                   filetypes=[("PDF files", "*.pdf"), ("Excel files", "*.xlsx"),
+                                                              ("JSON files", "*.json")])
         if output_path:
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_font("Arial", size=12)
-            for line in report_data.to_string().split('\n'):
-                pdf.cell(0, 10, line, ln=True)
-            pdf.output(output_path)
-            messagebox.showinfo("Success", f"Report saved to: {output_path}")
+            def generate(job):
+                # Aggregates are cached, so saving the same report in another format skips straight to writing
+                report = build_report(workbook, sheet_names, columns, group_by, job.progress_var)
+                if not report:
+                    raise ValueError("None of the selected sheets has the selected (or any numeric) columns.")
+                write_report(report, output_path)
+
+            get_executor(self).submit("Generate Report", generate, status_var=self.status_var,
+                                      on_done=lambda _: messagebox.showinfo("Success", f"Report saved to: {output_path}"))
 
     def validate_data(self):
-        if self.df is None or len(self.df) == 0:
-            messagebox.showwarning("Warning", "No data loaded. Please load an Excel file first.")
+        if not self.has_data():
             return
         column = self.validation_column_var.get()
         if not column:
             messagebox.showwarning("Warning", "Please select a column to validate.")
             return
-        missing_values = self.df[list(self.df.keys())[0]][column].isnull().sum()
-        messagebox.showinfo("Validation Results", f"Missing values in column '{column}': {missing_values}")
+        workbook = self.workbook
+        get_executor(self).submit("Validate Data", lambda job: workbook.sheet()[column].isnull().sum(),
+                                  status_var=self.status_var,
+                                  on_done=lambda missing_values: messagebox.showinfo("Validation Results", f"Missing values in column '{column}': {missing_values}"))
 
 if __name__ == "__main__":
     app = ExcelUtilityApp()
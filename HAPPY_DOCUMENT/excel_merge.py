@@ -0,0 +1,306 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from sheet_cache import read_excel_cached
+from workbook import sheet_headers
+from progress import set_progress
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Only needed for Parquet output
+    pa = pq = None
+
+XLSX_MAX_ROWS = 1048576  # Rows per worksheet, including the header row
+CATEGORY_MAX_UNIQUES = 1000  # Text columns with at most this many distinct values (and mostly repeats) become categoricals
+INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+# Worker: the columns of one input's first sheet as pd.read_excel gives them. Workbooks are checked
+# with the read-only reader without parsing them; legacy .xls is parsed through the sheet cache, which
+# the load pass then reads back cheaply.
+def file_columns(file):
+    if os.path.splitext(file)[1].lower() in (".xlsx", ".xlsm"):
+        wb = load_workbook(file, read_only=True, data_only=True)
+        try:
+            return sheet_headers(wb.worksheets[0], sample_rows=None)  # Exact: no column may be left out
+        finally:
+            wb.close()
+    return list(read_excel_cached(file).columns)
+
+
+# Output columns for a merge: every column of every input, in first-seen order
+def merged_columns(column_lists):
+    columns = []
+    seen = set()
+    for names in column_lists:
+        for column in names:
+            if column not in seen:
+                seen.add(column)
+                columns.append(column)
+    return columns
+
+
+# Summary of one column of one input, enough to reconcile its type with the other inputs:
+# kind is int / float / bool / datetime / string / mixed / empty (no values at all)
+def _profile_column(values):
+    non_null = values.dropna()
+    profile = {"dtype": str(values.dtype), "nulls": len(non_null) < len(values), "uniques": None}
+    if non_null.empty:
+        profile["kind"] = "empty"
+    elif pd.api.types.is_bool_dtype(values.dtype):
+        profile["kind"] = "bool"
+    elif pd.api.types.is_integer_dtype(values.dtype) or \
+            (pd.api.types.is_float_dtype(values.dtype) and (non_null % 1 == 0).all()):
+        # Whole numbers read as float only because of blank cells are still integers
+        profile.update(kind="int", min=int(non_null.min()), max=int(non_null.max()))
+    elif pd.api.types.is_float_dtype(values.dtype):
+        profile["kind"] = "float"
+    elif pd.api.types.is_datetime64_any_dtype(values.dtype):
+        profile["kind"] = "datetime"
+    else:
+        inferred = pd.api.types.infer_dtype(non_null, skipna=True)
+        profile["kind"] = {"string": "string", "boolean": "bool"}.get(inferred, "mixed")
+    if profile["kind"] == "string":
+        uniques = non_null.unique()
+        if len(uniques) <= CATEGORY_MAX_UNIQUES:
+            profile["uniques"] = set(uniques)
+    return profile
+
+
+# Worker for the schema scan: parse one workbook (the parse lands in the sheet cache, so the load pass
+# that follows reads it back cheaply) and profile every column
+def scan_file(file):
+    df = read_excel_cached(file)
+    return {"rows": len(df), "columns": {column: _profile_column(df[column]) for column in df.columns}}
+
+
+def _smallest_int_dtype(low, high, nullable):
+    for dtype in INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return pd.api.types.pandas_dtype(dtype.__name__.capitalize()) if nullable else np.dtype(dtype)
+    return pd.Float64Dtype() if nullable else np.dtype(np.float64)  # Beyond int64
+
+
+# Reconcile the per-file profiles of each column into one dtype for the merged output.
+# Integers are downcast to the smallest type holding every file's values (nullable when any file has
+# blanks or lacks the column), int + float becomes float64, low-cardinality text becomes a categorical
+# with the union of all files' values, and columns whose kinds disagree are stored as text.
+def build_schema(scans, columns):
+    total_rows = sum(scan["rows"] for scan in scans)
+    dtypes = {}
+    for column in columns:
+        profiles = [scan["columns"][column] for scan in scans if column in scan["columns"]]
+        kinds = {profile["kind"] for profile in profiles} - {"empty"}
+        nullable = len(profiles) < len(scans) or any(profile["nulls"] or profile["kind"] == "empty" for profile in profiles)
+        if not kinds:
+            dtypes[column] = np.dtype(object)
+        elif kinds == {"int"}:
+            dtypes[column] = _smallest_int_dtype(min(p["min"] for p in profiles if p["kind"] == "int"),
+                                                 max(p["max"] for p in profiles if p["kind"] == "int"), nullable)
+        elif kinds <= {"int", "float"}:
+            dtypes[column] = np.dtype(np.float64)
+        elif kinds == {"bool"}:
+            dtypes[column] = pd.BooleanDtype() if nullable else np.dtype(bool)
+        elif kinds == {"datetime"}:
+            dtypes[column] = np.dtype("datetime64[ns]")
+        elif kinds == {"string"}:
+            uniques = set()
+            for profile in profiles:
+                if profile["kind"] == "string":
+                    if profile["uniques"] is None:
+                        uniques = None
+                        break
+                    uniques |= profile["uniques"]
+            if uniques is not None and len(uniques) <= CATEGORY_MAX_UNIQUES and len(uniques) * 2 <= total_rows:
+                dtypes[column] = pd.CategoricalDtype(sorted(uniques))
+            else:
+                dtypes[column] = np.dtype(object)
+        else:
+            dtypes[column] = pd.StringDtype()
+    return dtypes
+
+
+# Per input: the columns it lacked (filled with blanks), any of its columns missing from the schema
+# (reported as dropped instead of failing) and the columns converted to another type
+def schema_report(file_paths, scans, dtypes):
+    report = {}
+    for file, scan in zip(file_paths, scans):
+        added = [column for column in dtypes if column not in scan["columns"]]
+        dropped = [column for column in scan["columns"] if column not in dtypes]
+        coerced = [(column, profile["dtype"], str(dtypes[column])) for column, profile in scan["columns"].items()
+                   if column in dtypes and profile["kind"] != "empty" and profile["dtype"] != str(dtypes[column])]
+        report[file] = {"added": added, "dropped": dropped, "coerced": coerced}
+    return report
+
+
+# Worker: parse one workbook (through the sheet cache) and lay it out in the merged column order,
+# converted to the reconciled dtypes when a schema was built
+def _read_aligned(file, columns, dtypes=None):
+    df = read_excel_cached(file)
+    known = set(columns)
+    extra = [column for column in df.columns if column not in known]
+    if extra:
+        # Never drop data: a column missing from the merged header would be lost by reindex
+        raise ValueError(f"{os.path.basename(file)} has columns not found when the inputs were scanned: "
+                         f"{', '.join(map(str, extra))}")
+    df = df.reindex(columns=columns)
+    if dtypes:
+        df = df.astype(dtypes)
+    return df
+
+
+# Append-only writers, so the merged output never has to exist in memory as a whole
+class _XlsxWriter:
+    def __init__(self, output_path, columns):
+        self.output_path = output_path
+        self.columns = columns
+        self.workbook = Workbook(write_only=True)  # Rows are streamed to the file, not kept as cells
+        self.sheet_rows = 0
+        self.sheets = 0
+        self._new_sheet()
+
+    def _new_sheet(self):
+        self.sheets += 1
+        title = "Merged" if self.sheets == 1 else f"Merged ({self.sheets})"
+        self.sheet = self.workbook.create_sheet(title)
+        self.sheet.append([str(column) for column in self.columns])
+        self.sheet_rows = 1
+
+    def write(self, df):
+        values = df.astype(object).where(df.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            if self.sheet_rows >= XLSX_MAX_ROWS:
+                self._new_sheet()  # Continue on another sheet instead of producing a file Excel cannot open
+            self.sheet.append(row)
+            self.sheet_rows += 1
+
+    def close(self):
+        self.workbook.save(self.output_path)
+
+
+class _CsvWriter:
+    def __init__(self, output_path, columns):
+        self.file = open(output_path, "w", newline="", encoding="utf-8")
+        pd.DataFrame(columns=columns).to_csv(self.file, index=False)
+
+    def write(self, df):
+        df.to_csv(self.file, header=False, index=False)
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, output_path, columns):
+        if pq is None:
+            raise ValueError("Parquet output needs the pyarrow package")
+        self.output_path = output_path
+        self.writer = None
+        self.schema = None
+
+    def write(self, df):
+        df = df.rename(columns=str)
+        if self.writer is None:
+            self.schema = pa.Schema.from_pandas(df, preserve_index=False)
+            self.writer = pq.ParquetWriter(self.output_path, self.schema)
+        try:
+            table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ValueError(f"Column types differ between the input files ({e}); "
+                             "align the schemas or merge to .xlsx or .csv instead") from e
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def _open_writer(output_path, columns):
+    ext = os.path.splitext(output_path)[1].lower()
+    if ext == ".csv":
+        return _CsvWriter(output_path, columns)
+    if ext == ".parquet":
+        return _ParquetWriter(output_path, columns)
+    return _XlsxWriter(output_path, columns)
+
+
+# Function to merge the first sheet of many workbooks into one .xlsx, .csv or .parquet file (chosen by extension).
+# Inputs are parsed in parallel worker processes while the parent appends them to the output in order.
+# At most 2 x workers parsed files are in memory at once, however many files are merged.
+# With align_schema, every input is scanned first and loaded straight into the reconciled dtypes
+# from build_schema (see schema_report for what changed per file).
+# Returns {"files", "rows", "elapsed", "rows_per_sec", "report"} (report is None without align_schema).
+def stream_merge_excel(file_paths, output_path, progress_var=None, workers=None, align_schema=False):
+    file_paths = list(file_paths)
+    start = time.perf_counter()
+    workers = min(workers or os.cpu_count() or 1, len(file_paths)) if file_paths else 1
+    dtypes = report = None
+    load_start = 0
+    writer = None
+    rows = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            try:
+                # The header pass runs in the pool too, so a merge of many files has no serial pre-pass
+                if align_schema:
+                    scans = []
+                    for done, scan in enumerate(pool.map(scan_file, file_paths)):
+                        scans.append(scan)
+                        set_progress(progress_var, (done + 1) / len(file_paths) * 30)
+                    # The scans saw the parsed frames, so the schema, report and output share their columns
+                    columns = merged_columns(scan["columns"] for scan in scans)
+                    dtypes = build_schema(scans, columns)
+                    report = schema_report(file_paths, scans, dtypes)
+                    load_start = 30
+                else:
+                    columns = merged_columns(pool.map(file_columns, file_paths))
+
+                writer = _open_writer(output_path, columns)
+                pending = deque()
+                next_file = 0
+                for done in range(len(file_paths)):
+                    # Keep a bounded window of files being parsed ahead of the writer
+                    while next_file < len(file_paths) and len(pending) < workers * 2:
+                        pending.append(pool.submit(_read_aligned, file_paths[next_file], columns, dtypes))
+                        next_file += 1
+                    df = pending.popleft().result()
+                    writer.write(df)
+                    rows += len(df)
+                    del df
+                    set_progress(progress_var, load_start + (done + 1) / len(file_paths) * (99 - load_start))
+            except BaseException:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            if os.path.exists(output_path):
+                os.remove(output_path)  # Do not leave a half-merged file behind
+        raise
+    writer.close()
+    set_progress(progress_var, 100)
+
+    elapsed = time.perf_counter() - start
+    return {"files": len(file_paths), "rows": rows, "elapsed": elapsed,
+            "rows_per_sec": rows / elapsed if elapsed else 0.0, "report": report}
+
+
+def describe_merge(summary):
+    lines = [f"Merged {summary['rows']:,} rows from {summary['files']} file(s) in {summary['elapsed']:.1f}s "
+             f"({summary['rows_per_sec']:,.0f} rows/sec)"]
+    for file, changes in (summary.get("report") or {}).items():
+        if changes["added"] or changes.get("dropped") or changes["coerced"]:
+            lines.append(f"{os.path.basename(file)}:")
+        if changes["added"]:
+            lines.append(f"  added columns: {', '.join(map(str, changes['added']))}")
+        if changes.get("dropped"):
+            lines.append(f"  dropped columns: {', '.join(map(str, changes['dropped']))}")
+        for column, source, target in changes["coerced"]:
+            lines.append(f"  {column}: {source} -> {target}")
+    return "\n".join(lines)
@@ -0,0 +1,60 @@
+from docx import Document
+from sheet_cache import read_excel_cached
+from excel_merge import stream_merge_excel
+from table_pdf import sheets_to_pdf
+from word_table import write_dataframe_table
+from workbook import LazyWorkbook
+from pivot_engine import pivot_chunks, write_pivot
+from csv_export import DEFAULT_BUFFER_ROWS, export_sheet
+
+
+# Function to write a DataFrame to PDF as a paginated table (see table_pdf.sheets_to_pdf for the options)
+def dataframe_to_pdf(df, output_path, title="Excel Data", **options):
+    return sheets_to_pdf([(title, df)], output_path, **options)
+
+
+# Function to convert every sheet of a workbook to one PDF, parsing the sheets one at a time
+def excel_to_pdf(file_path, output_path, landscape=False, fit_width=True, progress_var=None):
+    workbook = LazyWorkbook(file_path)
+    sheets = ((name, workbook.sheet(name)) for name in workbook.sheet_names)
+    return sheets_to_pdf(sheets, output_path, landscape, fit_width, progress_var=progress_var,
+                         sheet_count=len(workbook.sheet_names))
+
+
+# Function to merge the first sheet of several workbooks into one (.xlsx, .csv or .parquet by extension).
+# Streams the inputs into the output instead of concatenating them in memory; see excel_merge.
+def merge_excel_files(file_paths, output_path, progress_var=None, workers=None, align_schema=False):
+    return stream_merge_excel(file_paths, output_path, progress_var, workers, align_schema)
+
+
+# Function to convert the first sheet of a workbook to CSV (optionally gzip/zstd compressed); see csv_export
+# for exporting several sheets in parallel
+def excel_to_csv(file_path, output_path, compression="none", buffer_rows=DEFAULT_BUFFER_ROWS):
+    export_sheet(file_path, None, output_path, compression, buffer_rows)  # First sheet, streamed
+
+
+# Function to write a DataFrame as a table in a Word document.
+# The rows are written as bulk XML (see word_table); rows_per_table splits huge tables across sections.
+def dataframe_to_word(df, output_path, rows_per_table=None, progress_var=None):
+    doc = Document()
+    doc.add_heading('Excel Data', level=1)
+    summary = write_dataframe_table(doc, df, rows_per_table, progress_var)
+    doc.save(output_path)
+    if progress_var is not None:
+        progress_var.set(100)
+    return summary
+
+
+# Function to convert the first sheet of a workbook to a Word table
+def excel_to_word(file_path, output_path, rows_per_table=None):
+    return dataframe_to_word(read_excel_cached(file_path), output_path, rows_per_table)
+
+
+# Function to build a pivot table and save it to a workbook (or .csv). Index columns, value columns and
+# aggregations can each be one name or a list; the frame goes through the same engine as streamed files.
+def pivot_to_excel(df, index_cols, values_cols, agg_funcs, output_path):
+    index_cols, values_cols, agg_funcs = ([item] if isinstance(item, str) else list(item)
+                                          for item in (index_cols, values_cols, agg_funcs))
+    columns = list(dict.fromkeys(index_cols + values_cols))
+    pivot, _ = pivot_chunks([(df[columns].copy(), 1.0)], index_cols, values_cols, agg_funcs)
+    write_pivot(pivot, output_path)
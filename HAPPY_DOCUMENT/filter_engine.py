@@ -0,0 +1,183 @@
+import importlib.util
+import numpy as np
+import pandas as pd
+
+# numexpr lets DataFrame.eval compile whole expressions
+QUERY_ENGINE = "numexpr" if importlib.util.find_spec("numexpr") is not None else "python"
+
+# Filter operators, as offered in the GUI
+OPERATORS = ("contains", "equals", "range", "in set", "prefix", "regex")
+
+
+# Per-column index used to answer filters without converting the column to strings every time.
+# Text-like columns are factorized once into integer codes plus their distinct labels, so a predicate
+# is evaluated on the (usually few) distinct labels and mapped back to the rows with one lookup.
+# Numeric and datetime columns additionally keep a sorted copy with its argsort, so ranges and
+# equality are two binary searches.
+class ColumnIndex:
+    def __init__(self, values):
+        self.length = len(values)
+        self.dtype = values.dtype
+        self.values = values
+        self.codes = None
+        self.labels = None
+        self.order = None
+        self.sorted = None
+        if self.is_ordered:
+            array = values.to_numpy()
+            self.order = np.argsort(array, kind="stable")  # NaN/NaT sort to the end
+            self.sorted = array[self.order]
+        else:
+            self._factorize()
+
+    @property
+    def is_ordered(self):
+        return (pd.api.types.is_numeric_dtype(self.dtype) and not pd.api.types.is_bool_dtype(self.dtype)) \
+            or pd.api.types.is_datetime64_any_dtype(self.dtype)
+
+    def _factorize(self):
+        if self.codes is None:
+            self.codes, uniques = pd.factorize(self.values)
+            self.labels = pd.Series(pd.Index(uniques).astype(str))
+
+    # Rows whose label satisfies label_mask (a boolean array over the distinct labels)
+    def _rows_for_labels(self, label_mask):
+        lookup = np.zeros(len(label_mask) + 1, dtype=bool)  # The extra slot is code -1 (missing values)
+        lookup[:-1] = label_mask
+        return lookup[self.codes]
+
+    # Rows whose position in the sorted copy falls in [start, stop)
+    def _rows_for_sorted_slice(self, start, stop):
+        mask = np.zeros(self.length, dtype=bool)
+        mask[self.order[start:stop]] = True
+        return mask
+
+    def _coerce(self, value):
+        if pd.api.types.is_datetime64_any_dtype(self.dtype):
+            return np.datetime64(pd.Timestamp(value))
+        return float(value)
+
+    # The filter the GUI has always applied, astype(str).str.contains(text): a regular expression search
+    # on the text of each value, where missing values are their text too ("nan", "None")
+    def contains(self, text):
+        self._factorize()
+        mask = self._rows_for_labels(self.labels.str.contains(text, na=False).to_numpy())
+        missing = self.codes == -1
+        if missing.any():
+            mask[missing] = self.values[missing].astype(str).str.contains(text, na=False).to_numpy()
+        return mask
+
+    def equals(self, value):
+        if self.is_ordered:
+            return self.range(value, value)
+        self._factorize()
+        return self._rows_for_labels((self.labels == str(value)).to_numpy())
+
+    def range(self, low, high):
+        if self.is_ordered:
+            start = np.searchsorted(self.sorted, self._coerce(low), side="left")
+            stop = np.searchsorted(self.sorted, self._coerce(high), side="right")
+            return self._rows_for_sorted_slice(start, stop)
+        self._factorize()
+        return self._rows_for_labels(((self.labels >= str(low)) & (self.labels <= str(high))).to_numpy())
+
+    def isin(self, values):
+        if self.is_ordered:
+            return np.isin(self.values.to_numpy(), [self._coerce(value) for value in values])
+        self._factorize()
+        return self._rows_for_labels(self.labels.isin([str(value) for value in values]).to_numpy())
+
+    def prefix(self, text):
+        self._factorize()
+        return self._rows_for_labels(self.labels.str.startswith(text).to_numpy())
+
+    def regex(self, pattern):
+        self._factorize()
+        return self._rows_for_labels(self.labels.str.contains(pattern, regex=True, na=False).to_numpy())
+
+
+# Indexes for every column of a DataFrame, built once per load. mask() returns a boolean array over
+# all rows of that frame; callers showing a filtered view select the entries for their rows.
+class FilterIndex:
+    def __init__(self, df):
+        self.df = df
+        self.columns = {}
+
+    def build(self, progress_var=None):
+        for i, column in enumerate(self.df.columns):
+            self.column(column)
+            if progress_var is not None:
+                progress_var.set((i + 1) / len(self.df.columns) * 100)
+        return self
+
+    def column(self, name):
+        if name not in self.columns:
+            self.columns[name] = ColumnIndex(self.df[name])
+        return self.columns[name]
+
+    def mask(self, column, operator, value):
+        index = self.column(column)
+        if operator == "contains":
+            return index.contains(value)
+        if operator == "equals":
+            return index.equals(value)
+        if operator == "range":
+            return index.range(*value)
+        if operator == "in set":
+            return index.isin(value)
+        if operator == "prefix":
+            return index.prefix(value)
+        if operator == "regex":
+            return index.regex(value)
+        raise ValueError(f"Unknown filter operator: {operator}")
+
+    # Several (column, operator, value) conditions combined with AND (match_all) or OR
+    def combined_mask(self, conditions, match_all=True):
+        masks = [self.mask(column, operator, value) for column, operator, value in conditions]
+        return np.logical_and.reduce(masks) if match_all else np.logical_or.reduce(masks)
+
+
+# Categorical columns (e.g. from frame_optimizer) back as their plain values, so queries can order-compare
+# them ("Dept > 'HR'" raises on an unordered categorical). Only columns named in the expression are decoded.
+def _decode_categoricals(df, expression):
+    decoded = {column: df[column].astype(df[column].cat.categories.dtype) for column in df.columns
+               if isinstance(df[column].dtype, pd.CategoricalDtype) and str(column) in expression}
+    if not decoded:
+        return df
+    df = df.copy(deep=False)
+    for column, values in decoded.items():
+        df[column] = values
+    return df
+
+
+# Boolean mask for a query expression over all rows of df, e.g. "Amount > 100 and (Region == 'EU' or Qty < 5)".
+# Column names with spaces are written in backticks. Evaluated in one vectorized pass, with numexpr when installed.
+def query_mask(df, expression):
+    result = _decode_categoricals(df, expression).eval(expression, engine=QUERY_ENGINE)
+    if not isinstance(result, pd.Series) or not pd.api.types.is_bool_dtype(result.dtype):
+        raise ValueError("The query must be a condition that is true or false for each row")
+    return result.to_numpy()
+
+
+# Turn the text typed in the GUI into the operator's value: "low..high" for range, "a, b, c" for in set
+def parse_filter_value(operator, text):
+    if operator == "range":
+        low, separator, high = text.partition("..")
+        if not separator:
+            raise ValueError("Enter a range as low..high")
+        return low.strip(), high.strip()
+    if operator == "in set":
+        return [item.strip() for item in text.split(",") if item.strip()]
+    return text
+
+
+def describe_conditions(conditions, match_all=True):
+    return f" {'and' if match_all else 'or'} ".join(describe_filter(*condition) for condition in conditions)
+
+
+def describe_filter(column, operator, value):
+    if operator == "range":
+        return f"{column} in {value[0]}..{value[1]}"
+    if operator == "in set":
+        return f"{column} in {{{', '.join(value)}}}"
+    return f"{column} {operator} {value!r}"
@@ -0,0 +1,108 @@
+import re
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from sheet_cache import HAVE_ARROW
+from workbook import format_bytes
+from progress import set_progress
+
+MAX_CATEGORY_RATIO = 0.5  # Text columns with at most this share of distinct values become categoricals
+DATE_SAMPLE = 1000  # Values checked before a whole text column is parsed as dates
+_DATE_TEXT = re.compile(r"^\s*\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}")  # 2024-01-31, 31/01/2024, 1.2.24 ...
+
+if HAVE_ARROW:
+    try:
+        ARROW_STRING = pd.StringDtype("pyarrow", na_value=np.nan)  # Arrow storage, NaN for missing values as before
+    except TypeError:
+        ARROW_STRING = pd.StringDtype("pyarrow")  # pandas < 2.3: missing values become pd.NA
+else:
+    ARROW_STRING = None
+
+
+# Smallest integer type holding every value; whole-number float columns without gaps become integers,
+# other floats become float32 only when every value survives the round trip exactly
+def _downcast_numeric(values):
+    if pd.api.types.is_integer_dtype(values.dtype):
+        return pd.to_numeric(values, downcast="integer")
+    if values.hasnans:
+        narrow = values.astype(np.float32)
+    else:
+        narrow = pd.to_numeric(values, downcast="integer")
+        if pd.api.types.is_integer_dtype(narrow.dtype):
+            return narrow
+        narrow = values.astype(np.float32)
+    with np.errstate(over="ignore", invalid="ignore"):
+        exact = (narrow.astype(np.float64) == values) | values.isna()
+    return narrow if exact.all() else values
+
+
+# Text that looks like dates, parsed once here instead of by every filter, sort and chart.
+# None when the column is not entirely dates.
+def _parse_dates(values):
+    sample = values.dropna().head(DATE_SAMPLE)
+    if sample.empty or not sample.astype(str).str.match(_DATE_TEXT).all():
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # Format inference warnings; unparsed values are caught below
+        parsed = pd.to_datetime(values, errors="coerce")
+    return parsed if parsed.notna().sum() == values.notna().sum() else None
+
+
+def _text_kind(values):
+    if values.dtype == object or isinstance(values.dtype, pd.StringDtype):
+        return pd.api.types.infer_dtype(values, skipna=True)
+    return None
+
+
+def optimize_column(values, category_ratio=MAX_CATEGORY_RATIO, parse_dates=True, arrow_strings=False):
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iuf":
+        return _downcast_numeric(values)
+
+    kind = _text_kind(values)
+    if kind in ("datetime", "datetime64", "date"):
+        converted = pd.to_datetime(values, errors="coerce")
+        return converted if converted.notna().sum() == values.notna().sum() else values
+    if kind in ("integer", "floating", "mixed-integer-float"):
+        return _downcast_numeric(pd.to_numeric(values))
+    if kind != "string":
+        return values  # Mixed types and everything else stay as they are
+
+    if parse_dates:
+        parsed = _parse_dates(values)
+        if parsed is not None:
+            return parsed
+    present = values.count()
+    if present and values.nunique() <= present * category_ratio:
+        return values.astype("category")
+    if arrow_strings and ARROW_STRING is not None and dtype == object:
+        return values.astype(ARROW_STRING)
+    return values
+
+
+# Shrink a freshly loaded frame: numbers downcast to the smallest exact type, low-cardinality text to
+# categoricals, date text parsed into datetime64, and (arrow_strings, needs pyarrow) remaining text into
+# Arrow-backed strings. A conversion is only kept when it makes the column smaller. Values are unchanged.
+# Returns (DataFrame, {"before", "after", "changed": {column: (old dtype, new dtype)}, "elapsed"}).
+def optimize_frame(df, category_ratio=MAX_CATEGORY_RATIO, parse_dates=True, arrow_strings=False, progress_var=None):
+    start = time.perf_counter()
+    before = df.memory_usage(deep=True)
+    result = df
+    changed = {}
+    for i, column in enumerate(df.columns):
+        values = df.iloc[:, i]
+        converted = optimize_column(values, category_ratio, parse_dates, arrow_strings)
+        if converted.dtype != values.dtype and converted.memory_usage(deep=True, index=False) < before.iloc[i + 1]:
+            if result is df:
+                result = df.copy(deep=False)  # The loaded frame itself is left untouched
+            result.isetitem(i, converted)
+            changed[column] = (values.dtype, converted.dtype)
+        set_progress(progress_var, (i + 1) / max(len(df.columns), 1) * 100)
+    return result, {"before": int(before.sum()), "after": int(result.memory_usage(deep=True).sum()),
+                    "changed": changed, "elapsed": time.perf_counter() - start}
+
+
+def describe_optimization(summary):
+    return (f"memory {format_bytes(summary['before'])} -> {format_bytes(summary['after'])} "
+            f"({len(summary['changed'])} column(s) converted)")
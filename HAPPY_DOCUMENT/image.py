@@ -1,16 +1,30 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox, simpledialog
+from tkinter import filedialog, messagebox, simpledialog, scrolledtext
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from PIL import Image, ImageTk
+from PIL import ImageTk
 import os
+from ocr import ocr_image_file
+from ocr_cache import get_default_cache
+from jobs import get_executor
+import image_ops  # Headless image operations
+import thumbnails
+from tiles import TilePyramid, allow_large_images
+import math
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+GRID_POLL_MS = 50
+MAX_LOADED_THUMBNAILS = 600  # Decoded thumbnails kept in memory; PhotoImages only exist for visible cells
 
 class ImageCropper:
     def __init__(self, master, image_path):
         self.master = master
         self.image_path = image_path
-        self.image = Image.open(image_path)
-        self.tk_image = ImageTk.PhotoImage(self.image)
+        self.pyramid = None
+        self.level = 0
+        self.tiles = {}  # (column, row) -> (canvas item id, PhotoImage) for the current level
         
         # Create main frame
         self.main_frame = ttk.Frame(master)
@@ -21,11 +35,11 @@ class ImageCropper:
         self.canvas_frame.pack(fill='both', expand=True)
 
         self.canvas = tk.Canvas(self.canvas_frame, width=800, height=600)
-        self.canvas.create_image(0, 0, image=self.tk_image, anchor='nw')
+        self.loading_text = self.canvas.create_text(400, 300, text="Loading image...", fill='gray')
 
         # Add scrollbars
-        self.scroll_x = ttk.Scrollbar(self.canvas_frame, orient='horizontal', command=self.canvas.xview)
-        self.scroll_y = ttk.Scrollbar(self.canvas_frame, orient='vertical', command=self.canvas.yview)
+        self.scroll_x = ttk.Scrollbar(self.canvas_frame, orient='horizontal', command=self.on_scroll_x)
+        self.scroll_y = ttk.Scrollbar(self.canvas_frame, orient='vertical', command=self.on_scroll_y)
         self.canvas.config(xscrollcommand=self.scroll_x.set, yscrollcommand=self.scroll_y.set)
 
         # Pack canvas and scrollbars
@@ -44,12 +58,19 @@ class ImageCropper:
         self.clear_button = ttk.Button(self.button_frame, text="Clear Selection", command=self.clear_selection)
         self.clear_button.pack(side='left', padx=5)
 
-        # Set scroll region for the entire image
-        self.canvas.config(scrollregion=self.canvas.bbox('all'))
+        self.zoom_in_button = ttk.Button(self.button_frame, text="Zoom In", command=lambda: self.set_level(self.level - 1))
+        self.zoom_in_button.pack(side='left', padx=5)
+
+        self.zoom_out_button = ttk.Button(self.button_frame, text="Zoom Out", command=lambda: self.set_level(self.level + 1))
+        self.zoom_out_button.pack(side='left', padx=5)
+
+        self.zoom_label = ttk.Label(self.button_frame, text="")
+        self.zoom_label.pack(side='left', padx=10)
 
         self.rect = None
         self.start_x = None
         self.start_y = None
+        self.selection = None  # (left, top, right, bottom) in full-resolution pixels
 
         # Bind mouse events for cropping
         self.canvas.bind("<ButtonPress-1>", self.on_button_press)
@@ -59,41 +80,135 @@ class ImageCropper:
         # Bind mouse wheel events for scrolling
         self.canvas.bind("<MouseWheel>", self.on_mousewheel_y)  # Windows
         self.canvas.bind("<Shift-MouseWheel>", self.on_mousewheel_x)  # Windows with Shift
+        self.canvas.bind("<Control-MouseWheel>", self.on_mousewheel_zoom)  # Windows with Ctrl
         self.canvas.bind("<Button-4>", self.on_mousewheel_up)  # Linux
         self.canvas.bind("<Button-5>", self.on_mousewheel_down)  # Linux
         self.canvas.bind("<Shift-Button-4>", self.on_mousewheel_left)  # Linux with Shift
         self.canvas.bind("<Shift-Button-5>", self.on_mousewheel_right)  # Linux with Shift
+        self.canvas.bind("<Control-Button-4>", lambda event: self.set_level(self.level - 1))  # Linux with Ctrl
+        self.canvas.bind("<Control-Button-5>", lambda event: self.set_level(self.level + 1))  # Linux with Ctrl
+        self.canvas.bind("<Configure>", lambda event: self.render_tiles())
+
+        # Decoding and building the zoom pyramid can take a while for very large scans
+        get_executor(master).submit("Load Image", lambda job: TilePyramid(image_path).build(job.progress_var),
+                                    on_done=self.on_pyramid_ready)
+
+    def on_pyramid_ready(self, pyramid):
+        self.pyramid = pyramid
+        self.canvas.delete(self.loading_text)
+        self.set_level(pyramid.fit_level(max(self.canvas.winfo_width(), 800), max(self.canvas.winfo_height(), 600)))
+
+    # Switch zoom level, keeping the point at the centre of the view in place
+    def set_level(self, level):
+        if self.pyramid is None:
+            return
+        level = min(max(level, 0), len(self.pyramid.levels) - 1)
+        center = None
+        if self.tiles:
+            center = self.pyramid.to_full(self.level, self.canvas.canvasx(self.canvas.winfo_width() / 2),
+                                          self.canvas.canvasy(self.canvas.winfo_height() / 2))
+        for item_id, _ in self.tiles.values():
+            self.canvas.delete(item_id)
+        self.tiles.clear()
+        self.level = level
+
+        width, height = self.pyramid.level_size(level)
+        self.canvas.config(scrollregion=(0, 0, width, height))
+        if center:
+            x, y = self.pyramid.from_full(level, *center)
+            self.canvas.xview_moveto(max(0, x - self.canvas.winfo_width() / 2) / width)
+            self.canvas.yview_moveto(max(0, y - self.canvas.winfo_height() / 2) / height)
+        full_width = self.pyramid.size[0]
+        self.zoom_label.config(text=f"{width / full_width:.1%} of {full_width}x{self.pyramid.size[1]}")
+        self.render_tiles()
+        self.draw_selection()
+
+    # Create Tk images for the tiles in view and drop the ones that scrolled out of it
+    def render_tiles(self):
+        if self.pyramid is None:
+            return
+        tile_size = self.pyramid.tile_size
+        columns, rows = self.pyramid.tile_grid(self.level)
+        left = int(self.canvas.canvasx(0)) // tile_size
+        top = int(self.canvas.canvasy(0)) // tile_size
+        right = int(self.canvas.canvasx(self.canvas.winfo_width())) // tile_size
+        bottom = int(self.canvas.canvasy(self.canvas.winfo_height())) // tile_size
+        visible = {(column, row) for column in range(max(0, left), min(columns, right + 1))
+                   for row in range(max(0, top), min(rows, bottom + 1))}
+
+        for key in list(self.tiles):
+            if key not in visible:
+                self.canvas.delete(self.tiles.pop(key)[0])
+        for column, row in visible:
+            if (column, row) not in self.tiles:
+                photo = ImageTk.PhotoImage(self.pyramid.tile(self.level, column, row))
+                item_id = self.canvas.create_image(column * tile_size, row * tile_size, image=photo, anchor='nw')
+                self.tiles[(column, row)] = (item_id, photo)
+        if self.rect:
+            self.canvas.tag_raise(self.rect)
+
+    def on_scroll_x(self, *args):
+        self.canvas.xview(*args)
+        self.render_tiles()
+
+    def on_scroll_y(self, *args):
+        self.canvas.yview(*args)
+        self.render_tiles()
 
     def on_mousewheel_y(self, event):
         # Windows mouse wheel scrolling (vertical)
         self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        self.render_tiles()
 
     def on_mousewheel_x(self, event):
         # Windows mouse wheel scrolling with Shift (horizontal)
         self.canvas.xview_scroll(int(-1 * (event.delta / 120)), "units")
+        self.render_tiles()
+
+    def on_mousewheel_zoom(self, event):
+        # Windows mouse wheel with Ctrl (zoom)
+        self.set_level(self.level - 1 if event.delta > 0 else self.level + 1)
 
     def on_mousewheel_up(self, event):
         # Linux mouse wheel up (vertical)
         self.canvas.yview_scroll(-1, "units")
+        self.render_tiles()
 
     def on_mousewheel_down(self, event):
         # Linux mouse wheel down (vertical)
         self.canvas.yview_scroll(1, "units")
+        self.render_tiles()
 
     def on_mousewheel_left(self, event):
         # Linux mouse wheel with Shift (horizontal left)
         self.canvas.xview_scroll(-1, "units")
+        self.render_tiles()
 
     def on_mousewheel_right(self, event):
         # Linux mouse wheel with Shift (horizontal right)
         self.canvas.xview_scroll(1, "units")
+        self.render_tiles()
 
     def clear_selection(self):
         if self.rect:
             self.canvas.delete(self.rect)
             self.rect = None
+        self.selection = None
+
+    # Redraw the selection rectangle at the current zoom level
+    def draw_selection(self):
+        if self.rect:
+            self.canvas.delete(self.rect)
+            self.rect = None
+        if self.selection:
+            left, top = self.pyramid.from_full(self.level, self.selection[0], self.selection[1])
+            right, bottom = self.pyramid.from_full(self.level, self.selection[2], self.selection[3])
+            self.rect = self.canvas.create_rectangle(left, top, right, bottom, outline='red', width=2)
 
     def on_button_press(self, event):
+        if self.pyramid is None:
+            return
+
         # Remove any existing rectangle
         if self.rect:
             self.canvas.delete(self.rect)
@@ -109,32 +224,29 @@ class ImageCropper:
         )
 
     def on_mouse_drag(self, event):
+        if not self.rect:
+            return
         # Update the rectangle's size as the mouse is dragged
         curr_x = self.canvas.canvasx(event.x)
         curr_y = self.canvas.canvasy(event.y)
         self.canvas.coords(self.rect, self.start_x, self.start_y, curr_x, curr_y)
 
     def on_button_release(self, event):
-        # The cropping area is finalized when the mouse is released
-        pass
+        # The cropping area is finalized when the mouse is released; keep it in full-resolution pixels
+        if not self.rect:
+            return
+        coords = self.canvas.coords(self.rect)
+        left, top = self.pyramid.to_full(self.level, min(coords[0], coords[2]), min(coords[1], coords[3]))
+        right, bottom = self.pyramid.to_full(self.level, max(coords[0], coords[2]), max(coords[1], coords[3]))
+        self.selection = (left, top, right, bottom)
 
     def crop_image(self):
-        if not self.rect:
+        if not self.selection:
             messagebox.showerror("Error", "Please select a cropping area first.")
             return
 
-        # Get the coordinates of the rectangle
-        coords = self.canvas.coords(self.rect)
-        # Ensure coordinates are in the correct order (left, top, right, bottom)
-        left = min(coords[0], coords[2])
-        top = min(coords[1], coords[3])
-        right = max(coords[0], coords[2])
-        bottom = max(coords[1], coords[3])
-        
-        crop_box = (int(left), int(top), int(right), int(bottom))
-
-        # Crop the image
-        cropped_image = self.image.crop(crop_box)
+        # Crop the full-resolution image, whatever zoom level the selection was made at
+        cropped_image = self.pyramid.crop(self.selection)
         
         # Save the cropped image
         save_path = filedialog.asksaveasfilename(
@@ -142,9 +254,154 @@ class ImageCropper:
             filetypes=[("PNG Files", "*.png"), ("JPEG Files", "*.jpg;*.jpeg")]
         )
         if save_path:
-            cropped_image.save(save_path)
+            image_ops.save_image(cropped_image, save_path)
             messagebox.showinfo("Success", "Image cropped and saved successfully.")
 
+# Virtualized preview grid: only cells in (or next to) the viewport get a PhotoImage.
+# Thumbnails come from the persistent thumbnail cache and are generated on worker threads.
+class ThumbnailGrid:
+    def __init__(self, master, files, cache=None, workers=4):
+        self.master = master
+        self.files = list(files)
+        self.cache = cache or thumbnails.get_default_cache()
+        thumb_width, thumb_height = self.cache.thumb_size
+        self.cell_width = thumb_width + 20
+        self.cell_height = thumb_height + 40
+        self.columns = 0
+
+        self.canvas = tk.Canvas(master, width=900, height=600, highlightthickness=0)
+        self.scroll_y = ttk.Scrollbar(master, orient='vertical', command=self.on_scroll)
+        self.canvas.config(yscrollcommand=self.scroll_y.set)
+        self.scroll_y.pack(side='right', fill='y')
+        self.canvas.pack(side='left', fill='both', expand=True)
+
+        self.cells = {}  # index -> (canvas item ids, PhotoImage or None while loading)
+        self.loaded = OrderedDict()  # index -> PIL thumbnail, least recently shown first
+        self.pending = set()
+        self.failed = set()
+        self.visible = set()
+        self.results = queue.Queue()
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnail")
+        self.closed = False
+
+        self.canvas.bind("<Configure>", self.layout)
+        self.canvas.bind("<MouseWheel>", lambda event: self.scroll_units(int(-1 * (event.delta / 120))))  # Windows
+        self.canvas.bind("<Button-4>", lambda event: self.scroll_units(-1))  # Linux
+        self.canvas.bind("<Button-5>", lambda event: self.scroll_units(1))  # Linux
+        self.canvas.bind("<Destroy>", self.on_destroy)
+        self.master.after(GRID_POLL_MS, self.poll)
+
+    def on_scroll(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def scroll_units(self, units):
+        self.canvas.yview_scroll(units, "units")
+        self.refresh()
+
+    def layout(self, event=None):
+        columns = max(1, self.canvas.winfo_width() // self.cell_width)
+        if columns != self.columns:
+            # Cell positions change with the column count, so redraw from scratch
+            self.columns = columns
+            self.canvas.delete("all")
+            self.cells.clear()
+            rows = math.ceil(len(self.files) / columns)
+            self.canvas.config(scrollregion=(0, 0, columns * self.cell_width, rows * self.cell_height),
+                               yscrollincrement=self.cell_height // 4)
+        self.refresh()
+
+    def refresh(self):
+        if not self.columns:
+            return
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(0, int(top // self.cell_height) - 1)
+        last_row = int(bottom // self.cell_height) + 1
+        self.visible = set(range(first_row * self.columns, min(len(self.files), (last_row + 1) * self.columns)))
+
+        for index in list(self.cells):
+            if index not in self.visible:
+                self.remove_cell(index)
+        for index in sorted(self.visible):
+            if index in self.cells:
+                continue
+            if index in self.loaded:
+                self.draw_cell(index, self.loaded[index])
+            else:
+                self.draw_cell(index, None)
+                if index not in self.failed:
+                    self.request(index)
+
+    def cell_origin(self, index):
+        row, column = divmod(index, self.columns)
+        return column * self.cell_width + 10, row * self.cell_height + 10
+
+    def draw_cell(self, index, thumbnail):
+        self.remove_cell(index)
+        x, y = self.cell_origin(index)
+        name = os.path.basename(self.files[index])
+        thumb_width, thumb_height = self.cache.thumb_size
+        if thumbnail is None:
+            photo = None
+            item_ids = [self.canvas.create_rectangle(x, y, x + thumb_width, y + thumb_height, outline='gray'),
+                        self.canvas.create_text(x + thumb_width // 2, y + thumb_height // 2, text="No preview" if index in self.failed else "Loading...", fill='gray')]
+        else:
+            self.loaded.move_to_end(index)
+            photo = ImageTk.PhotoImage(thumbnail)
+            item_ids = [self.canvas.create_image(x + thumb_width // 2, y + thumb_height // 2, image=photo, anchor='center')]
+        item_ids.append(self.canvas.create_text(x + thumb_width // 2, y + thumb_height + 15, text=name[:24], fill='white'))
+        self.cells[index] = (item_ids, photo)
+
+    def remove_cell(self, index):
+        cell = self.cells.pop(index, None)
+        if cell:
+            for item_id in cell[0]:
+                self.canvas.delete(item_id)
+
+    def request(self, index):
+        if index not in self.pending:
+            self.pending.add(index)
+            self.pool.submit(self.load, index)
+
+    # Runs on a worker thread
+    def load(self, index):
+        if self.closed or index not in self.visible:
+            self.results.put((index, None))  # Scrolled away before we got to it
+            return
+        try:
+            self.results.put((index, self.cache.get(self.files[index])))
+        except Exception:
+            self.results.put((index, False))  # Not a readable image
+
+    def poll(self):
+        if self.closed:
+            return
+        while True:
+            try:
+                index, thumbnail = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending.discard(index)
+            if thumbnail is False:
+                self.failed.add(index)
+                if index in self.visible:
+                    self.draw_cell(index, None)
+                continue
+            if thumbnail is None:
+                continue
+            self.loaded[index] = thumbnail
+            while len(self.loaded) > MAX_LOADED_THUMBNAILS:
+                self.loaded.popitem(last=False)
+            if index in self.visible:
+                self.draw_cell(index, thumbnail)
+        self.master.after(GRID_POLL_MS, self.poll)
+
+    def on_destroy(self, event):
+        if event.widget is self.canvas:
+            self.closed = True
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
 class ImageUtilityGUI:
     def __init__(self, master):
         self.master = master
@@ -242,24 +499,30 @@ class ImageUtilityGUI:
         if not output_format:
             return
         
-        for file in self.selected_files:
-            image = Image.open(file)
-            output_file = os.path.splitext(file)[0] + f".{output_format}"
-            image.save(output_file)
+        def convert(file):
+            image_ops.convert_image(file, image_ops.derive_output_path(file, ext=output_format))
         
-        messagebox.showinfo("Success", f"Converted {len(self.selected_files)} image(s) to {output_format}.")
+        self.run_for_each("Convert Images", convert, f"Converted {len(self.selected_files)} image(s) to {output_format}.")
 
     def extract_text(self):
         if not self.selected_files:
             messagebox.showerror("Error", "Please select an image file to extract text from.")
             return
         
-        text = ""
-        for file in self.selected_files:
-            image = Image.open(file)
-            text += pytesseract.image_to_string(image) + "\n"
-        
-        self.show_text_window(text)
+        selected_files = list(self.selected_files)
+
+        def extract(job):
+            texts = []
+            for index, file in enumerate(selected_files):
+                texts.append(ocr_image_file(file) + "\n")
+                job.progress_var.set((index + 1) / len(selected_files) * 100)
+            return "".join(texts)
+
+        def show(text):
+            self.show_text_window(text)
+            self.status_var.set(get_default_cache().summary())
+
+        get_executor(self.master).submit("Extract Text", extract, status_var=self.status_var, on_done=show)
 
     def resize_image(self):
         if not self.selected_files:
@@ -271,13 +534,10 @@ class ImageUtilityGUI:
         if width is None or height is None:
             return
         
-        for file in self.selected_files:
-            image = Image.open(file)
-            resized_image = image.resize((width, height))
-            output_file = os.path.splitext(file)[0] + "_resized.jpg"
-            resized_image.save(output_file)
+        def resize(file):
+            image_ops.resize_image(file, image_ops.derive_output_path(file, "_resized", ".jpg"), width, height)
         
-        messagebox.showinfo("Success", f"Resized {len(self.selected_files)} image(s).")
+        self.run_for_each("Resize Images", resize, f"Resized {len(self.selected_files)} image(s).")
 
     def rotate_image(self):
         if not self.selected_files:
@@ -288,13 +548,10 @@ class ImageUtilityGUI:
         if angle is None:
             return
         
-        for file in self.selected_files:
-            image = Image.open(file)
-            rotated_image = image.rotate(angle)
-            output_file = os.path.splitext(file)[0] + "_rotated.jpg"
-            rotated_image.save(output_file)
+        def rotate(file):
+            image_ops.rotate_image(file, image_ops.derive_output_path(file, "_rotated", ".jpg"), angle)
         
-        messagebox.showinfo("Success", f"Rotated {len(self.selected_files)} image(s) by {angle} degrees.")
+        self.run_for_each("Rotate Images", rotate, f"Rotated {len(self.selected_files)} image(s) by {angle} degrees.")
 
     def compress_image(self):
         if not self.selected_files:
@@ -305,25 +562,93 @@ class ImageUtilityGUI:
         if quality is None:
             return
         
-        for file in self.selected_files:
-            image = Image.open(file)
-            output_file = os.path.splitext(file)[0] + "_compressed.jpg"
-            image.save(output_file, quality=quality)
+        def compress(file):
+            image_ops.compress_image(file, image_ops.derive_output_path(file, "_compressed", ".jpg"), quality)
         
-        messagebox.showinfo("Success", f"Compressed {len(self.selected_files)} image(s).")
+        self.run_for_each("Compress Images", compress, f"Compressed {len(self.selected_files)} image(s).")
+
+    # Apply fn to every selected file in a background job, then report success_message
+    def run_for_each(self, name, fn, success_message):
+        selected_files = list(self.selected_files)
+
+        def run(job):
+            for index, file in enumerate(selected_files):
+                fn(file)
+                job.progress_var.set((index + 1) / len(selected_files) * 100)
+
+        get_executor(self.master).submit(name, run, status_var=self.status_var,
+                                         on_done=lambda _: messagebox.showinfo("Success", success_message))
 
     def batch_process(self):
-        messagebox.showinfo("Info", "Batch processing is not yet implemented.")
+        if not self.selected_files:
+            messagebox.showerror("Error", "Please select image files to process.")
+            return
+
+        batch_window = tk.Toplevel(self.master)
+        batch_window.title("Batch Processing")
+
+        ttk.Label(batch_window, text="Steps are applied in this order, with one decode and one save per image.").grid(row=0, column=0, columnspan=4, padx=10, pady=10)
+
+        resize_var = tk.BooleanVar()
+        width_var = tk.IntVar(value=800)
+        height_var = tk.IntVar(value=600)
+        ttk.Checkbutton(batch_window, text="Resize", variable=resize_var).grid(row=1, column=0, sticky=W, padx=10, pady=5)
+        ttk.Entry(batch_window, textvariable=width_var, width=8).grid(row=1, column=1, padx=5)
+        ttk.Entry(batch_window, textvariable=height_var, width=8).grid(row=1, column=2, padx=5)
+
+        rotate_var = tk.BooleanVar()
+        angle_var = tk.IntVar(value=90)
+        ttk.Checkbutton(batch_window, text="Rotate", variable=rotate_var).grid(row=2, column=0, sticky=W, padx=10, pady=5)
+        ttk.Entry(batch_window, textvariable=angle_var, width=8).grid(row=2, column=1, padx=5)
+
+        compress_var = tk.BooleanVar()
+        quality_var = tk.IntVar(value=75)
+        ttk.Checkbutton(batch_window, text="Compress", variable=compress_var).grid(row=3, column=0, sticky=W, padx=10, pady=5)
+        ttk.Entry(batch_window, textvariable=quality_var, width=8).grid(row=3, column=1, padx=5)
+
+        convert_var = tk.BooleanVar()
+        format_var = tk.StringVar(value="png")
+        ttk.Checkbutton(batch_window, text="Convert", variable=convert_var).grid(row=4, column=0, sticky=W, padx=10, pady=5)
+        ttk.Combobox(batch_window, textvariable=format_var, values=["jpg", "png", "bmp", "webp"], width=6).grid(row=4, column=1, padx=5)
+
+        def run():
+            try:
+                steps = []
+                if resize_var.get():
+                    steps.append(("resize", {"width": width_var.get(), "height": height_var.get()}))
+                if rotate_var.get():
+                    steps.append(("rotate", {"angle": angle_var.get()}))
+                if compress_var.get():
+                    steps.append(("compress", {"quality": min(max(quality_var.get(), 1), 100)}))
+                if convert_var.get():
+                    steps.append(("convert", {"format": format_var.get()}))
+            except tk.TclError:
+                messagebox.showerror("Error", "Please enter whole numbers for sizes, angle and quality.", parent=batch_window)
+                return
+            if not steps:
+                messagebox.showerror("Error", "Please select at least one operation.", parent=batch_window)
+                return
+
+            output_dir = filedialog.askdirectory(title="Select output folder", parent=batch_window)
+            if not output_dir:
+                return
+            selected_files = list(self.selected_files)
+            batch_window.destroy()
+            get_executor(self.master).submit(
+                "Batch Processing", lambda job: image_ops.batch_process(selected_files, steps, output_dir, progress_var=job.progress_var),
+                status_var=self.status_var,
+                on_done=lambda summary: messagebox.showinfo("Batch Processing", image_ops.describe_batch(summary)))
+
+        ttk.Button(batch_window, text="Run", command=run, style="success.TButton").grid(row=5, column=0, columnspan=4, pady=15)
 
     def preview_images(self):
+        if not self.selected_files:
+            messagebox.showerror("Error", "Please select image files to preview.")
+            return
         preview_window = tk.Toplevel(self.master)
-        preview_window.title("Preview Images")
-        for file in self.selected_files:
-            image = Image.open(file)
-            tk_image = ImageTk.PhotoImage(image)
-            label = tk.Label(preview_window, image=tk_image)
-            label.image = tk_image  # Keep a reference to avoid garbage collection
-            label.pack(pady=10)
+        preview_window.title(f"Preview Images ({len(self.selected_files)})")
+        preview_window.geometry("900x600")
+        ThumbnailGrid(preview_window, self.selected_files)
 
     def show_text_window(self, text):
         text_window = tk.Toplevel(self.master)
@@ -334,6 +659,7 @@ class ImageUtilityGUI:
         text_area.config(state=tk.DISABLED)
 
 if __name__ == "__main__":
+    allow_large_images()  # Before any image is opened, so gigapixel scans can be viewed
     root = tk.Tk()
     app = ImageUtilityGUI(root)
     root.mainloop()
@@ -0,0 +1,179 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image
+
+JPEG_EXTENSIONS = (".jpg", ".jpeg")
+REDUCING_GAP = 3.0  # Cheap integer shrinking (decoder scaling / reduce()) stops at 3x the target size
+
+
+# Build the output path for an image operation, e.g. photo.png -> photo_resized.jpg.
+# Without output_dir the result goes next to the source file, as the GUI has always done.
+def derive_output_path(file, suffix="", ext=None, output_dir=None):
+    base, source_ext = os.path.splitext(file)
+    if output_dir:
+        base = os.path.join(output_dir, os.path.basename(base))
+    ext = ext or source_ext
+    if not ext.startswith("."):
+        ext = "." + ext
+    return f"{base}{suffix}{ext}"
+
+
+# Save an image, dropping alpha/palette data when the target format is JPEG
+def save_image(image, output_file, **options):
+    if output_file.lower().endswith(JPEG_EXTENSIONS) and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    image.save(output_file, **options)
+
+
+# Ask the JPEG decoder to decode at 1/2, 1/4 or 1/8 scale when the target is much smaller than the source.
+# Must be called before the pixels are loaded; returns True when a reduced decode was set up.
+def draft_for_size(image, size, reducing_gap=REDUCING_GAP):
+    if image.format != "JPEG":
+        return False
+    original_size = image.size
+    image.draft(image.mode, (int(size[0] * reducing_gap), int(size[1] * reducing_gap)))
+    return image.size != original_size
+
+
+# Resize with a reduce() pre-pass for large downscales, then a proper resample for the remaining factor
+def fast_resize(image, size, reducing_gap=REDUCING_GAP):
+    return image.resize(size, Image.BICUBIC, reducing_gap=reducing_gap)
+
+
+# Load an image scaled to fit within max_size, decoding as few pixels as possible (used for previews)
+def load_thumbnail(file, max_size, reducing_gap=REDUCING_GAP):
+    with Image.open(file) as image:
+        draft_for_size(image, max_size, reducing_gap)
+        image.thumbnail(max_size, Image.BICUBIC, reducing_gap=reducing_gap)
+        return image.copy()
+
+
+# Function to convert an image to the format given by the output file's extension
+def convert_image(file, output_file):
+    with Image.open(file) as image:
+        save_image(image, output_file)
+
+
+# Function to resize an image to exact dimensions
+def resize_image(file, output_file, width, height):
+    with Image.open(file) as image:
+        draft_for_size(image, (width, height))
+        save_image(fast_resize(image, (width, height)), output_file)
+
+
+# Function to rotate an image by the given angle (degrees, counter-clockwise)
+def rotate_image(file, output_file, angle):
+    with Image.open(file) as image:
+        save_image(image.rotate(angle), output_file)
+
+
+# Function to re-encode an image with the given JPEG quality (1-100)
+def compress_image(file, output_file, quality):
+    with Image.open(file) as image:
+        save_image(image, output_file, quality=quality)
+
+
+# Batch pipeline: each image is decoded once, every step is applied in memory and the result is encoded once.
+# Steps are (operation, params) tuples applied in order, e.g.
+#   [("resize", {"width": 800, "height": 600}), ("rotate", {"angle": 90}),
+#    ("compress", {"quality": 70}), ("convert", {"format": "webp"})]
+# "compress" and "convert" only change how the final image is encoded.
+BATCH_OPERATIONS = ("resize", "rotate", "compress", "convert")
+
+
+def batch_output_path(file, steps, output_dir=None):
+    ext = None
+    for operation, params in steps:
+        if operation == "convert":
+            ext = params["format"]
+        elif operation == "compress" and ext is None:
+            ext = ".jpg"  # Quality only applies to lossy formats, same as compress_image
+    return derive_output_path(file, "_processed", ext, output_dir)
+
+
+# Run the whole pipeline for one image. Returns {stage: seconds} for decode, each step and encode.
+def process_image(file, steps, output_file):
+    timings = {}
+    start = time.perf_counter()
+    with Image.open(file) as source:
+        if steps and steps[0][0] == "resize":
+            # The first step shrinks the image anyway, so let the decoder skip the detail
+            draft_for_size(source, (steps[0][1]["width"], steps[0][1]["height"]))
+        source.load()
+        image = source
+        timings["decode"] = time.perf_counter() - start
+
+        save_options = {}
+        for operation, params in steps:
+            start = time.perf_counter()
+            if operation == "resize":
+                image = fast_resize(image, (params["width"], params["height"]))
+            elif operation == "rotate":
+                image = image.rotate(params["angle"], expand=params.get("expand", False))
+            elif operation == "compress":
+                save_options["quality"] = params["quality"]
+                save_options["optimize"] = True
+            elif operation != "convert":
+                raise ValueError(f"Unknown batch operation: {operation}")
+            timings[operation] = timings.get(operation, 0) + time.perf_counter() - start
+
+        start = time.perf_counter()
+        save_image(image, output_file, **save_options)
+        timings["encode"] = time.perf_counter() - start
+    return timings
+
+
+def _process_batch_item(file, steps, output_dir):
+    return process_image(file, steps, batch_output_path(file, steps, output_dir))
+
+
+# Function to run the pipeline over many images across a process pool.
+# Returns a summary with images/sec, per-stage total seconds and the files that failed.
+def batch_process(files, steps, output_dir=None, workers=None, progress_var=None):
+    files = list(files)
+    stage_totals = {}
+    failures = []
+    start = time.perf_counter()
+
+    def record(file, future):
+        try:
+            for stage, seconds in future.result().items():
+                stage_totals[stage] = stage_totals.get(stage, 0) + seconds
+        except Exception as e:
+            failures.append((file, str(e)))
+
+    workers = min(workers or os.cpu_count() or 1, len(files)) if files else 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_process_batch_item, file, steps, output_dir): file for file in files}
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                record(futures[future], future)
+                if progress_var is not None:
+                    progress_var.set(done / len(files) * 100)
+        except BaseException:
+            # Cancelled (or failed) from the caller's side: do not start the remaining images
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    elapsed = time.perf_counter() - start
+    processed = len(files) - len(failures)
+    return {
+        "processed": processed,
+        "failures": failures,
+        "elapsed": elapsed,
+        "images_per_sec": processed / elapsed if elapsed else 0.0,
+        "stage_seconds": stage_totals,
+    }
+
+
+# Human readable summary of a batch_process result
+def describe_batch(summary):
+    lines = [f"Processed {summary['processed']} image(s) in {summary['elapsed']:.2f}s "
+             f"({summary['images_per_sec']:.1f} images/sec)"]
+    if summary["processed"]:
+        for stage, seconds in summary["stage_seconds"].items():
+            lines.append(f"  {stage}: {seconds / summary['processed'] * 1000:.1f} ms/image")
+    for file, error in summary["failures"]:
+        lines.append(f"Failed {os.path.basename(file)}: {error}")
+    return "\n".join(lines)
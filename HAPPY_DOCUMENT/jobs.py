@@ -0,0 +1,220 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from tkinter import messagebox, TclError
+
+QUEUED = "Queued"
+RUNNING = "Running"
+DONE = "Done"
+FAILED = "Failed"
+CANCELLED = "Cancelled"
+
+DEFAULT_THREAD_WORKERS = 4
+POLL_MS = 100
+MAX_EVENTS_PER_POLL = 500  # Keep each poll short so the UI stays responsive under a flood of progress updates
+
+_executor = None
+
+
+# Raised inside a job when the user cancels it
+class JobCancelled(Exception):
+    pass
+
+
+def _init_worker_thread():
+    # COM (Word automation) has to be initialised on every thread that uses it
+    try:
+        import comtypes
+        comtypes.CoInitialize()
+    except (ImportError, OSError, AttributeError):
+        pass
+
+
+# Drop-in replacement for a tk progress variable inside a job, safe to call from any thread.
+# Every set() is also a cancellation point, so functions that already report progress can be cancelled.
+class JobProgress:
+    def __init__(self, job):
+        self.job = job
+
+    def set(self, value):
+        self.job.check_cancelled()
+        self.job.call_in_ui(self.job._set_percent, value)
+
+    def get(self):
+        return self.job.percent
+
+
+class Job:
+    def __init__(self, executor, job_id, name, progress_var=None, status_var=None, on_done=None, on_error=None):
+        self.executor = executor
+        self.id = job_id
+        self.name = name
+        self.status = QUEUED
+        self.percent = 0
+        self.result = None
+        self.error = None
+        self.future = None
+        self.progress_var = JobProgress(self)
+        self._tk_progress_var = progress_var
+        self._tk_status_var = status_var
+        self._on_done = on_done
+        self._on_error = on_error
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()  # Only succeeds while the job is still queued
+
+    def cancel_requested(self):
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    # Run fn(*args) on the Tk thread (for widget updates from inside a job)
+    def call_in_ui(self, fn, *args):
+        self.executor._post(fn, *args)
+
+    def is_finished(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def _set_status(self, status):
+        self.status = status
+        if self._tk_status_var is not None:
+            self._tk_status_var.set(f"{self.name}: {status}" if status != DONE else "Ready")
+        self.executor._notify(self)
+
+    def _set_percent(self, value):
+        self.percent = value
+        if self._tk_progress_var is not None:
+            self._tk_progress_var.set(value)
+        if self._tk_status_var is not None and self.status == RUNNING:
+            self._tk_status_var.set(f"{self.name}: {value:.0f}%")
+        self.executor._notify(self)
+
+
+# Shared background executor for the GUI.
+# Thread jobs are called as func(job, *args, **kwargs) and report through job.progress_var;
+# process jobs (process=True) are called as func(*args, **kwargs) and must be picklable.
+# Progress, results and errors are queued by the workers and applied on the Tk thread by polling with after().
+class JobExecutor:
+    def __init__(self, root, thread_workers=DEFAULT_THREAD_WORKERS, process_workers=None, poll_ms=POLL_MS):
+        self.root = root
+        self.jobs = []
+        self.poll_ms = poll_ms
+        self.process_workers = process_workers
+        self._events = queue.Queue()
+        self._listeners = []
+        self._ids = itertools.count(1)
+        self._threads = ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="job",
+                                           initializer=_init_worker_thread)
+        self._processes = None
+        self._closed = False
+        self.root.after(self.poll_ms, self._poll)
+
+    def submit(self, name, func, *args, process=False, on_done=None, on_error=None, progress_var=None,
+               status_var=None, **kwargs):
+        job = Job(self, next(self._ids), name, progress_var, status_var, on_done, on_error)
+        self.jobs.append(job)
+        if progress_var is not None:
+            progress_var.set(0)
+        job._set_status(QUEUED)
+
+        if process:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=self.process_workers)
+            job.future = self._processes.submit(func, *args, **kwargs)
+        else:
+            job.future = self._threads.submit(self._run, job, func, args, kwargs)
+        job.future.add_done_callback(lambda future: self._post(self._finish, job, future))
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        job.check_cancelled()
+        self._post(job._set_status, RUNNING)
+        return func(job, *args, **kwargs)
+
+    def _post(self, fn, *args):
+        self._events.put((fn, args))
+
+    def _poll(self):
+        for _ in range(MAX_EVENTS_PER_POLL):
+            try:
+                fn, args = self._events.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args)
+            except TclError:
+                pass  # The widget the update was meant for has been closed
+
+        # Process pool jobs cannot report back, so pick up their start from the future
+        for job in self.jobs:
+            if job.status == QUEUED and job.future is not None and job.future.running():
+                job._set_status(RUNNING)
+
+        if not self._closed:
+            try:
+                self.root.after(self.poll_ms, self._poll)
+            except TclError:
+                self.shutdown()
+
+    def _finish(self, job, future):
+        if job.is_finished():
+            return
+        if future.cancelled():
+            job._set_status(CANCELLED)
+            return
+        error = future.exception()
+        if isinstance(error, JobCancelled):
+            job._set_status(CANCELLED)
+        elif error is not None:
+            job.error = error
+            job._set_status(FAILED)
+            if job._on_error:
+                job._on_error(error)
+            else:
+                messagebox.showerror("Error", f"{job.name} failed: {error}")
+        else:
+            job.result = future.result()
+            job._set_percent(100)
+            job._set_status(DONE)
+            if job._on_done:
+                job._on_done(job.result)
+
+    # listener(job) is called on the Tk thread whenever a job changes state or progress
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, job):
+        for listener in list(self._listeners):
+            listener(job)
+
+    def active_jobs(self):
+        return [job for job in self.jobs if not job.is_finished()]
+
+    def clear_finished(self):
+        self.jobs = self.active_jobs()
+
+    def shutdown(self):
+        self._closed = True
+        for job in self.active_jobs():
+            job.cancel()
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+
+# Return the application-wide executor, creating it on the Tk root of the given widget
+def get_executor(widget):
+    global _executor
+    if _executor is None or _executor._closed:
+        _executor = JobExecutor(widget.nametowidget("."))
+    return _executor
@@ -8,6 +8,59 @@ from excel import ExcelUtilityApp  # Import the EnhancedExcelUtilityApp from exc
 import webbrowser  # Import webbrowser to open links
 from PIL import Image, ImageTk
 from aexcel import EnhancedExcelUtilityApp  # Import the ExcelUtilityApp for advanced utility
+from jobs import get_executor  # Background job executor shared by all utilities
+from tiles import allow_large_images
+
+class JobsPanel:
+    def __init__(self, master, executor):
+        self.master = master
+        self.executor = executor
+        master.title("Background Jobs")
+        master.geometry("600x300")
+
+        self.tree = ttk.Treeview(master, columns=("job", "status", "progress"), show="headings", height=10)
+        self.tree.heading("job", text="Job")
+        self.tree.heading("status", text="Status")
+        self.tree.heading("progress", text="Progress")
+        self.tree.column("job", width=300)
+        self.tree.column("status", width=120)
+        self.tree.column("progress", width=100, anchor=E)
+        self.tree.pack(fill=BOTH, expand=YES, padx=10, pady=10)
+
+        button_frame = ttk.Frame(master)
+        button_frame.pack(fill=X, padx=10, pady=(0, 10))
+        ttk.Button(button_frame, text="Cancel Selected", command=self.cancel_selected, style="danger.TButton").pack(side=LEFT, padx=5)
+        ttk.Button(button_frame, text="Clear Finished", command=self.clear_finished).pack(side=LEFT, padx=5)
+
+        for job in executor.jobs:
+            self.update_job(job)
+        executor.add_listener(self.update_job)
+        master.bind("<Destroy>", self.on_destroy)
+
+    def update_job(self, job):
+        values = (job.name, job.status, f"{job.percent:.0f}%")
+        item_id = str(job.id)
+        if self.tree.exists(item_id):
+            self.tree.item(item_id, values=values)
+        else:
+            self.tree.insert("", END, iid=item_id, values=values)
+
+    def cancel_selected(self):
+        selected = {int(item_id) for item_id in self.tree.selection()}
+        for job in self.executor.jobs:
+            if job.id in selected:
+                job.cancel()
+
+    def clear_finished(self):
+        self.executor.clear_finished()
+        active = {str(job.id) for job in self.executor.jobs}
+        for item_id in self.tree.get_children():
+            if item_id not in active:
+                self.tree.delete(item_id)
+
+    def on_destroy(self, event):
+        if event.widget is self.master:
+            self.executor.remove_listener(self.update_job)
 
 class MainApp:
     def __init__(self, master):
@@ -50,6 +103,12 @@ class MainApp:
         self.aexcel_button = ttk.Button(self.main_frame, text="Advanced Excel Utility", command=self.open_Aexcel_utility, width=30)
         self.aexcel_button.pack(pady=10)
 
+        # Long operations from every utility run here so the windows stay responsive
+        self.jobs = get_executor(master)
+        self.jobs_button = ttk.Button(self.main_frame, text="Background Jobs", command=self.open_jobs_panel, width=30)
+        self.jobs_button.pack(pady=10)
+        master.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Footer
         self.footer_frame = ttk.Frame(master)
         self.footer_frame.pack(side=BOTTOM, fill=X, pady=(10, 0))
@@ -86,6 +145,14 @@ class MainApp:
     def open_link3(self, event):
         webbrowser.open("adityacodes8@gmail.com")
 
+    def open_jobs_panel(self):
+        jobs_window = tk.Toplevel(self.master)
+        JobsPanel(jobs_window, self.jobs)
+
+    def on_close(self):
+        self.jobs.shutdown()  # Cancel running jobs so their threads do not keep the process alive
+        self.master.destroy()
+
     def open_pdf_utility(self):
         pdf_window = tk.Toplevel(self.master)
         PDFUtilityGUI(pdf_window)
@@ -109,6 +176,7 @@ class MainApp:
         EnhancedExcelUtilityApp()
 
 if __name__ == "__main__":
+    allow_large_images()  # Before any image is opened, so gigapixel scans can be viewed
     root = tk.Tk()
     app = MainApp(root)
     root.mainloop()
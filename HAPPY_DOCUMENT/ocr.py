@@ -0,0 +1,206 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import fitz
+import pytesseract
+from PIL import Image
+from ocr_cache import OCRCache, get_default_cache, make_key
+
+DEFAULT_DPI = 72  # Same resolution as page.get_pixmap() with no arguments
+DEFAULT_LANG = "eng"
+MIN_NATIVE_CHARS = 20  # Pages with less embedded text than this are treated as image-only
+
+# Per-process state for OCR workers (each worker opens the PDF once)
+_worker_doc = None
+_worker_cache = None
+
+
+# Default number of OCR worker processes
+def default_workers():
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+# cache=None means the shared on-disk cache, cache=False disables caching
+def resolve_cache(cache):
+    if cache is None:
+        return get_default_cache()
+    return cache or None
+
+
+def _tesseract_config(psm):
+    return f"--psm {psm}" if psm is not None else ""
+
+
+# Render a single PDF page to a PIL image at the requested DPI
+def render_page(doc, page_num, dpi=DEFAULT_DPI):
+    page = doc.load_page(page_num)
+    pix = page.get_pixmap(dpi=dpi, alpha=False)
+    return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+
+
+# Render and OCR a single page of an already opened document, reusing a cached result for identical pixels
+def ocr_page(doc, page_num, dpi=DEFAULT_DPI, lang=DEFAULT_LANG, psm=None, cache=False):
+    img = render_page(doc, page_num, dpi)
+    cache = resolve_cache(cache)
+    if cache is None:
+        return pytesseract.image_to_string(img, lang=lang, config=_tesseract_config(psm))
+
+    key = make_key(img.tobytes(), lang, dpi, psm)
+    text = cache.get(key)
+    if text is None:
+        text = pytesseract.image_to_string(img, lang=lang, config=_tesseract_config(psm))
+        cache.put(key, text)
+    return text
+
+
+# Function to extract text from an image file using OCR, sharing the result cache with the PDF path.
+# The key is the file's bytes, so a cache hit skips decoding the image as well.
+def ocr_image_file(file_path, lang=DEFAULT_LANG, psm=None, cache=None):
+    cache = resolve_cache(cache)
+    if cache is None:
+        with Image.open(file_path) as image:
+            return pytesseract.image_to_string(image, lang=lang, config=_tesseract_config(psm))
+
+    with open(file_path, "rb") as f:
+        key = make_key(f.read(), lang, "image", psm)
+    text = cache.get(key)
+    if text is None:
+        with Image.open(file_path) as image:
+            text = pytesseract.image_to_string(image, lang=lang, config=_tesseract_config(psm))
+        cache.put(key, text)
+    return text
+
+
+def _init_worker(file_path, tesseract_cmd, cache_dir, cache_max_bytes):
+    global _worker_doc, _worker_cache
+    # Workers started with "spawn" (Windows) do not inherit the configured path
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    _worker_doc = fitz.open(file_path)
+    _worker_cache = OCRCache(cache_dir, cache_max_bytes) if cache_dir else False
+
+
+def _ocr_worker_page(page_num, dpi, lang, psm):
+    hits = _worker_cache.hits if _worker_cache else 0
+    text = ocr_page(_worker_doc, page_num, dpi, lang, psm, _worker_cache)
+    hit = bool(_worker_cache) and _worker_cache.hits > hits
+    return page_num, text, hit
+
+
+# Yield (page_num, text) for every page of a PDF, spreading pages across worker processes.
+# With ordered=True pages are yielded in page order, each as soon as it and all earlier pages are done;
+# with ordered=False they are yielded in completion order.
+def iter_ocr_pages(file_path, workers=None, dpi=DEFAULT_DPI, lang=DEFAULT_LANG, pages=None, ordered=True,
+                   psm=None, cache=None):
+    cache = resolve_cache(cache)
+    if pages is None:
+        with fitz.open(file_path) as doc:
+            pages = list(range(len(doc)))
+    else:
+        pages = list(pages)
+    if not pages:
+        return
+
+    workers = min(workers or default_workers(), len(pages))
+    if workers <= 1:
+        # Not worth starting a pool for a single worker or a single page
+        with fitz.open(file_path) as doc:
+            for page_num in pages:
+                yield page_num, ocr_page(doc, page_num, dpi, lang, psm, cache or False)
+        return
+
+    cache_args = (cache.cache_dir, cache.max_bytes) if cache else (None, None)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(file_path, pytesseract.pytesseract.tesseract_cmd) + cache_args)
+    try:
+        futures = [pool.submit(_ocr_worker_page, page_num, dpi, lang, psm) for page_num in pages]
+        position = {page_num: i for i, page_num in enumerate(pages)}
+        done = {}
+        next_index = 0
+        for future in as_completed(futures):
+            page_num, text, hit = future.result()
+            if cache:
+                cache.record(hit)  # Keep the caller's hit/miss counters in step with the workers
+            if not ordered:
+                yield page_num, text
+                continue
+            done[position[page_num]] = (page_num, text)
+            while next_index in done:
+                yield done.pop(next_index)
+                next_index += 1
+    finally:
+        # Drop pages that have not started yet if the caller stops iterating early
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+# Function to extract text using OCR from the PDF pages (image-based PDFs).
+# on_page(page_num, text) is called for every page as soon as it is available, in page order.
+def extract_text_ocr(file_path, workers=None, dpi=DEFAULT_DPI, lang=DEFAULT_LANG, progress_var=None, on_page=None,
+                     psm=None, cache=None):
+    with fitz.open(file_path) as doc:
+        total_pages = len(doc)
+
+    parts = []
+    for count, (page_num, page_text) in enumerate(iter_ocr_pages(file_path, workers, dpi, lang, psm=psm, cache=cache), start=1):
+        parts.append(f"Page {page_num + 1}:\n{page_text}\n\n")  # Add page number for clarity
+        if on_page:
+            on_page(page_num, page_text)
+        if progress_var is not None:
+            progress_var.set(count / total_pages * 100)
+    return "".join(parts)
+
+
+# Check whether a page has an embedded text layer worth using instead of OCR
+def native_page_text(page, min_chars=MIN_NATIVE_CHARS):
+    text = page.get_text("text")
+    if len(text.strip()) >= min_chars:
+        return text
+    return None
+
+
+# Function to extract text from mixed PDFs: pages with a usable text layer are read directly,
+# only image-only pages (or pages with too little text) are rendered and OCR'd.
+# Returns (text, methods) where methods maps each page number to "native" or "ocr".
+def extract_text_hybrid(file_path, workers=None, dpi=DEFAULT_DPI, lang=DEFAULT_LANG, min_chars=MIN_NATIVE_CHARS,
+                        progress_var=None, on_page=None, psm=None, cache=None):
+    results = {}
+    methods = {}
+    ocr_pages = []
+    with fitz.open(file_path) as doc:
+        total_pages = len(doc)
+        for page_num in range(total_pages):
+            text = native_page_text(doc.load_page(page_num), min_chars)
+            if text is None:
+                ocr_pages.append(page_num)
+                methods[page_num] = "ocr"
+            else:
+                results[page_num] = text
+                methods[page_num] = "native"
+
+    parts = []
+    next_page = 0
+
+    def flush():
+        # Emit pages in order as soon as every earlier page is available
+        nonlocal next_page
+        while next_page in results:
+            page_text = results.pop(next_page)
+            parts.append(f"Page {next_page + 1}:\n{page_text}\n\n")
+            if on_page:
+                on_page(next_page, page_text, methods[next_page])
+            if progress_var is not None:
+                progress_var.set((next_page + 1) / total_pages * 100)
+            next_page += 1
+
+    flush()
+    for page_num, page_text in iter_ocr_pages(file_path, workers, dpi, lang, pages=ocr_pages, psm=psm, cache=cache):
+        results[page_num] = page_text
+        flush()
+    return "".join(parts), methods
+
+
+# Summarise which extraction path was used, e.g. "18 native, 2 OCR (pages 3, 7)"
+def describe_methods(methods):
+    ocr_pages = [page_num + 1 for page_num, method in sorted(methods.items()) if method == "ocr"]
+    summary = f"{len(methods) - len(ocr_pages)} native, {len(ocr_pages)} OCR"
+    if ocr_pages:
+        summary += " (pages " + ", ".join(map(str, ocr_pages)) + ")"
+    return summary
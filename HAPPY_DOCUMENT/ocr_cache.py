@@ -0,0 +1,56 @@
+import hashlib
+import os
+from disk_cache import DiskCache
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".happy_document", "ocr_cache")
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024  # 200 MB of cached text
+
+_default_cache = None
+
+
+# Build a cache key from the pixels (or file bytes) being OCR'd plus every setting that changes the output
+def make_key(data, lang, dpi, psm):
+    digest = hashlib.sha256()
+    digest.update(f"{lang}|{dpi}|{psm}|".encode())
+    digest.update(data)
+    return digest.hexdigest()
+
+
+# On-disk, content-addressed cache of OCR results with a size cap and LRU eviction (see DiskCache).
+# Entries are plain text files named after their key.
+class OCRCache(DiskCache):
+    suffixes = (".txt",)
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        super().__init__(cache_dir, max_bytes)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            self._touch(path)
+        except OSError:
+            self.record(False)
+            return None
+        self.record(True)
+        return text
+
+    def put(self, key, text):
+        def write(tmp_path):
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+        self._store_file(self._path(key), write)
+
+    def summary(self):
+        stats = self.stats()
+        return f"OCR cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)"
+
+
+# Shared cache used by both the PDF and image OCR paths
+def get_default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = OCRCache()
+    return _default_cache
@@ -3,64 +3,16 @@ from tkinter import filedialog, messagebox, scrolledtext, simpledialog, Listbox,
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import pytesseract
-from PIL import Image
-import fitz
 import os
-import pdf2docx
-import pandas as pd
 from pdf2image import convert_from_path
-import tabula
-import time  # For simulating long operations (remove in production)
+from ocr import extract_text_ocr, extract_text_hybrid, describe_methods  # Parallel page-level OCR engine
+from ocr_cache import get_default_cache
+from jobs import get_executor
+from pdf_ops import merge_pdfs, pdf_to_word, pdf_to_excel  # Headless PDF operations
 
 # Set the Tesseract executable path for Windows
 pytesseract.pytesseract.tesseract_cmd = r'C:\Users\HP\scoop\apps\tesseract\current\tesseract.exe'  # Update with your Tesseract path
 
-# Function to extract text using OCR from the PDF pages (image-based PDFs)
-def extract_text_ocr(file_path):
-    doc = fitz.open(file_path)  # Open the PDF using PyMuPDF
-    text = ""
-    for page_num in range(len(doc)):
-        page = doc.load_page(page_num)  # Load a page
-        pix = page.get_pixmap()  # Convert page to an image (for OCR)
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)  # Convert to PIL Image
-
-        # Use pytesseract to extract text from the image
-        page_text = pytesseract.image_to_string(img)
-
-        text += f"Page {page_num + 1}:\n{page_text}\n\n"  # Add page number for clarity
-    return text
-
-# Function to merge multiple PDFs
-def merge_pdfs(file_paths, output_path, progress_var):
-    merger = fitz.open()  # Using fitz for handling PDFs
-    total_files = len(file_paths)
-    for index, pdf in enumerate(file_paths):
-        merger.insert_pdf(fitz.open(pdf))
-        progress_var.set((index + 1) / total_files * 100)  # Update progress
-        time.sleep(0.5)  # Simulate processing time (remove in production)
-    merger.save(output_path)
-    merger.close()
-
-# Function to convert PDF to Word
-def pdf_to_word(pdf_file, output_path, progress_var):
-    try:
-        pdf2docx.PdfToDocx().convert(pdf_file, output_path)
-        progress_var.set(100)  # Set progress to 100% after completion
-    except Exception as e:
-        print(f"An error occurred while converting to Word: {str(e)}")
-
-# Function to convert PDF to Excel using tabula-py
-def pdf_to_excel(pdf_file, output_path, progress_var):
-    try:
-        tables = tabula.read_pdf(pdf_file, pages='all', multiple_tables=True)
-        with pd.ExcelWriter(output_path) as writer:
-            for i, table in enumerate(tables):
-                table.to_excel(writer, sheet_name=f"Sheet{i + 1}", index=False)
-                progress_var.set((i + 1) / len(tables) * 100)  # Update progress
-        progress_var.set(100)  # Set progress to 100% after completion
-    except Exception as e:
-        print(f"An error occurred while converting to Excel: {str(e)}")
-
 class PDFUtilityGUI:
     def __init__(self, master):
         self.master = master
@@ -85,6 +37,7 @@ class PDFUtilityGUI:
         self.operation = tk.StringVar(value="search")
         operations = [
             ("Extract Text", "extract"),
+            ("Smart Extract", "extract_hybrid"),
             ("Merge PDFs", "merge"),
             ("Convert to Images", "convert_images"),
             ("Convert to Word", "convert_word"),
@@ -123,7 +76,7 @@ class PDFUtilityGUI:
         self.selected_files = []
 
     def browse_files(self):
-        if self.operation.get() in ["extract", "convert_word", "convert_excel", "set_password", "search_text"]:
+        if self.operation.get() in ["extract", "extract_hybrid", "convert_word", "convert_excel", "set_password", "search_text"]:
             files = filedialog.askopenfilename(filetypes=[("PDF Files", "*.pdf")])
         else:
             files = filedialog.askopenfilenames(filetypes=[("PDF Files", "*.pdf")])
@@ -141,52 +94,66 @@ class PDFUtilityGUI:
             messagebox.showerror("Error", "Please select PDF file(s).")
             return
 
-        self.status_var.set("Processing...")
-        self.master.update_idletasks()
-        self.progress_var.set(0)  # Reset progress bar
-
-        try:
-            if self.operation.get() == "extract":
-                text = extract_text_ocr(self.selected_files[0])
-                self.show_extracted_text(text)
-            elif self.operation.get() == "merge":
-                if len(self.selected_files) < 2:
-                    messagebox.showerror("Error", "Please select at least two PDF files to merge.")
-                    return
-                self.select_merge_order()
-            elif self.operation.get() == "convert_images":
-                output_folder = filedialog.askdirectory()
-                if output_folder:
-                    for pdf_file in self.selected_files:
+        jobs = get_executor(self.master)
+        file_path = self.selected_files[0]
+        if self.operation.get() == "extract":
+            text_area = self.show_extracted_text("")
+            jobs.submit("Extract Text", lambda job: extract_text_ocr(
+                file_path, progress_var=job.progress_var,
+                on_page=lambda page_num, page_text: job.call_in_ui(self.append_page_text, text_area, page_num, page_text)),
+                progress_var=self.progress_var, status_var=self.status_var,
+                on_done=lambda _: text_area.master.title(f"Extracted Text - {get_default_cache().summary()}"))
+        elif self.operation.get() == "extract_hybrid":
+            text_area = self.show_extracted_text("")
+            jobs.submit("Smart Extract", lambda job: extract_text_hybrid(
+                file_path, progress_var=job.progress_var,
+                on_page=lambda page_num, page_text, method: job.call_in_ui(self.append_page_text, text_area, page_num, page_text, method)),
+                progress_var=self.progress_var, status_var=self.status_var,
+                on_done=lambda result: messagebox.showinfo("Extraction Summary", f"{describe_methods(result[1])}\n{get_default_cache().summary()}"))
+        elif self.operation.get() == "merge":
+            if len(self.selected_files) < 2:
+                messagebox.showerror("Error", "Please select at least two PDF files to merge.")
+                return
+            self.select_merge_order()
+        elif self.operation.get() == "convert_images":
+            output_folder = filedialog.askdirectory()
+            if output_folder:
+                selected_files = list(self.selected_files)
+
+                def convert_images(job):
+                    for index, pdf_file in enumerate(selected_files):
                         pdf_to_images_with_fitz(pdf_file, output_folder)
-                    messagebox.showinfo("Success", "PDF pages converted to images successfully.")
-            elif self.operation.get() == "convert_word":
-                output_path = filedialog.asksaveasfilename(defaultextension=".docx", filetypes=[("Word Files", "*.docx")])
-                if output_path:
-                    pdf_to_word(self.selected_files[0], output_path, self.progress_var)
-                    messagebox.showinfo("Success", f"Converted to Word successfully. Saved as {output_path}")
-            elif self.operation.get() == "convert_excel":
-                output_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel Files", "*.xlsx")])
+                        job.progress_var.set((index + 1) / len(selected_files) * 100)
+
+                jobs.submit("Convert to Images", convert_images, progress_var=self.progress_var, status_var=self.status_var,
+                            on_done=lambda _: messagebox.showinfo("Success", "PDF pages converted to images successfully."))
+        elif self.operation.get() == "convert_word":
+            output_path = filedialog.asksaveasfilename(defaultextension=".docx", filetypes=[("Word Files", "*.docx")])
+            if output_path:
+                # pdf2docx is pure Python and CPU bound, so it gets its own process
+                jobs.submit("Convert to Word", pdf_to_word, file_path, output_path, process=True,
+                            progress_var=self.progress_var, status_var=self.status_var,
+                            on_done=lambda _: messagebox.showinfo("Success", f"Converted to Word successfully. Saved as {output_path}"))
+        elif self.operation.get() == "convert_excel":
+            output_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel Files", "*.xlsx")])
+            if output_path:
+                jobs.submit("Convert to Excel", lambda job: pdf_to_excel(file_path, output_path, job.progress_var),
+                            progress_var=self.progress_var, status_var=self.status_var,
+                            on_done=lambda _: messagebox.showinfo("Success", f"Converted to Excel successfully. Saved as {output_path}"))
+        elif self.operation.get() == "set_password":
+            password = simpledialog.askstring("Password", "Enter a password to protect the PDF:", show='*')
+            if password:
+                output_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF Files", "*.pdf")])
                 if output_path:
-                    pdf_to_excel(self.selected_files[0], output_path, self.progress_var)
-                    messagebox.showinfo("Success", f"Converted to Excel successfully. Saved as {output_path}")
-            elif self.operation.get() == "set_password":
-                password = simpledialog.askstring("Password", "Enter a password to protect the PDF:", show='*')
-                if password:
-                    output_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF Files", "*.pdf")])
-                    if output_path:
-                        set_pdf_password(self.selected_files[0], output_path, password)
-                        messagebox.showinfo("Success", f"Password set successfully. Saved as {output_path}")
-            elif self.operation.get() == "search_text":
-                search_text = simpledialog.askstring("Search Text", "Enter text to search for:")
-                if search_text:
-                    results = search_text_in_pdf(self.selected_files[0], search_text)
-                    self.show_search_results(results)
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-        finally:
-            self.status_var.set("Ready")
-            self.progress_var.set(100)  # Ensure progress bar shows completion
+                    jobs.submit("Set Password", lambda job: set_pdf_password(file_path, output_path, password),
+                                progress_var=self.progress_var, status_var=self.status_var,
+                                on_done=lambda _: messagebox.showinfo("Success", f"Password set successfully. Saved as {output_path}"))
+        elif self.operation.get() == "search_text":
+            search_text = simpledialog.askstring("Search Text", "Enter text to search for:")
+            if search_text:
+                jobs.submit("Search Text", lambda job: search_text_in_pdf(file_path, search_text),
+                            progress_var=self.progress_var, status_var=self.status_var,
+                            on_done=self.show_search_results)
 
     def select_merge_order(self):
         merge_window = Toplevel(self.master)
@@ -204,9 +171,9 @@ class PDFUtilityGUI:
     def merge_selected_order(self, selected_files, window):
         output_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF Files", "*.pdf")])
         if output_path:
-            self.progress_var.set(0)
-            merge_pdfs(selected_files, output_path, self.progress_var)
-            messagebox.showinfo("Success", f"PDFs merged successfully. Saved as {output_path}")
+            get_executor(self.master).submit("Merge PDFs", lambda job: merge_pdfs(selected_files, output_path, job.progress_var),
+                                             progress_var=self.progress_var, status_var=self.status_var,
+                                             on_done=lambda _: messagebox.showinfo("Success", f"PDFs merged successfully. Saved as {output_path}"))
             window.destroy()
 
     def show_extracted_text(self, text):
@@ -217,6 +184,12 @@ class PDFUtilityGUI:
         text_area = scrolledtext.ScrolledText(text_window, wrap=tk.WORD)
         text_area.insert(tk.END, text)
         text_area.pack(fill=BOTH, expand=True)
+        return text_area
+
+    def append_page_text(self, text_area, page_num, page_text, method="ocr"):
+        # Show each page as soon as it is ready instead of waiting for the whole document
+        text_area.insert(tk.END, f"Page {page_num + 1}:\n{page_text}\n\n")
+        self.status_var.set(f"Extracted page {page_num + 1} ({method})")
 
     def show_search_results(self, results):
         result_window = Toplevel(self.master)
@@ -0,0 +1,83 @@
+import os
+import fitz
+from pdf2docx import Converter
+from pdf_tables import pdf_tables_to_excel
+from progress import set_progress
+
+DEFAULT_MERGE_CHUNK = 50  # Source files inserted between incremental saves
+
+
+# Count pages of every input up front so progress can follow pages instead of files
+def count_pages(file_paths):
+    counts = []
+    for path in file_paths:
+        with fitz.open(path) as src:
+            counts.append(src.page_count)
+    return counts
+
+
+# Write what has been merged so far to disk and reopen it, so the in-memory document only
+# ever holds the pages added since the last flush
+def _flush_merge(merged, part_path, first_flush):
+    if first_flush:
+        merged.save(part_path)
+    else:
+        merged.saveIncr()
+    merged.close()
+    return fitz.open(part_path)
+
+
+# Function to merge multiple PDFs.
+# Each source is closed right after insert_pdf, the output is saved incrementally every chunk_size files
+# and compacted once at the end (garbage collection + deflate), so memory stays bounded for thousands of inputs.
+def merge_pdfs(file_paths, output_path, progress_var=None, chunk_size=DEFAULT_MERGE_CHUNK, garbage=3, deflate=True):
+    file_paths = list(file_paths)
+    page_counts = count_pages(file_paths)
+    total_pages = sum(page_counts) or 1
+    part_path = output_path + ".part"
+
+    merged = fitz.open()
+    flushed = False
+    done_pages = 0
+    try:
+        for index, path in enumerate(file_paths):
+            with fitz.open(path) as src:
+                merged.insert_pdf(src)
+            done_pages += page_counts[index]
+            set_progress(progress_var, done_pages / total_pages * 100)
+
+            if (index + 1) % chunk_size == 0 and index + 1 < len(file_paths):
+                merged = _flush_merge(merged, part_path, not flushed)
+                flushed = True
+
+        if flushed:
+            merged.saveIncr()
+            merged.close()
+            # Final full rewrite drops the incremental update sections and unused objects
+            with fitz.open(part_path) as partial:
+                partial.save(output_path, garbage=garbage, deflate=deflate)
+        else:
+            merged.save(output_path, garbage=garbage, deflate=deflate)
+            merged.close()
+    finally:
+        if not merged.is_closed:
+            merged.close()
+        if os.path.exists(part_path):
+            os.remove(part_path)
+    set_progress(progress_var, 100)
+
+
+# Function to convert PDF to Word
+def pdf_to_word(pdf_file, output_path, progress_var=None):
+    converter = Converter(pdf_file)
+    try:
+        converter.convert(output_path)
+    finally:
+        converter.close()
+    set_progress(progress_var, 100)  # Set progress to 100% after completion
+
+
+# Function to convert PDF to Excel using tabula-py: page batches are extracted in parallel by warm
+# worker processes and streamed into the workbook (see pdf_tables)
+def pdf_to_excel(pdf_file, output_path, progress_var=None, workers=None, batch_pages=None):
+    return pdf_tables_to_excel(pdf_file, output_path, progress_var, workers, batch_pages)
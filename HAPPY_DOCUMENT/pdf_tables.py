@@ -0,0 +1,124 @@
+import atexit
+import importlib.util
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import fitz
+import tabula
+from openpyxl import Workbook
+from progress import set_progress
+
+# tabula-py runs tabula-java inside the Python process through jpype when it is installed, starting the
+# JVM once per process; without it every read_pdf call launches a new java process
+HAVE_JPYPE = importlib.util.find_spec("jpype") is not None
+DEFAULT_BATCH_PAGES = 2 if HAVE_JPYPE else 10  # Larger batches without jpype, so fewer JVM starts
+MAX_DEFAULT_WORKERS = 4  # Each worker holds its own JVM (a few hundred MB)
+
+_pool = None  # Worker processes kept between calls, so their JVMs stay warm from one file to the next
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def default_workers():
+    return max(1, min(MAX_DEFAULT_WORKERS, (os.cpu_count() or 1) - 1))
+
+
+def _shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+# Shared pool of extraction workers, created on first use and reused by later calls
+def get_table_pool(workers):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is None:
+                atexit.register(_shutdown_pool)
+            else:
+                _pool.shutdown(wait=False)  # Batches already submitted by another call still finish
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+        return _pool
+
+
+# (first, last) 1-based page ranges of at most batch_pages pages
+def page_batches(page_count, batch_pages=DEFAULT_BATCH_PAGES):
+    return [(first, min(first + batch_pages - 1, page_count)) for first in range(1, page_count + 1, batch_pages)]
+
+
+def read_page_tables(pdf_file, first, last):
+    return tabula.read_pdf(pdf_file, pages=f"{first}-{last}", multiple_tables=True)
+
+
+# Yield (first page, last page, tables) for every page batch of a PDF, in page order, each as soon as
+# it and all earlier batches are done. Batches are spread across the shared worker pool; with a single
+# worker they are read in this process, whose JVM is reused the same way. on_pages(pages done) is
+# called whenever a batch finishes, in any order. batch_pages=None uses DEFAULT_BATCH_PAGES.
+def iter_pdf_tables(pdf_file, workers=None, batch_pages=None, on_pages=None):
+    with fitz.open(pdf_file) as doc:
+        batches = page_batches(doc.page_count, batch_pages or DEFAULT_BATCH_PAGES)
+    workers = min(workers or default_workers(), len(batches))
+    pages_done = 0
+    if workers <= 1:
+        for first, last in batches:
+            tables = read_page_tables(pdf_file, first, last)
+            if on_pages is not None:
+                on_pages(last)
+            yield first, last, tables
+        return
+
+    pool = get_table_pool(workers)
+    futures = {pool.submit(read_page_tables, pdf_file, first, last): index for index, (first, last) in enumerate(batches)}
+    try:
+        done = {}
+        next_index = 0
+        for future in as_completed(futures):
+            index = futures[future]
+            done[index] = future.result()
+            pages_done += batches[index][1] - batches[index][0] + 1
+            if on_pages is not None:
+                on_pages(pages_done)
+            while next_index in done:
+                first, last = batches[next_index]
+                yield first, last, done.pop(next_index)
+                next_index += 1
+    finally:
+        # Drop batches that have not started if the caller stops early or a batch failed; the pool stays up
+        for future in futures:
+            future.cancel()
+
+
+def _write_table(wb, name, table):
+    ws = wb.create_sheet(name)
+    ws.append(list(table.columns))
+    values = table.astype(object).where(table.notna(), None)  # Empty cells instead of NaN, which Excel rejects
+    for row in values.itertuples(index=False, name=None):
+        ws.append(row)
+
+
+# Function to extract every table of a PDF into a workbook, one sheet per table (Sheet1, Sheet2, ... in
+# document order). Page batches are extracted in parallel and each table is written to a write-only
+# workbook as soon as its batch is in order, so only the batches in flight are held in memory.
+# Progress follows extracted pages. Returns {"pages", "tables"}.
+def pdf_tables_to_excel(pdf_file, output_path, progress_var=None, workers=None, batch_pages=None):
+    with fitz.open(pdf_file) as doc:
+        page_count = doc.page_count
+    wb = Workbook(write_only=True)
+    tables = 0
+
+    def on_pages(pages):
+        set_progress(progress_var, pages / max(page_count, 1) * 99)
+
+    for first, last, batch in iter_pdf_tables(pdf_file, workers, batch_pages, on_pages):
+        for table in batch:
+            tables += 1
+            _write_table(wb, f"Sheet{tables}", table)
+    if not tables:
+        raise ValueError(f"No tables found in {os.path.basename(pdf_file)}")
+    wb.save(output_path)
+    set_progress(progress_var, 100)
+    return {"pages": page_count, "tables": tables}
@@ -0,0 +1,152 @@
+import os
+import time
+import pandas as pd
+from openpyxl import load_workbook
+from workbook import sheet_headers
+from progress import set_progress
+
+AGG_FUNCS = ("sum", "mean", "count", "min", "max")
+DEFAULT_CHUNK_ROWS = 200000
+COMBINE_EVERY = 8  # Partial results merged together after this many chunks, so memory follows the number of groups
+# Partial aggregates each function is rebuilt from, and how partials of that kind combine
+# ("numbers" is the count of numeric cells, which means divide by; "count" counts every non-empty cell)
+_PARTS = {"sum": ("sum",), "count": ("count",), "min": ("min",), "max": ("max",), "mean": ("sum", "numbers")}
+_COMBINE = {"sum": "sum", "count": "sum", "numbers": "sum", "min": "min", "max": "max"}
+_COMPRESSIONS = {".gz": "gzip", ".zst": "zstd", ".bz2": "bz2"}
+
+
+def _is_csv(path):
+    return os.path.splitext(path)[1].lower() in (".csv", ".txt", *_COMPRESSIONS)
+
+
+# Compression of a CSV file from its extension; needed when pandas reads from an open handle
+def _csv_compression(path):
+    return _COMPRESSIONS.get(os.path.splitext(path)[1].lower())
+
+
+# Column names of a CSV file or of a workbook sheet (the first by default), without reading the data
+def read_header(path, sheet_name=None):
+    if _is_csv(path):
+        return list(pd.read_csv(path, nrows=0).columns)
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+        return sheet_headers(ws)
+    finally:
+        wb.close()
+
+
+# Yield (DataFrame, fraction of the source read) for successive row chunks of a CSV file or workbook sheet,
+# holding only the given columns. Workbooks are streamed with openpyxl's read-only reader.
+def iter_chunks(path, columns, sheet_name=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    if _is_csv(path):
+        size = os.path.getsize(path) or 1
+        with open(path, "rb") as f:  # Read through this handle so its position (compressed bytes) is the progress
+            for chunk in pd.read_csv(f, usecols=columns, chunksize=chunk_rows, compression=_csv_compression(path)):
+                yield chunk, min(f.tell() / size, 1.0)
+        return
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+        total_rows = max((ws.max_row or 1) - 1, 1)  # From the sheet's dimension record, when the writer stored one
+        header = sheet_headers(ws)
+        rows = ws.iter_rows(min_row=2, values_only=True)
+        missing = [column for column in columns if column not in header]
+        if missing:
+            raise KeyError(f"Columns not found: {', '.join(map(str, missing))}")
+        positions = [header.index(column) for column in columns]
+        buffer = []
+        read = 0
+        for row in rows:
+            buffer.append([row[i] if i < len(row) else None for i in positions])
+            if len(buffer) >= chunk_rows:
+                read += len(buffer)
+                yield pd.DataFrame(buffer, columns=columns), min(read / total_rows, 1.0)
+                buffer = []
+        if buffer:
+            read += len(buffer)
+            yield pd.DataFrame(buffer, columns=columns), 1.0
+    finally:
+        wb.close()
+
+
+def _combine(partials, index_cols):
+    combined = pd.concat(partials)
+    return combined.groupby(level=list(range(len(index_cols)))).agg(
+        {column: _COMBINE[column[1]] for column in combined.columns})
+
+
+# Pivot row chunks without holding the source in memory. Each chunk is reduced to partial aggregates
+# per group (sum, count, min, max as needed) and partials are merged as they accumulate; means are
+# rebuilt as sum / count at the end. Same layout as DataFrame.pivot_table: one column per value column
+# for a single function, (function, value column) columns for several.
+def pivot_chunks(chunks, index_cols, values_cols, aggfuncs, progress_var=None):
+    index_cols, values_cols, aggfuncs = list(index_cols), list(values_cols), list(aggfuncs)
+    unknown = [func for func in aggfuncs if func not in _PARTS]
+    if unknown:
+        raise ValueError(f"Unsupported aggregation: {', '.join(unknown)} (use {', '.join(AGG_FUNCS)})")
+    parts = list(dict.fromkeys(part for func in aggfuncs for part in _PARTS[func]))
+    numeric_parts = [part for part in parts if part != "count"]
+
+    partials = []
+    rows = 0
+    for chunk, fraction in chunks:
+        aggregated = []
+        if "count" in parts:
+            # Every non-empty cell counts, text included, as in pivot_table
+            aggregated.append(chunk.groupby(index_cols, sort=False, observed=True)[values_cols].agg(["count"]))
+        if numeric_parts:
+            # Cells that are not numbers are ignored, as pivot_table does with its numeric aggregations
+            numbers = chunk.copy(deep=False)
+            for column in values_cols:
+                numbers[column] = pd.to_numeric(chunk[column], errors="coerce")
+            partial = numbers.groupby(index_cols, sort=False, observed=True)[values_cols].agg(
+                ["count" if part == "numbers" else part for part in numeric_parts])
+            partial.columns = pd.MultiIndex.from_product([values_cols, numeric_parts])
+            aggregated.append(partial)
+        partials.append(pd.concat(aggregated, axis=1) if len(aggregated) > 1 else aggregated[0])
+        rows += len(chunk)
+        if len(partials) >= COMBINE_EVERY:
+            partials = [_combine(partials, index_cols)]
+        set_progress(progress_var, fraction * 95)
+
+    if not partials:
+        return pd.DataFrame(), rows
+    totals = _combine(partials, index_cols).sort_index()
+
+    result = {}
+    for func in aggfuncs:
+        for column in values_cols:
+            if func == "mean":
+                result[(func, column)] = totals[(column, "sum")] / totals[(column, "numbers")].where(totals[(column, "numbers")] > 0)
+            else:
+                result[(func, column)] = totals[(column, func)]
+    pivot = pd.DataFrame(result)
+    if len(aggfuncs) == 1:
+        pivot.columns = pivot.columns.droplevel(0)
+    return pivot, rows
+
+
+# Function to pivot a CSV file or workbook sheet of any size in chunks. Returns (pivot DataFrame, summary).
+def pivot_file(path, index_cols, values_cols, aggfuncs, sheet_name=None, chunk_rows=DEFAULT_CHUNK_ROWS, progress_var=None):
+    start = time.perf_counter()
+    columns = list(dict.fromkeys(list(index_cols) + list(values_cols)))
+    pivot, rows = pivot_chunks(iter_chunks(path, columns, sheet_name, chunk_rows), index_cols, values_cols, aggfuncs,
+                               progress_var)
+    elapsed = time.perf_counter() - start
+    return pivot, {"rows": rows, "groups": len(pivot), "elapsed": elapsed, "rows_per_sec": rows / elapsed if elapsed else 0.0}
+
+
+# Save a pivot result as .xlsx or .csv (by extension)
+def write_pivot(pivot, output_path):
+    if os.path.splitext(output_path)[1].lower() == ".csv":
+        pivot.to_csv(output_path)
+    else:
+        with pd.ExcelWriter(output_path) as writer:
+            pivot.to_excel(writer)
+
+
+def describe_pivot(summary):
+    return (f"Pivoted {summary['rows']:,} rows into {summary['groups']:,} groups in {summary['elapsed']:.1f}s "
+            f"({summary['rows_per_sec']:,.0f} rows/sec)")
@@ -0,0 +1,5 @@
+# Report progress to an optional tk variable or JobProgress (anything with set(percent)).
+# Kept free of tkinter so the headless engine modules and their worker processes can use it.
+def set_progress(progress_var, value):
+    if progress_var is not None:
+        progress_var.set(value)
@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+import pandas as pd
+from sheet_cache import file_digest
+from table_pdf import sheets_to_pdf
+
+NUMERIC_FUNCS = ("count", "mean", "std", "min", "median", "max", "sum")
+TEXT_FUNCS = ("count", "nunique")  # Statistics that also make sense for text and date columns
+REPORT_FORMATS = (".pdf", ".xlsx", ".json")
+MAX_CACHED_SUMMARIES = 128
+
+_cache = OrderedDict()  # (file hash, sheet, dtypes, columns, group_by) -> statistics DataFrame or None
+_cache_lock = threading.Lock()
+
+
+# Statistics for one sheet, computed in a single groupby().agg (or agg) call covering every column and
+# function. Numeric columns get NUMERIC_FUNCS, other columns TEXT_FUNCS. Without group_by the result has
+# one row per column; with group_by one row per group and a "<column> <function>" column per statistic.
+def summarize_sheet(df, columns=None, group_by=None):
+    group_by = [column for column in (group_by or []) if column in df.columns]
+    if columns:
+        columns = [column for column in columns if column in df.columns and column not in group_by]
+    else:
+        columns = [column for column in df.select_dtypes("number").columns if column not in group_by]
+    if not columns:
+        return None
+
+    funcs = {column: list(NUMERIC_FUNCS) if pd.api.types.is_numeric_dtype(df[column].dtype)
+             and not pd.api.types.is_bool_dtype(df[column].dtype) else list(TEXT_FUNCS)
+             for column in columns}
+    if group_by:
+        result = df.groupby(group_by, observed=True, dropna=False, sort=True).agg(funcs)
+        result.columns = [f"{column} {func}" for column, func in result.columns]
+        return result.reset_index()
+
+    result = df[columns].agg(funcs).T  # One row per column, one column per statistic
+    result.index.name = "Column"
+    order = list(dict.fromkeys(NUMERIC_FUNCS + TEXT_FUNCS))
+    return result[[func for func in order if func in result.columns]].reset_index()
+
+
+# Report for several sheets of a workbook: {sheet name: statistics DataFrame}. Each sheet's statistics
+# are cached by the file's content hash, the sheet's dtypes and the requested columns/groups, so writing
+# the same report to another format (or re-running it) does not aggregate again. The dtypes are part of
+# the key because the same file can be loaded with different dtypes (e.g. with and without memory
+# optimization), which changes what the statistics look like.
+def build_report(workbook, sheet_names=None, columns=None, group_by=None, progress_var=None):
+    sheet_names = list(sheet_names or workbook.sheet_names)
+    digest = file_digest(workbook.path)
+    report = {}
+    for index, name in enumerate(sheet_names):
+        df = workbook.sheet(name)
+        key = (digest, name, tuple(str(dtype) for dtype in df.dtypes), tuple(columns or ()), tuple(group_by or ()))
+        with _cache_lock:
+            cached = key in _cache
+            if cached:
+                _cache.move_to_end(key)
+                summary = _cache[key]
+        if not cached:
+            summary = summarize_sheet(df, columns, group_by)
+            with _cache_lock:
+                _cache[key] = summary
+                while len(_cache) > MAX_CACHED_SUMMARIES:
+                    _cache.popitem(last=False)
+        if summary is not None:
+            report[name] = summary
+        if progress_var is not None:
+            progress_var.set((index + 1) / len(sheet_names) * 90)
+    return report
+
+
+def report_to_excel(report, output_path):
+    with pd.ExcelWriter(output_path) as writer:
+        used = set()
+        for name, summary in report.items():
+            sheet = str(name)[:31]  # Excel's limit on sheet names
+            suffix = 1
+            while sheet in used:
+                suffix += 1
+                sheet = f"{str(name)[:28]} ({suffix})"
+            used.add(sheet)
+            summary.to_excel(writer, sheet_name=sheet, index=False)
+
+
+def report_to_json(report, output_path):
+    data = {str(name): json.loads(summary.to_json(orient="records", date_format="iso")) for name, summary in report.items()}
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def report_to_pdf(report, output_path):
+    # Statistics are floats with long tails of digits; round them so the table stays readable
+    sheets = [(name, summary.round(4)) for name, summary in report.items()]
+    sheets_to_pdf(sheets, output_path, landscape=True)
+
+
+# Write a report in the format given by the output file's extension (.pdf, .xlsx or .json)
+def write_report(report, output_path):
+    ext = os.path.splitext(output_path)[1].lower()
+    if ext == ".json":
+        report_to_json(report, output_path)
+    elif ext in (".xlsx", ".xlsm"):
+        report_to_excel(report, output_path)
+    elif ext == ".pdf":
+        report_to_pdf(report, output_path)
+    else:
+        raise ValueError(f"Unsupported report format: {ext or output_path} (use {', '.join(REPORT_FORMATS)})")
@@ -0,0 +1,94 @@
+import hashlib
+import importlib.util
+import os
+import pickle
+import pandas as pd
+from disk_cache import DiskCache
+
+HAVE_ARROW = importlib.util.find_spec("pyarrow") is not None  # Feather needs pyarrow
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".happy_document", "sheet_cache")
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2 GB
+CACHE_SUFFIXES = (".feather", ".pkl")
+
+_default_cache = None
+_digests = {}  # (path, mtime_ns, size) -> sha1 of the file, so a session hashes each file once
+
+
+# Content hash of a file, remembered per path/mtime/size for the rest of the session
+def file_digest(path):
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if memo_key not in _digests:
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        _digests[memo_key] = f"{digest.hexdigest()}-{stat.st_mtime_ns}"
+    return _digests[memo_key]
+
+
+# Transparent on-disk cache of parsed spreadsheet sheets.
+# Sheets are stored as Feather (Arrow columnar, read back many times faster than XLSX is parsed), falling
+# back to pickle for frames Arrow cannot represent (non-string column names, mixed-type object columns)
+# or when pyarrow is not installed. Keys combine the file hash and mtime with the sheet name, and the
+# least recently used entries are evicted once the cache grows past max_bytes (see DiskCache).
+class SheetCache(DiskCache):
+    suffixes = CACHE_SUFFIXES
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        super().__init__(cache_dir, max_bytes)
+
+    def key(self, path, sheet_name):
+        raw = f"{file_digest(path)}|{sheet_name}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def load(self, path, sheet_name):
+        key = self.key(path, sheet_name)
+        for suffix in CACHE_SUFFIXES:
+            entry_path = self._path(key, suffix)
+            try:
+                if suffix == ".feather":
+                    if not HAVE_ARROW:
+                        continue
+                    df = pd.read_feather(entry_path)
+                else:
+                    df = pd.read_pickle(entry_path)
+                self._touch(entry_path)
+            except (OSError, ValueError, pickle.UnpicklingError):
+                continue
+            self.record(True)
+            return df
+        self.record(False)
+        return None
+
+    def store(self, path, sheet_name, df):
+        key = self.key(path, sheet_name)
+        if HAVE_ARROW:
+            try:
+                self._store_file(self._path(key, ".feather"), df.to_feather)
+                return
+            except Exception:
+                pass  # Not representable in Arrow, use pickle instead
+        self._store_file(self._path(key, ".pkl"), lambda tmp_path: df.to_pickle(tmp_path, compression=None))
+
+
+def get_default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SheetCache()
+    return _default_cache
+
+
+# pd.read_excel for a single sheet, served from the columnar cache when the file has not changed.
+# cache=None uses the shared cache, cache=False parses directly.
+def read_excel_cached(path, sheet_name=0, cache=None):
+    if cache is None:
+        cache = get_default_cache()
+    if not cache:
+        return pd.read_excel(path, sheet_name=sheet_name)
+    df = cache.load(path, sheet_name)
+    if df is None:
+        df = pd.read_excel(path, sheet_name=sheet_name)
+        cache.store(path, sheet_name, df)
+    return df
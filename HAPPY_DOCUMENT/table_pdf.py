@@ -0,0 +1,137 @@
+import time
+import pandas as pd
+from fpdf import FPDF
+from progress import set_progress
+
+PT_TO_MM = 25.4 / 72
+COURIER_WIDTH = 0.6  # Every Courier glyph is 0.6 em wide, so a column's width follows from its length in characters
+LINE_SPACING = 1.25
+MARGIN = 10  # mm
+DEFAULT_FONT_SIZE = 8
+MIN_FONT_SIZE = 5  # fit_width never shrinks text below this; wider tables are split into column groups instead
+MAX_COLUMN_CHARS = 40
+COLUMN_GAP = "  "
+
+
+# Text of every cell in a column, built with vectorized string operations: blank for missing values,
+# one line, Latin-1 only (all the core PDF fonts can show) and at most max_chars long
+def column_text(values, max_chars=MAX_COLUMN_CHARS):
+    text = values.astype(str).where(values.notna(), "")
+    text = text.str.replace(r"\s+", " ", regex=True)
+    text = text.str.encode("latin-1", "replace").str.decode("latin-1")
+    return text.str.slice(0, max_chars)
+
+
+def _clean_header(column, max_chars):
+    return " ".join(str(column).split()).encode("latin-1", "replace").decode("latin-1")[:max_chars]
+
+
+# Measure every column once: its cell texts, header, width in characters (longest value or header,
+# from vectorized string lengths) and whether it holds numbers (right-aligned)
+def measure_columns(df, max_chars=MAX_COLUMN_CHARS):
+    columns = []
+    for column in df.columns:
+        text = column_text(df[column], max_chars)
+        header = _clean_header(column, max_chars)
+        width = max(int(text.str.len().max()) if len(text) else 0, len(header), 1)
+        right = pd.api.types.is_numeric_dtype(df[column].dtype) and not pd.api.types.is_bool_dtype(df[column].dtype)
+        columns.append((column, header, text, width, right))
+    return columns
+
+
+def table_width(columns):
+    return sum(column[3] for column in columns) + len(COLUMN_GAP) * max(len(columns) - 1, 0)
+
+
+# Lay measured columns out as fixed-width text lines, grouping them so each group fits chars_per_line.
+# Returns [(header line, Series of row lines, (first column, last column))] per group.
+def layout_table(columns, chars_per_line):
+    groups = []
+    for column, header, text, width, right in columns:
+        if width > chars_per_line:
+            width = chars_per_line
+            text, header = text.str.slice(0, width), header[:width]
+        cells = text.str.rjust(width) if right else text.str.ljust(width)
+        padded = (column, header.rjust(width) if right else header.ljust(width), cells, width)
+        if groups and groups[-1][1] + len(COLUMN_GAP) + width <= chars_per_line:
+            groups[-1][0].append(padded)
+            groups[-1][1] += len(COLUMN_GAP) + width
+        else:
+            groups.append([[padded], width])
+
+    layout = []
+    for group, _ in groups:
+        header = COLUMN_GAP.join(header for _, header, _, _ in group)
+        lines = group[0][2]
+        for _, _, cells, _ in group[1:]:
+            lines = lines + COLUMN_GAP + cells
+        layout.append((header, lines.reset_index(drop=True), (group[0][0], group[-1][0])))
+    return layout
+
+
+def _chars_per_line(usable_width, font_size):
+    return max(1, int(usable_width / (font_size * PT_TO_MM * COURIER_WIDTH)))
+
+
+# Render every (sheet name, DataFrame) pair as a paginated table with the header repeated on each page.
+# landscape turns the pages sideways; fit_width shrinks the font (down to MIN_FONT_SIZE) so the widest
+# sheet fits across the page. Columns that still do not fit continue in further column groups.
+# Returns {"sheets", "rows", "pages", "elapsed", "rows_per_sec"}.
+def sheets_to_pdf(sheets, output_path, landscape=False, fit_width=True, font_size=DEFAULT_FONT_SIZE,
+                  progress_var=None, sheet_count=None):
+    start = time.perf_counter()
+    pdf = FPDF(orientation="L" if landscape else "P", unit="mm", format="A4")
+    pdf.set_auto_page_break(False)  # Pages are broken here so the header can be repeated
+    usable_width = pdf.w - 2 * MARGIN
+    sheets = list(sheets.items()) if isinstance(sheets, dict) else sheets
+    if sheet_count is None and isinstance(sheets, list):
+        sheet_count = len(sheets)
+
+    total_rows = 0
+    sheet_total = 0
+    for sheet_index, (sheet_name, df) in enumerate(sheets):
+        sheet_total += 1
+        columns = measure_columns(df)
+        size = font_size
+        if fit_width and columns:
+            size = max(MIN_FONT_SIZE, min(font_size, usable_width / (table_width(columns) * PT_TO_MM * COURIER_WIDTH)))
+        line_height = size * PT_TO_MM * LINE_SPACING
+        rows_per_page = max(1, int((pdf.h - 2 * MARGIN) / line_height) - 3)  # Title, header and rule
+        layout = layout_table(columns, _chars_per_line(usable_width, size))
+
+        for group_index, (header, lines, (first, last)) in enumerate(layout):
+            title = str(sheet_name)
+            if len(layout) > 1:
+                title += f" (columns {first} - {last})"
+            title = title.encode("latin-1", "replace").decode("latin-1")
+            for page_start in range(0, max(len(lines), 1), rows_per_page):
+                pdf.add_page()
+                y = MARGIN + line_height
+                pdf.set_font("Courier", "B", size)
+                pdf.text(MARGIN, y, title)
+                y += line_height
+                pdf.text(MARGIN, y, header)
+                pdf.line(MARGIN, y + line_height * 0.3, pdf.w - MARGIN, y + line_height * 0.3)
+                pdf.set_font("Courier", "", size)
+                # pdf.text writes the line as-is: no per-character width measuring or cell bookkeeping
+                for line in lines.iloc[page_start:page_start + rows_per_page]:
+                    y += line_height
+                    pdf.text(MARGIN, y, line)
+                if sheet_count:
+                    done = (page_start + rows_per_page) / max(len(lines), 1)
+                    done = (group_index + min(done, 1)) / len(layout)
+                    set_progress(progress_var, (sheet_index + done) / sheet_count * 99)
+        total_rows += len(df)
+
+    if not pdf.page_no():
+        pdf.add_page()  # FPDF cannot save a document without pages
+    pdf.output(output_path)
+    set_progress(progress_var, 100)
+    elapsed = time.perf_counter() - start
+    return {"sheets": sheet_total, "rows": total_rows, "pages": pdf.page_no(), "elapsed": elapsed,
+            "rows_per_sec": total_rows / elapsed if elapsed else 0.0}
+
+
+def describe_pdf(summary):
+    return (f"Rendered {summary['rows']:,} rows from {summary['sheets']} sheet(s) on {summary['pages']} page(s) "
+            f"in {summary['elapsed']:.1f}s ({summary['rows_per_sec']:,.0f} rows/sec)")
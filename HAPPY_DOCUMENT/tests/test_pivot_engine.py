@@ -0,0 +1,50 @@
+# Checks pivot_engine against DataFrame.pivot_table, which it has to agree with chunk by chunk.
+#
+#   python -m pytest tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+from pivot_engine import pivot_chunks
+
+
+# Region, a value column mixing numbers, text and blanks, and a plain numeric one
+def make_sheet():
+    return pd.DataFrame({
+        "Region": ["EU", "EU", "EU", "US", "US", "APAC", "APAC"],
+        "Mixed": [1, "n/a", 3, "x", None, 5, 7],
+        "Amount": [10.0, 20.0, np.nan, 5.0, 6.0, 7.0, 8.0],
+    })
+
+
+def chunks_of(df, size):
+    for start in range(0, len(df), size):
+        yield df.iloc[start:start + size].copy(), min((start + size) / len(df), 1.0)
+
+
+@pytest.mark.parametrize("aggfuncs", [["count"], ["count", "sum"], ["count", "mean", "min", "max"]])
+@pytest.mark.parametrize("chunk_size", [2, 100])
+def test_count_matches_pivot_table_whatever_else_is_selected(aggfuncs, chunk_size):
+    df = make_sheet()
+    pivot, rows = pivot_chunks(chunks_of(df, chunk_size), ["Region"], ["Mixed", "Amount"], aggfuncs)
+    expected = df.pivot_table(index="Region", values=["Mixed", "Amount"], aggfunc="count")
+    counts = pivot if len(aggfuncs) == 1 else pivot["count"]
+    assert rows == len(df)
+    for column in ("Mixed", "Amount"):
+        assert counts[column].astype(int).to_dict() == expected[column].to_dict()
+
+
+@pytest.mark.parametrize("chunk_size", [2, 100])
+def test_numeric_aggregations_ignore_text(chunk_size):
+    df = make_sheet()
+    pivot, _ = pivot_chunks(chunks_of(df, chunk_size), ["Region"], ["Mixed"], ["sum", "mean", "min", "max"])
+    numbers = df.assign(Mixed=pd.to_numeric(df["Mixed"], errors="coerce"))
+    expected = numbers.pivot_table(index="Region", values="Mixed", aggfunc=["sum", "mean", "min", "max"])
+    for func in ("sum", "mean", "min", "max"):
+        got = pivot[(func, "Mixed")].astype(float)
+        want = expected[(func, "Mixed")].reindex(got.index).astype(float)
+        pd.testing.assert_series_equal(got, want, check_names=False)
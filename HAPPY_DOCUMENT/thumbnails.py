@@ -0,0 +1,54 @@
+import hashlib
+import os
+from PIL import Image
+from disk_cache import DiskCache
+from image_ops import load_thumbnail
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".happy_document", "thumbnails")
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+THUMBNAIL_SIZE = (160, 160)
+
+_default_cache = None
+
+
+# Persistent thumbnail cache. Entries are keyed by absolute path + mtime + file size + thumbnail size,
+# so an edited file gets a new thumbnail and reopening an unchanged folder never decodes the originals.
+# Least recently used entries are evicted past max_bytes (see DiskCache).
+class ThumbnailCache(DiskCache):
+    suffixes = (".png",)
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, thumb_size=THUMBNAIL_SIZE, max_bytes=DEFAULT_MAX_BYTES):
+        self.thumb_size = thumb_size
+        super().__init__(cache_dir, max_bytes)
+
+    def key(self, file):
+        stat = os.stat(file)
+        raw = f"{os.path.abspath(file)}|{stat.st_mtime_ns}|{stat.st_size}|{self.thumb_size[0]}x{self.thumb_size[1]}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    # Return the thumbnail for file as a loaded PIL image, generating and storing it on a miss
+    def get(self, file):
+        path = self._path(self.key(file))
+        try:
+            with Image.open(path) as cached:
+                cached.load()
+                thumbnail = cached.copy()
+            self._touch(path)
+            self.record(True)
+            return thumbnail
+        except OSError:
+            pass
+
+        self.record(False)
+        thumbnail = load_thumbnail(file, self.thumb_size)
+        if thumbnail.mode not in ("RGB", "RGBA", "L", "LA"):
+            thumbnail = thumbnail.convert("RGBA")
+        self._store_file(path, lambda tmp_path: thumbnail.save(tmp_path, format="PNG"))
+        return thumbnail
+
+
+def get_default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ThumbnailCache()
+    return _default_cache
@@ -0,0 +1,135 @@
+from PIL import Image
+
+TILE_SIZE = 256
+MAX_PIXELS = 2 ** 31  # Gigapixel scans are expected here, far beyond Pillow's default limit
+
+
+# Raise Pillow's process-wide decompression-bomb limit to MAX_PIXELS. Called once at app startup,
+# before any worker thread opens images, so no thread ever runs without a limit.
+def allow_large_images():
+    if Image.MAX_IMAGE_PIXELS is not None and Image.MAX_IMAGE_PIXELS < MAX_PIXELS:
+        Image.MAX_IMAGE_PIXELS = MAX_PIXELS
+
+
+# Image.open with max_pixels as this caller's own limit (Pillow's limit still applies as well)
+def open_large_image(path, max_pixels=MAX_PIXELS):
+    image = Image.open(path)
+    width, height = image.size
+    if width * height > max_pixels:
+        image.close()
+        raise Image.DecompressionBombError(f"Image size ({width * height} pixels) exceeds limit of {max_pixels} pixels")
+    return image
+
+
+def _displayable(image):
+    if image.mode not in ("RGB", "RGBA", "L"):
+        image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+    return image
+
+
+# Zoom pyramid for very large images. Level 0 is full resolution and every further level is half the
+# size of the previous one (built with reduce(), which is cheap). Viewers ask for individual tiles of a
+# level, so only what is on screen ever becomes a Tk image. Only the reduced levels are kept: the build
+# starts from a half-size decode where the format can produce one (JPEG's draft mode) and otherwise drops
+# the full-resolution bitmap as soon as level 1 exists. Level 0 is decoded again when its tiles are
+# viewed and released when the viewer moves to another level.
+class TilePyramid:
+    def __init__(self, image_path, tile_size=TILE_SIZE):
+        self.image_path = image_path
+        self.tile_size = tile_size
+        self.levels = []  # Level images; levels[0] is None unless the image fits in a single tile
+        self.sizes = []
+        self._full = None
+
+    def build(self, progress_var=None):
+        image = open_large_image(self.image_path)
+        full_size = image.size
+        total_levels = self.level_count_for(full_size)
+        if total_levels == 1:
+            image.load()
+            self.levels, self.sizes = [_displayable(image)], [full_size]
+            return self
+
+        image.draft(None, ((full_size[0] + 1) // 2, (full_size[1] + 1) // 2))  # No-op for formats without it
+        image.load()
+        image = _displayable(image)
+        level = image.reduce(2) if image.size == full_size else image
+        del image  # The full-resolution bitmap, when it had to be decoded
+        self.levels, self.sizes = [None, level], [full_size, level.size]
+        while max(self.levels[-1].size) > self.tile_size:
+            self.levels.append(self.levels[-1].reduce(2))
+            self.sizes.append(self.levels[-1].size)
+            if progress_var is not None:
+                progress_var.set(len(self.levels) / total_levels * 100)
+        return self
+
+    def _full_image(self):
+        if self.levels[0] is not None:
+            return self.levels[0]
+        if self._full is None:
+            image = open_large_image(self.image_path)
+            image.load()
+            self._full = _displayable(image)
+        return self._full
+
+    def level_count_for(self, size):
+        count = 1
+        width, height = size
+        while max(width, height) > self.tile_size:
+            width, height = max(1, width // 2), max(1, height // 2)
+            count += 1
+        return count
+
+    @property
+    def size(self):
+        return self.sizes[0]
+
+    def level_size(self, level):
+        return self.sizes[level]
+
+    # Scale factors from full resolution to the given level
+    def scale(self, level):
+        full_width, full_height = self.size
+        width, height = self.level_size(level)
+        return width / full_width, height / full_height
+
+    # Most detailed level that fits entirely inside a width x height viewport
+    def fit_level(self, width, height):
+        for level, (level_width, level_height) in enumerate(self.sizes):
+            if level_width <= width and level_height <= height:
+                return level
+        return len(self.sizes) - 1
+
+    def tile_grid(self, level):
+        width, height = self.level_size(level)
+        return -(-width // self.tile_size), -(-height // self.tile_size)
+
+    def tile_box(self, level, column, row):
+        width, height = self.level_size(level)
+        left, top = column * self.tile_size, row * self.tile_size
+        return left, top, min(left + self.tile_size, width), min(top + self.tile_size, height)
+
+    def tile(self, level, column, row):
+        if level == 0:
+            return self._full_image().crop(self.tile_box(level, column, row))
+        self._full = None  # The viewer has left full resolution
+        return self.levels[level].crop(self.tile_box(level, column, row))
+
+    # Map a point on the given level back to full-resolution pixel coordinates
+    def to_full(self, level, x, y):
+        scale_x, scale_y = self.scale(level)
+        return x / scale_x, y / scale_y
+
+    def from_full(self, level, x, y):
+        scale_x, scale_y = self.scale(level)
+        return x * scale_x, y * scale_y
+
+    # Crop a full-resolution box (left, top, right, bottom), clamped to the image
+    def crop(self, box):
+        width, height = self.size
+        left, top, right, bottom = box
+        box = (max(0, int(left)), max(0, int(top)), min(width, int(round(right))), min(height, int(round(bottom))))
+        if self.levels[0] is not None or self._full is not None:
+            return self._full_image().crop(box)
+        with open_large_image(self.image_path) as image:
+            return _displayable(image.crop(box))
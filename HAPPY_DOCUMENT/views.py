@@ -0,0 +1,87 @@
+import numpy as np
+
+
+# Non-destructive filter/sort history over a DataFrame that is never modified.
+# Every step stores only the row positions (into the original frame) that are visible after it, in
+# display order: a filter keeps a subset of the previous positions, a sort reorders them. Undo pops a
+# step and reset drops them all, both without touching the data. The visible rows are only gathered
+# into a new DataFrame when something actually needs one, and that frame is reused until the next step.
+class ViewStack:
+    def __init__(self, base):
+        self.base = base
+        self.steps = []  # (description, positions)
+        self._frame = None
+
+    @property
+    def positions(self):
+        if self.steps:
+            return self.steps[-1][1]
+        return np.arange(len(self.base), dtype=np.intp)
+
+    @property
+    def depth(self):
+        return len(self.steps)
+
+    def __len__(self):
+        return len(self.steps[-1][1]) if self.steps else len(self.base)
+
+    def descriptions(self):
+        return [description for description, _ in self.steps]
+
+    # Values of one column for the visible rows, in display order (indexed by their base positions)
+    def column(self, name):
+        column = self.base[name]
+        if not self.steps:
+            return column.set_axis(self.positions)
+        positions = self.positions
+        return column.iloc[positions].set_axis(positions)
+
+    # Keep the visible rows where mask (aligned with column()/positions) is True
+    def filter(self, mask, description):
+        mask = np.asarray(mask, dtype=bool)
+        self._push(description, self.positions[mask])
+
+    # Sort by one or more columns in a single pass; ascending is a bool or one bool per column
+    def sort(self, columns, ascending=True):
+        if not isinstance(columns, (list, tuple)):
+            columns = [columns]
+        if isinstance(ascending, bool):
+            ascending = [ascending] * len(columns)
+        positions = self.positions
+        keys = self.base[list(columns)]  # Only the key columns are gathered, not the whole frame
+        if self.steps:
+            keys = keys.iloc[positions]
+        keys = keys.set_axis(positions)
+        order = keys.sort_values(by=list(columns), ascending=list(ascending), kind="stable").index.to_numpy()
+        description = ", ".join(f"{column} ({'ascending' if asc else 'descending'})"
+                                for column, asc in zip(columns, ascending))
+        self._push(f"sort by {description}", order)
+
+    def _push(self, description, positions):
+        self.steps.append((description, positions))
+        self._frame = None
+
+    def undo(self):
+        if self.steps:
+            self.steps.pop()
+            self._frame = None
+
+    def reset(self):
+        self.steps.clear()
+        self._frame = None
+
+    # The visible rows as a DataFrame (the original itself when no step is active)
+    def frame(self):
+        if not self.steps:
+            return self.base
+        if self._frame is None:
+            self._frame = self.base.take(self.positions)
+        return self._frame
+
+    # Bytes held by the current view (its position array) and by the whole stack of views
+    def view_memory(self):
+        return self.steps[-1][1].nbytes if self.steps else 0
+
+    def stack_memory(self):
+        return sum(positions.nbytes for _, positions in self.steps)
+
@@ -1,118 +1,11 @@
-import comtypes.client
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, Listbox, simpledialog
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import os
-from docx import Document
 import pandas as pd
-import time
-
-# Function to extract text from a Word document (.docx and .doc)
-def extract_text_word(file_path):
-    if file_path.endswith('.docx'):
-        doc = Document(file_path)
-        text = ""
-        for para in doc.paragraphs:
-            text += para.text + "\n"
-    elif file_path.endswith('.doc'):
-        text = ""
-        word = comtypes.client.CreateObject('Word.Application')
-        word.Visible = False
-        doc = word.Documents.Open(os.path.abspath(file_path))
-        for para in doc.Paragraphs:
-            text += para.Range.Text + "\n"
-        doc.Close()
-        word.Quit()
-    else:
-        raise ValueError("Unsupported file format.")
-    
-    return text
-
-# Function to merge multiple Word files into one
-def merge_word_files(file_paths, output_path, progress_var):
-    merged_doc = Document()
-    for i, file in enumerate(file_paths):
-        if file.endswith('.docx'):
-            doc = Document(file)
-        elif file.endswith('.doc'):
-            word = comtypes.client.CreateObject('Word.Application')
-            word.Visible = False
-            doc = word.Documents.Open(os.path.abspath(file))
-        else:
-            raise ValueError("Unsupported file format.")
-        
-        for para in doc.paragraphs:
-            merged_doc.add_paragraph(para.text)
-        
-        if file.endswith('.doc'):
-            doc.Close()
-            word.Quit()
-
-        # Update progress bar
-        progress_var.set((i + 1) / len(file_paths) * 100)
-        time.sleep(0.5)  # Simulated processing time
-
-    merged_doc.save(output_path)
-
-# Function to convert Word to PDF using Microsoft Word via COM
-def word_to_pdf(word_file, output_pdf, progress_var):
-    try:
-        if not os.path.exists(word_file):
-            raise FileNotFoundError(f"The file {word_file} does not exist.")
-
-        word = comtypes.client.CreateObject('Word.Application')
-        word.Visible = False
-        doc = word.Documents.Open(os.path.abspath(word_file))
-        doc.SaveAs(os.path.abspath(output_pdf), FileFormat=17)  # 17 is the format ID for PDF in Word
-        doc.Close()
-        word.Quit()
-
-        print(f"Converted {word_file} to {output_pdf} successfully.")
-    except Exception as e:
-        print(f"An error occurred while converting to PDF: {str(e)}")
-
-# Function to search text in a Word document
-def search_in_word(word_file, search_text):
-    if word_file.endswith('.docx'):
-        doc = Document(word_file)
-    elif word_file.endswith('.doc'):
-        word = comtypes.client.CreateObject('Word.Application')
-        word.Visible = False
-        doc = word.Documents.Open(os.path.abspath(word_file))
-    else:
-        raise ValueError("Unsupported file format.")
-
-    results = []
-    for i, para in enumerate(doc.paragraphs):
-        if search_text.lower() in para.text.lower():
-            results.append((i, para.text))  # Store index and text
-
-    if word_file.endswith('.doc'):
-        doc.Close()
-        word.Quit()
-
-    return results
-
-# Function to set password protection on a Word document using COM
-def set_word_password(word_file, output_file, password):
-    try:
-        word = comtypes.client.CreateObject('Word.Application')
-        word.Visible = False
-        
-        # Open the document
-        doc = word.Documents.Open(os.path.abspath(word_file))
-
-        # Set the password and save the document
-        doc.SaveAs(os.path.abspath(output_file), Password=password)
-        
-        # Close the document and quit Word
-        doc.Close()
-        word.Quit()
-        
-        print(f"Password set successfully for {output_file}.")
-    except Exception as e:
-        print(f"An error occurred: {str(e)}")
+from jobs import get_executor
+from word_ops import extract_text_word, merge_word_files, word_to_pdf, search_in_word, set_word_password  # Headless Word operations
 
 class WordUtilityGUI:
     def __init__(self, master):
@@ -232,14 +125,16 @@ class WordUtilityGUI:
 
     def process(self):
         operation = self.operation.get()
+        jobs = get_executor(self.master)
 
         if operation == "extract":
             if not self.selected_files:
                 messagebox.showerror("Error", "Please select a Word file to extract text from.")
                 return
             
-            text = extract_text_word(self.selected_files[0])
-            self.show_text_window(text)
+            file_path = self.selected_files[0]
+            jobs.submit("Extract Text", lambda job: extract_text_word(file_path),
+                        progress_var=self.progress_var, status_var=self.status_var, on_done=self.show_text_window)
         elif operation == "merge":
             if not self.selected_files:
                 messagebox.showerror("Error", "Please select Word files to merge.")
@@ -249,12 +144,10 @@ class WordUtilityGUI:
             if not output_file:
                 return
             
-            self.progress_var.set(0)
-            self.status_var.set("Merging files...")
-            self.master.update()
-            merge_word_files(self.selected_files, output_file, self.progress_var)
-            messagebox.showinfo("Success", "Files merged successfully.")
-            self.status_var.set("Merging complete.")
+            selected_files = list(self.selected_files)
+            jobs.submit("Merge Word Files", lambda job: merge_word_files(selected_files, output_file, job.progress_var),
+                        progress_var=self.progress_var, status_var=self.status_var,
+                        on_done=lambda _: messagebox.showinfo("Success", "Files merged successfully."))
         elif operation == "convert_pdf":
             if not self.selected_files:
                 messagebox.showerror("Error", "Please select a Word file to convert to PDF.")
@@ -264,12 +157,10 @@ class WordUtilityGUI:
             if not output_pdf:
                 return
             
-            self.progress_var.set(0)
-            self.status_var.set("Converting to PDF...")
-            self.master.update()
-            word_to_pdf(self.selected_files[0], output_pdf, self.progress_var)
-            messagebox.showinfo("Success", "File converted to PDF successfully.")
-            self.status_var.set("Conversion complete.")
+            file_path = self.selected_files[0]
+            jobs.submit("Convert to PDF", lambda job: word_to_pdf(file_path, output_pdf, job.progress_var),
+                        progress_var=self.progress_var, status_var=self.status_var,
+                        on_done=lambda _: messagebox.showinfo("Success", "File converted to PDF successfully."))
         elif operation == "set_password":
             if not self.selected_files:
                 messagebox.showerror("Error", "Please select a Word file to set password.")
@@ -283,12 +174,10 @@ class WordUtilityGUI:
             if not output_file:
                 return
             
-            self.progress_var.set(0)
-            self.status_var.set("Setting password...")
-            self.master.update()
-            set_word_password(self.selected_files[0], output_file, password)
-            messagebox.showinfo("Success", "Password set successfully.")
-            self.status_var.set("Password set.")
+            file_path = self.selected_files[0]
+            jobs.submit("Set Password", lambda job: set_word_password(file_path, output_file, password),
+                        progress_var=self.progress_var, status_var=self.status_var,
+                        on_done=lambda _: messagebox.showinfo("Success", "Password set successfully."))
         elif operation == "search_text":
             if not self.selected_files:
                 messagebox.showerror("Error", "Please select a Word file to search text.")
@@ -298,16 +187,16 @@ class WordUtilityGUI:
             if search_text is None or search_text.strip() == "":
                 return
             
-            self.progress_var.set(0)
-            self.status_var.set("Searching text...")
-            self.master.update()
-            results = search_in_word(self.selected_files[0], search_text)
-            if results:
-                result_text = "\n".join([f"Line {i+1}: {text}" for i, text in results])
-                self.show_text_window(result_text)
-            else:
-                messagebox.showinfo("Result", "No matches found.")
-            self.status_var.set("Search complete.")
+            file_path = self.selected_files[0]
+            jobs.submit("Search Text", lambda job: search_in_word(file_path, search_text),
+                        progress_var=self.progress_var, status_var=self.status_var, on_done=self.show_search_results)
+
+    def show_search_results(self, results):
+        if results:
+            result_text = "\n".join([f"Line {i+1}: {text}" for i, text in results])
+            self.show_text_window(result_text)
+        else:
+            messagebox.showinfo("Result", "No matches found.")
 
     def show_text_window(self, text):
         text_window = tk.Toplevel(self.master)
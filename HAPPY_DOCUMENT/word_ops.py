@@ -0,0 +1,109 @@
+import os
+from docx import Document
+
+try:
+    import comtypes.client
+except ImportError:  # Microsoft Word automation is only available on Windows
+    comtypes = None
+
+
+# Start a hidden Microsoft Word instance (needed for .doc files, PDF export and passwords)
+def _word_application():
+    if comtypes is None:
+        raise RuntimeError("Microsoft Word automation (comtypes) is not available on this system.")
+    word = comtypes.client.CreateObject('Word.Application')
+    word.Visible = False
+    return word
+
+# Function to extract text from a Word document (.docx and .doc)
+def extract_text_word(file_path):
+    if file_path.endswith('.docx'):
+        doc = Document(file_path)
+        text = ""
+        for para in doc.paragraphs:
+            text += para.text + "\n"
+    elif file_path.endswith('.doc'):
+        text = ""
+        word = _word_application()
+        doc = word.Documents.Open(os.path.abspath(file_path))
+        for para in doc.Paragraphs:
+            text += para.Range.Text + "\n"
+        doc.Close()
+        word.Quit()
+    else:
+        raise ValueError("Unsupported file format.")
+    
+    return text
+
+# Function to merge multiple Word files into one
+def merge_word_files(file_paths, output_path, progress_var=None):
+    merged_doc = Document()
+    for i, file in enumerate(file_paths):
+        if file.endswith('.docx'):
+            doc = Document(file)
+        elif file.endswith('.doc'):
+            word = _word_application()
+            doc = word.Documents.Open(os.path.abspath(file))
+        else:
+            raise ValueError("Unsupported file format.")
+        
+        for para in doc.paragraphs:
+            merged_doc.add_paragraph(para.text)
+        
+        if file.endswith('.doc'):
+            doc.Close()
+            word.Quit()
+
+        # Update progress bar
+        if progress_var is not None:
+            progress_var.set((i + 1) / len(file_paths) * 100)
+
+    merged_doc.save(output_path)
+
+# Function to convert Word to PDF using Microsoft Word via COM
+def word_to_pdf(word_file, output_pdf, progress_var=None):
+    if not os.path.exists(word_file):
+        raise FileNotFoundError(f"The file {word_file} does not exist.")
+
+    word = _word_application()
+    doc = word.Documents.Open(os.path.abspath(word_file))
+    doc.SaveAs(os.path.abspath(output_pdf), FileFormat=17)  # 17 is the format ID for PDF in Word
+    doc.Close()
+    word.Quit()
+    if progress_var is not None:
+        progress_var.set(100)
+
+# Function to search text in a Word document
+def search_in_word(word_file, search_text):
+    if word_file.endswith('.docx'):
+        doc = Document(word_file)
+    elif word_file.endswith('.doc'):
+        word = _word_application()
+        doc = word.Documents.Open(os.path.abspath(word_file))
+    else:
+        raise ValueError("Unsupported file format.")
+
+    results = []
+    for i, para in enumerate(doc.paragraphs):
+        if search_text.lower() in para.text.lower():
+            results.append((i, para.text))  # Store index and text
+
+    if word_file.endswith('.doc'):
+        doc.Close()
+        word.Quit()
+
+    return results
+
+# Function to set password protection on a Word document using COM
+def set_word_password(word_file, output_file, password):
+    word = _word_application()
+    
+    # Open the document
+    doc = word.Documents.Open(os.path.abspath(word_file))
+
+    # Set the password and save the document
+    doc.SaveAs(os.path.abspath(output_file), Password=password)
+    
+    # Close the document and quit Word
+    doc.Close()
+    word.Quit()
@@ -0,0 +1,98 @@
+import re
+import time
+from xml.sax.saxutils import escape
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from progress import set_progress
+
+DEFAULT_CHUNK_ROWS = 5000  # Rows turned into XML and parsed at a time, which bounds the memory used for markup
+_RUN_SPLIT = re.compile(r"([\t\r\n])")
+
+
+# <w:r> markup for text, exactly as python-docx writes it for cell.text = text: tabs become <w:tab/>,
+# line breaks <w:br/>, and text with leading/trailing whitespace is marked xml:space="preserve"
+def run_xml(text):
+    parts = []
+    for piece in _RUN_SPLIT.split(text):
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in ("\r", "\n"):
+            parts.append("<w:br/>")
+        elif piece:
+            preserve = ' xml:space="preserve"' if len(piece.strip()) < len(piece) else ""
+            parts.append(f"<w:t{preserve}>{escape(piece)}</w:t>")
+    return f"<w:r>{''.join(parts)}</w:r>" if parts else "<w:r/>"
+
+
+# Cell text for every row, with the same values DataFrame.iterrows() would produce (rows upcast to the
+# frame's common dtype), without building a Series per row
+def _row_texts(df):
+    values = df.values
+    if values.dtype.kind in "mM":
+        return ([str(value) for value in row] for _, row in df.iterrows())
+    return ([str(value) for value in row] for row in values)
+
+
+# Append the rows of df to a python-docx table by generating the row markup directly and parsing it
+# in chunks, instead of add_row() and cell.text for every cell. The resulting XML is identical.
+def append_rows(table, df, chunk_rows=DEFAULT_CHUNK_ROWS, on_rows=None):
+    tbl = table._tbl
+    cell_starts = []
+    for grid_col in tbl.tblGrid.gridCol_lst:
+        if grid_col.w is None:
+            cell_starts.append("<w:tc><w:p>")
+        else:
+            cell_starts.append(f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{int(grid_col.w.twips)}"/></w:tcPr><w:p>')
+
+    chunk = []
+    written = 0
+    for texts in _row_texts(df):
+        chunk.append("<w:tr>" + "".join(start + run_xml(text) + "</w:p></w:tc>"
+                                        for start, text in zip(cell_starts, texts)) + "</w:tr>")
+        if len(chunk) >= chunk_rows:
+            written += _flush_rows(tbl, chunk)
+            if on_rows is not None:
+                on_rows(written)
+    written += _flush_rows(tbl, chunk)
+    if on_rows is not None:
+        on_rows(written)
+    return written
+
+
+def _flush_rows(tbl, chunk):
+    if not chunk:
+        return 0
+    fragment = parse_xml(f"<w:tbl {nsdecls('w')}>{''.join(chunk)}</w:tbl>")
+    count = len(chunk)
+    tbl.extend(list(fragment))  # lxml moves the parsed rows into the table
+    chunk.clear()
+    return count
+
+
+# Write df as a Word table with a header row. rows_per_table splits very large tables into several,
+# each in its own section (new page) with the header repeated; None keeps a single table.
+# Returns {"rows", "tables", "elapsed", "rows_per_sec"}.
+def write_dataframe_table(doc, df, rows_per_table=None, progress_var=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    start = time.perf_counter()
+    total = len(df)
+    starts = range(0, total, rows_per_table) if rows_per_table and total > rows_per_table else [0]
+    done = 0
+    for index, first in enumerate(starts):
+        if index:
+            doc.add_section()
+        table = doc.add_table(rows=1, cols=len(df.columns))
+        hdr_cells = table.rows[0].cells
+        for i, col in enumerate(df.columns):
+            hdr_cells[i].text = str(col)
+        part = df.iloc[first:first + rows_per_table] if rows_per_table else df
+        append_rows(table, part, chunk_rows,
+                    on_rows=lambda written: set_progress(progress_var, (done + written) / max(total, 1) * 95))
+        done += len(part)
+
+    elapsed = time.perf_counter() - start
+    return {"rows": total, "tables": len(starts), "elapsed": elapsed, "rows_per_sec": total / elapsed if elapsed else 0.0}
+
+
+def describe_table(summary):
+    return (f"Wrote {summary['rows']:,} rows in {summary['tables']} table(s) in {summary['elapsed']:.1f}s "
+            f"({summary['rows_per_sec']:,.0f} rows/sec)")
@@ -0,0 +1,175 @@
+import os
+import threading
+from collections import OrderedDict
+import pandas as pd
+from openpyxl import load_workbook
+from sheet_cache import get_default_cache, read_excel_cached
+
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024  # Parsed sheets kept in memory before the least recently used is dropped
+HEADER_SAMPLE_ROWS = 1000  # Data rows checked at open for columns under blank header cells
+
+
+# Human readable size, e.g. 1536 -> "1.5 KB"
+def format_bytes(size):
+    for unit in ("bytes", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "bytes" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _is_empty_cell(value):
+    return value is None or value == ""
+
+
+# Cells up to the last non-empty one; pandas drops trailing empty cells from every row
+def _used_width(row):
+    width = len(row)
+    while width and _is_empty_cell(row[width - 1]):
+        width -= 1
+    return width
+
+
+# Give blank and repeated headers the same names pd.read_excel does ("Unnamed: 3", "Amount.1"). Named
+# columns keep their names first and blank ones are renamed around them, as pandas' parser does.
+def _pandas_headers(values):
+    headers = []
+    named, unnamed = [], []
+    for i, value in enumerate(values):
+        if _is_empty_cell(value):
+            headers.append(f"Unnamed: {i}")
+            unnamed.append(i)
+        else:
+            # Whole numbers stored as floats are read as ints
+            headers.append(int(value) if isinstance(value, float) and value.is_integer() else value)
+            named.append(i)
+    counts = {}
+    for i in named + unnamed:
+        name = original = headers[i]
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in headers else counts.get(name, 0)
+        headers[i] = name
+        counts[name] = count + 1
+    return headers
+
+
+# Column names of a read-only worksheet as pd.read_excel gives them. The header row sets the width,
+# except that blank trailing header cells are still columns when a data row has values under them, and
+# data wider than the header adds "Unnamed: N" columns. Data rows are only looked at when the sheet's
+# dimension record says it is wider than the header (or has none), and then only the first sample_rows
+# of them; sample_rows=None checks every row, for callers that must be exact before reading the data.
+def sheet_headers(ws, sample_rows=HEADER_SAMPLE_ROWS):
+    first_row = list(next(ws.iter_rows(max_row=1, values_only=True), ()))
+    width = _used_width(first_row)
+    if ws.max_column is None or ws.max_column > width:
+        last_row = None if sample_rows is None else sample_rows + 1
+        for row in ws.iter_rows(min_row=2, max_row=last_row, values_only=True):
+            if len(row) > width:
+                width = max(width, _used_width(row))
+    first_row = (first_row + [None] * width)[:width]
+    return _pandas_headers(first_row)
+
+
+# Workbook that is cheap to open: only sheet names and header rows are read up front (openpyxl
+# read-only mode streams the XML instead of building the whole workbook). A full sheet is parsed
+# the first time an operation asks for it and cached, with least recently used sheets evicted once
+# the parsed frames exceed memory_budget bytes. Parsed sheets also go through the on-disk SheetCache
+# (cache=None uses the shared one, cache=False disables it), so reopening an unchanged file or
+# re-reading an evicted sheet skips the XLSX parser entirely. optimize is an optional function applied
+# to every freshly parsed sheet that returns (smaller DataFrame, summary), such as
+# frame_optimizer.optimize_frame; its summaries are kept in optimizations by sheet name. Once a sheet
+# is parsed, columns() returns the parsed frame's columns, so any the header sample missed appear.
+class LazyWorkbook:
+    def __init__(self, path, memory_budget=DEFAULT_MEMORY_BUDGET, cache=None, optimize=None):
+        self.path = path
+        self.memory_budget = memory_budget
+        self.cache = get_default_cache() if cache is None else cache
+        self.optimize = optimize
+        self.optimizations = {}
+        self.sheet_names = []
+        self.headers = {}
+        self._sheets = OrderedDict()  # sheet name -> (DataFrame, bytes)
+        self._memory = 0
+        self._lock = threading.Lock()
+        self._read_structure()
+
+    def _read_structure(self):
+        if os.path.splitext(self.path)[1].lower() in (".xlsx", ".xlsm"):
+            wb = load_workbook(self.path, read_only=True, data_only=True)
+            try:
+                for ws in wb.worksheets:
+                    self.sheet_names.append(ws.title)
+                    self.headers[ws.title] = sheet_headers(ws)
+            finally:
+                wb.close()
+        else:
+            # Legacy .xls: no streaming reader, but nrows=0 still skips the data rows
+            with pd.ExcelFile(self.path) as excel_file:
+                self.sheet_names = list(excel_file.sheet_names)
+                for name in self.sheet_names:
+                    self.headers[name] = list(excel_file.parse(name, nrows=0).columns)
+
+    @property
+    def first_sheet(self):
+        return self.sheet_names[0] if self.sheet_names else None
+
+    def columns(self, sheet_name=None):
+        return self.headers.get(sheet_name or self.first_sheet, [])
+
+    def is_loaded(self, sheet_name):
+        return sheet_name in self._sheets
+
+    # Parsed DataFrame for a sheet (the first sheet by default), reading it on first use
+    def sheet(self, sheet_name=None):
+        sheet_name = sheet_name or self.first_sheet
+        if sheet_name not in self.headers:
+            raise KeyError(f"No sheet named {sheet_name!r} in {os.path.basename(self.path)}")
+        with self._lock:
+            if sheet_name in self._sheets:
+                self._sheets.move_to_end(sheet_name)
+                return self._sheets[sheet_name][0]
+
+        df = self._parse(sheet_name)
+        self.headers[sheet_name] = list(df.columns)  # Exact now, including columns the header sample missed
+        if self.optimize is not None:
+            df, summary = self.optimize(df)
+            self.optimizations[sheet_name] = summary
+            size = summary["after"]
+        else:
+            size = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            self._sheets[sheet_name] = (df, size)
+            self._memory += size
+            self._evict(keep=sheet_name)
+        return df
+
+    def _parse(self, sheet_name):
+        return read_excel_cached(self.path, sheet_name, self.cache)
+
+    def _evict(self, keep):
+        while self._memory > self.memory_budget and len(self._sheets) > 1:
+            name, (_, size) = next(iter(self._sheets.items()))
+            if name == keep:
+                self._sheets.move_to_end(name)
+                continue
+            del self._sheets[name]
+            self._memory -= size
+
+    # Parse every sheet (for operations that really need the whole workbook)
+    def all_sheets(self):
+        return {name: self.sheet(name) for name in self.sheet_names}
+
+    def memory_usage(self):
+        return self._memory
+
+    # Status text for the sheets held in memory, with their size before optimize when it was used
+    def describe_memory(self):
+        with self._lock:
+            names = list(self._sheets)
+            text = f"{len(names)} sheet(s) in memory, {format_bytes(self._memory)}"
+        before = sum(self.optimizations[name]["before"] for name in names if name in self.optimizations)
+        if before:
+            text += f" (before optimization {format_bytes(before)})"
+        return text